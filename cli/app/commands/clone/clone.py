@@ -1,13 +1,16 @@
 import os
+import shutil
 import subprocess
-from typing import Optional, Protocol
+from typing import List, Optional, Protocol
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.utils.cache import cache_key, get_cache_dir
 from app.utils.lib import DirectoryManager
 from app.utils.logger import Logger
 from app.utils.output_formatter import OutputFormatter
 from app.utils.protocols import LoggerProtocol
+from app.utils.timeout import run_with_deadline
 
 from .messages import (
     debug_cloning_repo,
@@ -19,6 +22,20 @@ from .messages import (
     debug_directory_removal_failed,
     debug_path_exists_force_disabled,
     debug_clone_completed,
+    debug_executing_git_update,
+    debug_git_update_failed,
+    debug_updating_existing_checkout,
+    debug_update_fell_back_to_clone,
+    dry_run_sparse_paths,
+    dry_run_update_existing,
+    existing_checkout_has_different_origin,
+    debug_cloning_from_mirror,
+    debug_creating_mirror,
+    debug_mirror_clone_failed,
+    debug_mirror_sync_failed,
+    debug_updating_mirror,
+    dry_run_mirror,
+    mirror_updated,
     default_branch,
     dry_run_branch,
     dry_run_command,
@@ -42,26 +59,93 @@ from .messages import (
 )
 
 
+MIRRORS_DIR = "git-mirrors"
+
+
+def get_mirror_path(repo: str, mirror_dir: str = None) -> str:
+    """Location of the bare mirror of repo, under mirror_dir or the user's cache dir"""
+    return os.path.join(mirror_dir or os.path.join(get_cache_dir(), MIRRORS_DIR), f"{cache_key(repo)}.git")
+
+
 class GitCloneProtocol(Protocol):
-    def clone_repository(self, repo: str, path: str, branch: str = None) -> tuple[bool, str]: ...
+    def clone_repository(
+        self, repo: str, path: str, branch: str = None, sparse_paths: List[str] = None, mirror_path: str = None
+    ) -> tuple[bool, str]: ...
+
+    def update_repository(
+        self, repo: str, path: str, branch: str = None, sparse_paths: List[str] = None
+    ) -> tuple[bool, str]: ...
+
+    def sync_mirror(self, repo: str, mirror_path: str) -> tuple[bool, str]: ...
 
 
 class GitCommandBuilder:
     @staticmethod
-    def build_clone_command(repo: str, path: str, branch: str = None) -> list[str]:
+    def build_clone_command(
+        repo: str, path: str, branch: str = None, sparse_paths: List[str] = None, source: str = None
+    ) -> list[str]:
+        """source replaces repo as the place objects are fetched from, e.g. a local mirror"""
         cmd = ["git", "clone", "--depth=1"]
+        if sparse_paths:
+            # Blobs are only fetched for the paths that get checked out
+            cmd.extend(["--filter=blob:none", "--sparse"])
         if branch:
             cmd.extend(["-b", branch])
-        cmd.extend([repo, path])
+        cmd.extend([source or repo, path])
         return cmd
 
+    @staticmethod
+    def build_sparse_checkout_command(path: str, sparse_paths: List[str]) -> list[str]:
+        return ["git", "-C", path, "sparse-checkout", "set", *sparse_paths]
+
+    @staticmethod
+    def build_sparse_disable_command(path: str) -> list[str]:
+        return ["git", "-C", path, "sparse-checkout", "disable"]
+
+    @staticmethod
+    def build_set_origin_command(path: str, repo: str) -> list[str]:
+        return ["git", "-C", path, "remote", "set-url", "origin", repo]
+
+    @staticmethod
+    def build_mirror_create_commands(repo: str, mirror_path: str) -> list[list[str]]:
+        return [
+            ["git", "clone", "--mirror", repo, mirror_path],
+            # Lets sparse clones request a blob filter from the mirror
+            ["git", "-C", mirror_path, "config", "uploadpack.allowFilter", "true"],
+        ]
+
+    @staticmethod
+    def build_mirror_fetch_command(mirror_path: str) -> list[str]:
+        return ["git", "-C", mirror_path, "fetch", "--prune", "origin"]
+
+    @staticmethod
+    def build_update_commands(path: str, branch: str = None, sparse_paths: List[str] = None) -> list[list[str]]:
+        """Fetch the branch tip into an existing checkout and make the working tree match it exactly.
+
+        The sparse checkout is set to sparse_paths, or disabled when there are none, since the
+        checkout may have been made with different paths.
+        """
+        if sparse_paths:
+            sparse_cmd = GitCommandBuilder.build_sparse_checkout_command(path, sparse_paths)
+        else:
+            sparse_cmd = GitCommandBuilder.build_sparse_disable_command(path)
+        return [
+            ["git", "-C", path, "fetch", "--depth=1", "origin", branch or "HEAD"],
+            ["git", "-C", path, "reset", "--hard", "FETCH_HEAD"],
+            sparse_cmd,
+            ["git", "-C", path, "clean", "-ffdx"],
+        ]
+
 
 class CloneFormatter:
     def __init__(self):
         self.output_formatter = OutputFormatter()
 
     def format_output(self, result: "CloneResult", output: str) -> str:
-        if result.success:
+        if result.success and result.mirror_only:
+            message = mirror_updated.format(repo=result.repo, path=result.mirror)
+            output_message = self.output_formatter.create_success_message(message, result.model_dump())
+        elif result.success:
             message = successfully_cloned.format(repo=result.repo, path=result.path)
             output_message = self.output_formatter.create_success_message(message, result.model_dump())
         else:
@@ -71,15 +155,40 @@ class CloneFormatter:
         return self.output_formatter.format_output(output_message, output)
 
     def format_dry_run(self, config: "CloneConfig") -> str:
-        cmd = GitCommandBuilder.build_clone_command(config.repo, config.path, config.branch)
+        mirror_path = get_mirror_path(config.repo, config.mirror_dir)
+        if config.mirror_only:
+            commands = self._mirror_commands(config.repo, mirror_path)
+        elif config.force and is_git_checkout(config.path):
+            commands = GitCommandBuilder.build_update_commands(config.path, config.branch, config.sparse_paths)
+        else:
+            commands = []
+            source = None
+            if config.mirror and os.path.isdir(mirror_path):
+                commands = self._mirror_commands(config.repo, mirror_path)
+                source = f"file://{mirror_path}"
+            commands.append(
+                GitCommandBuilder.build_clone_command(config.repo, config.path, config.branch, config.sparse_paths, source)
+            )
+            if config.sparse_paths:
+                commands.append(GitCommandBuilder.build_sparse_checkout_command(config.path, config.sparse_paths))
+            if source:
+                commands.append(GitCommandBuilder.build_set_origin_command(config.path, config.repo))
 
         output = []
         output.append(dry_run_mode)
         output.append(dry_run_command_would_be_executed)
-        output.append(dry_run_command.format(command=" ".join(cmd)))
+        for cmd in commands:
+            output.append(dry_run_command.format(command=" ".join(cmd)))
         output.append(dry_run_repository.format(repo=config.repo))
         output.append(dry_run_branch.format(branch=config.branch or default_branch))
         output.append(dry_run_target_path.format(path=config.path))
+        if config.sparse_paths:
+            output.append(dry_run_sparse_paths.format(paths=", ".join(config.sparse_paths)))
+        if config.mirror or config.mirror_only:
+            output.append(dry_run_mirror.format(path=mirror_path))
+        if config.mirror_only:
+            output.append(end_dry_run)
+            return "\n".join(output)
         output.append(dry_run_force_mode.format(force=config.force))
 
         self._add_path_status_message(output, config.path, config.force)
@@ -87,9 +196,17 @@ class CloneFormatter:
         output.append(end_dry_run)
         return "\n".join(output)
 
+    @staticmethod
+    def _mirror_commands(repo: str, mirror_path: str) -> list[list[str]]:
+        if os.path.isdir(mirror_path):
+            return [GitCommandBuilder.build_mirror_fetch_command(mirror_path)]
+        return GitCommandBuilder.build_mirror_create_commands(repo, mirror_path)
+
     def _add_path_status_message(self, output: list[str], path: str, force: bool) -> None:
         if os.path.exists(path):
-            if force:
+            if force and is_git_checkout(path):
+                output.append(dry_run_update_existing.format(path=path))
+            elif force:
                 output.append(path_exists_will_overwrite.format(path=path))
             else:
                 output.append(path_exists_would_fail.format(path=path))
@@ -97,17 +214,32 @@ class CloneFormatter:
             output.append(target_path_not_exists.format(path=path))
 
 
+def is_git_checkout(path: str) -> bool:
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, ".git"))
+
+
 class GitClone:
     def __init__(self, logger: LoggerProtocol):
         self.logger = logger
 
-    def clone_repository(self, repo: str, path: str, branch: str = None) -> tuple[bool, str]:
-        cmd = GitCommandBuilder.build_clone_command(repo, path, branch)
+    def clone_repository(
+        self, repo: str, path: str, branch: str = None, sparse_paths: List[str] = None, mirror_path: str = None
+    ) -> tuple[bool, str]:
+        """Clone repo into path; with mirror_path, objects come from the local mirror and origin still points at repo"""
+        source = f"file://{mirror_path}" if mirror_path else None
+        cmd = GitCommandBuilder.build_clone_command(repo, path, branch, sparse_paths, source)
 
         self.logger.debug(debug_executing_git_clone.format(command=" ".join(cmd)))
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            result = run_with_deadline(cmd, capture_output=True, text=True, check=True)
+            if sparse_paths:
+                sparse_cmd = GitCommandBuilder.build_sparse_checkout_command(path, sparse_paths)
+                self.logger.debug(debug_executing_git_clone.format(command=" ".join(sparse_cmd)))
+                run_with_deadline(sparse_cmd, capture_output=True, text=True, check=True)
+            if source:
+                origin_cmd = GitCommandBuilder.build_set_origin_command(path, repo)
+                run_with_deadline(origin_cmd, capture_output=True, text=True, check=True)
             self.logger.debug(debug_git_clone_success)
             return True, None
         except subprocess.CalledProcessError as e:
@@ -117,6 +249,50 @@ class GitClone:
             self.logger.debug(debug_unexpected_error.format(error_type=type(e).__name__, error=str(e)))
             return False, str(e)
 
+    def update_repository(
+        self, repo: str, path: str, branch: str = None, sparse_paths: List[str] = None
+    ) -> tuple[bool, str]:
+        """Bring an existing checkout of repo to the tip of branch, checking out only sparse_paths if given"""
+        try:
+            origin = run_with_deadline(
+                ["git", "-C", path, "remote", "get-url", "origin"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+            if origin != repo:
+                return False, existing_checkout_has_different_origin.format(path=path, origin=origin)
+            for cmd in GitCommandBuilder.build_update_commands(path, branch, sparse_paths):
+                self.logger.debug(debug_executing_git_update.format(command=" ".join(cmd)))
+                run_with_deadline(cmd, capture_output=True, text=True, check=True)
+            return True, None
+        except subprocess.CalledProcessError as e:
+            self.logger.debug(debug_git_update_failed.format(code=e.returncode, error=e.stderr))
+            return False, e.stderr
+        except Exception as e:
+            self.logger.debug(debug_unexpected_error.format(error_type=type(e).__name__, error=str(e)))
+            return False, str(e)
+
+
+    def sync_mirror(self, repo: str, mirror_path: str) -> tuple[bool, str]:
+        """Create the bare mirror of repo, or fetch into it when it already exists"""
+        exists = os.path.isdir(mirror_path)
+        if exists:
+            self.logger.debug(debug_updating_mirror.format(path=mirror_path))
+            commands = [GitCommandBuilder.build_mirror_fetch_command(mirror_path)]
+        else:
+            self.logger.debug(debug_creating_mirror.format(path=mirror_path))
+            os.makedirs(os.path.dirname(mirror_path), exist_ok=True)
+            commands = GitCommandBuilder.build_mirror_create_commands(repo, mirror_path)
+        try:
+            for cmd in commands:
+                run_with_deadline(cmd, capture_output=True, text=True, check=True)
+            return True, None
+        except (subprocess.CalledProcessError, OSError) as e:
+            error = getattr(e, "stderr", None) or str(e)
+            self.logger.debug(debug_mirror_sync_failed.format(path=mirror_path, error=error))
+            if not exists:
+                # Never leave a half-created mirror behind for later clones to pick up
+                shutil.rmtree(mirror_path, ignore_errors=True)
+            return False, error
+
 
 class CloneResult(BaseModel):
     repo: str
@@ -127,6 +303,8 @@ class CloneResult(BaseModel):
     output: str = ""
     success: bool = False
     error: Optional[str] = None
+    mirror: Optional[str] = None
+    mirror_only: bool = False
 
 
 class CloneConfig(BaseModel):
@@ -137,6 +315,10 @@ class CloneConfig(BaseModel):
     verbose: bool = Field(False, description="Verbose output")
     output: str = Field("text", description="Output format: text, json")
     dry_run: bool = Field(False, description="Dry run mode")
+    sparse_paths: Optional[List[str]] = Field(None, description="Only check out these paths, fetching their blobs on demand")
+    mirror: bool = Field(True, description="Clone from the local mirror of the repository when one exists")
+    mirror_only: bool = Field(False, description="Only create or update the local mirror")
+    mirror_dir: Optional[str] = Field(None, description="Directory holding local mirrors, defaults to the cache dir")
 
     @field_validator("repo")
     @classmethod
@@ -175,6 +357,12 @@ class CloneConfig(BaseModel):
             return None
         return stripped_branch
 
+    @field_validator("sparse_paths")
+    @classmethod
+    def validate_sparse_paths(cls, sparse_paths: Optional[List[str]]) -> Optional[List[str]]:
+        paths = [path.strip().strip("/") for path in sparse_paths or [] if path and path.strip().strip("/")]
+        return paths or None
+
 
 class CloneService:
     def __init__(self, config: CloneConfig, logger: LoggerProtocol = None, cloner: GitCloneProtocol = None):
@@ -200,7 +388,7 @@ class CloneService:
             return False
         return True
 
-    def _create_result(self, success: bool, error: str = None) -> CloneResult:
+    def _create_result(self, success: bool, error: str = None, mirror: str = None) -> CloneResult:
         result = CloneResult(
             repo=self.config.repo,
             path=self.config.path,
@@ -210,6 +398,8 @@ class CloneService:
             output=self.config.output,
             success=success,
             error=error,
+            mirror=mirror,
+            mirror_only=self.config.mirror_only,
         )
         result.output = self.formatter.format_output(result, self.config.output)
         return result
@@ -221,18 +411,59 @@ class CloneService:
 
         self.logger.debug(debug_cloning_repo.format(repo=self.config.repo, path=self.config.path, force=self.config.force))
 
+        mirror_path = get_mirror_path(self.config.repo, self.config.mirror_dir)
+        if self.config.mirror_only:
+            success, error = self.cloner.sync_mirror(self.config.repo, mirror_path)
+            return self._create_result(success, error, mirror=mirror_path)
+
         if not self._validate_prerequisites():
             return self._create_result(False, prerequisites_validation_failed)
 
+        if self.config.force and is_git_checkout(self.config.path):
+            self.logger.debug(debug_updating_existing_checkout.format(path=self.config.path))
+            success, error = self.cloner.update_repository(
+                self.config.repo, self.config.path, self.config.branch, sparse_paths=self.config.sparse_paths
+            )
+            if success:
+                duration = time.time() - start_time
+                self.logger.debug(debug_clone_completed.format(duration=f"{duration:.2f}", success=success))
+                return self._create_result(success, error)
+            self.logger.debug(debug_update_fell_back_to_clone.format(error=error))
+
         if not self._prepare_target_directory():
             return self._create_result(False, failed_to_prepare_target_directory)
 
-        success, error = self.cloner.clone_repository(self.config.repo, self.config.path, self.config.branch)
+        used_mirror = None
+        success, error = False, None
+        if self.config.mirror and os.path.isdir(mirror_path):
+            success, error = self._clone_from_mirror(mirror_path)
+            used_mirror = mirror_path if success else None
+
+        if not success:
+            kwargs = {"sparse_paths": self.config.sparse_paths} if self.config.sparse_paths else {}
+            success, error = self.cloner.clone_repository(self.config.repo, self.config.path, self.config.branch, **kwargs)
 
         duration = time.time() - start_time
         self.logger.debug(debug_clone_completed.format(duration=f"{duration:.2f}", success=success))
 
-        return self._create_result(success, error)
+        return self._create_result(success, error, mirror=used_mirror)
+
+    def _clone_from_mirror(self, mirror_path: str) -> tuple[bool, str]:
+        # A stale mirror is still a valid clone source, so a failed fetch only costs freshness
+        self.cloner.sync_mirror(self.config.repo, mirror_path)
+        self.logger.debug(debug_cloning_from_mirror.format(path=mirror_path))
+        success, error = self.cloner.clone_repository(
+            self.config.repo,
+            self.config.path,
+            self.config.branch,
+            sparse_paths=self.config.sparse_paths,
+            mirror_path=mirror_path,
+        )
+        if not success:
+            self.logger.debug(debug_mirror_clone_failed.format(error=error))
+            if os.path.exists(self.config.path):
+                self.dir_manager.remove_directory(self.config.path, self.logger)
+        return success, error
 
     def clone_and_format(self) -> str:
         if self.config.dry_run:
@@ -1,7 +1,9 @@
+from typing import List
+
 import typer
 
 from app.utils.logger import Logger
-from app.utils.config import Config, DEFAULT_REPO, DEFAULT_BRANCH, DEFAULT_PATH, NIXOPUS_CONFIG_DIR
+from app.utils.config import get_config, DEFAULT_REPO, DEFAULT_BRANCH, DEFAULT_PATH, MIRROR_DIR, NIXOPUS_CONFIG_DIR
 from app.utils.timeout import TimeoutWrapper
 
 from .clone import Clone, CloneConfig
@@ -15,6 +17,8 @@ from .messages import (
     debug_output_param,
     debug_dry_run_param,
     debug_timeout_param,
+    debug_sparse_paths_param,
+    debug_mirror_param,
     debug_config_created,
     debug_action_created,
     debug_timeout_wrapper_created,
@@ -30,11 +34,12 @@ from .messages import (
     debug_exception_details,
 )
 
-config = Config()
+config = get_config()
 nixopus_config_dir = config.get_yaml_value(NIXOPUS_CONFIG_DIR)
 repo = config.get_yaml_value(DEFAULT_REPO)
 branch = config.get_yaml_value(DEFAULT_BRANCH)
 path = nixopus_config_dir + "/" + config.get_yaml_value(DEFAULT_PATH)
+mirror_dir = config.get_yaml_value(MIRROR_DIR) or None
 
 clone_app = typer.Typer(help="Clone a repository", invoke_without_command=True)
 
@@ -48,6 +53,11 @@ def clone_callback(
     output: str = typer.Option("text", "--output", "-o", help="Output format, text, json"),
     dry_run: bool = typer.Option(False, "--dry-run", "-d", help="Dry run"),
     timeout: int = typer.Option(10, "--timeout", "-t", help="Timeout in seconds"),
+    sparse_paths: List[str] = typer.Option(
+        None, "--sparse-path", "-s", help="Only check out this path (repeatable); other blobs are not downloaded"
+    ),
+    mirror: bool = typer.Option(True, "--mirror/--no-mirror", help="Clone from the local mirror when one exists"),
+    mirror_only: bool = typer.Option(False, "--mirror-only", "-m", help="Only create or update the local mirror"),
 ):
     """Clone a repository"""
     try:
@@ -61,8 +71,22 @@ def clone_callback(
         logger.debug(debug_output_param.format(output=output))
         logger.debug(debug_dry_run_param.format(dry_run=dry_run))
         logger.debug(debug_timeout_param.format(timeout=timeout))
+        logger.debug(debug_sparse_paths_param.format(sparse_paths=sparse_paths))
+        logger.debug(debug_mirror_param.format(mirror=mirror, mirror_only=mirror_only))
         
-        config = CloneConfig(repo=repo, branch=branch, path=path, force=force, verbose=verbose, output=output, dry_run=dry_run)
+        config = CloneConfig(
+            repo=repo,
+            branch=branch,
+            path=path,
+            force=force,
+            verbose=verbose,
+            output=output,
+            dry_run=dry_run,
+            sparse_paths=sparse_paths,
+            mirror=mirror,
+            mirror_only=mirror_only,
+            mirror_dir=mirror_dir,
+        )
         logger.debug(debug_config_created.format(config_type="CloneConfig"))
         
         clone_operation = Clone(logger=logger)
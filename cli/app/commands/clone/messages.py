@@ -7,6 +7,16 @@ debug_removing_directory = "Removing existing directory: {path}"
 debug_directory_removal_failed = "Failed to remove existing directory"
 debug_path_exists_force_disabled = "Path exists and force disabled: {path}"
 debug_clone_completed = "Clone completed in {duration}s - success: {success}"
+debug_updating_existing_checkout = "Updating existing checkout in place: {path}"
+debug_executing_git_update = "Executing git update: {command}"
+debug_git_update_failed = "Git update failed (code: {code}): {error}"
+debug_update_fell_back_to_clone = "In-place update failed, re-cloning: {error}"
+debug_creating_mirror = "Creating local mirror: {path}"
+debug_updating_mirror = "Updating local mirror: {path}"
+debug_mirror_sync_failed = "Failed to sync local mirror {path}: {error}"
+debug_cloning_from_mirror = "Cloning from local mirror: {path}"
+debug_mirror_clone_failed = "Clone from local mirror failed, cloning from the remote: {error}"
+existing_checkout_has_different_origin = "Checkout at {path} tracks {origin}, not the requested repository"
 debug_clone_command_invoked = "Clone command invoked with parameters:"
 debug_repo_param = "  repo: {repo}"
 debug_branch_param = "  branch: {branch}"
@@ -23,6 +33,8 @@ debug_clone_operation_completed = "Clone operation completed successfully"
 debug_exception_caught = "Exception caught in clone callback: {error_type}: {error}"
 debug_exception_details = "Exception details: {error}"
 debug_timeout_param = "  timeout: {timeout}"
+debug_sparse_paths_param = "  sparse_paths: {sparse_paths}"
+debug_mirror_param = "  mirror: {mirror}, mirror_only: {mirror_only}"
 debug_config_created = "Created {config_type} with parameters"
 debug_action_created = "Created {action_type} action instance"
 debug_timeout_wrapper_created = "TimeoutWrapper created with {timeout}s timeout"
@@ -37,6 +49,7 @@ invalid_repository_url = "Invalid repository URL format"
 invalid_path = "Invalid path format"
 unknown_error = "Unknown error"
 successfully_cloned = "Successfully cloned {repo} to {path}"
+mirror_updated = "Local mirror of {repo} is up to date at {path}"
 dry_run_mode = "=== DRY RUN MODE ==="
 dry_run_command_would_be_executed = "The following command would be executed:"
 dry_run_command = "Command: {command}"
@@ -44,6 +57,9 @@ dry_run_repository = "Repository: {repo}"
 dry_run_branch = "Branch: {branch}"
 dry_run_target_path = "Target path: {path}"
 dry_run_force_mode = "Force mode: {force}"
+dry_run_sparse_paths = "Sparse paths: {paths}"
+dry_run_mirror = "Local mirror: {path}"
+dry_run_update_existing = "Path {path} is a git checkout and will be updated in place (force mode)"
 path_exists_will_overwrite = "Path {path} exists and will be overwritten (force mode)"
 path_exists_would_fail = "Path {path} exists - clone would fail without --force"
 target_path_not_exists = "Target path {path} does not exist"
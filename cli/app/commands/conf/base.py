@@ -7,7 +7,7 @@ from pydantic import BaseModel, Field, field_validator
 
 from app.utils.logger import Logger
 from app.utils.protocols import LoggerProtocol
-from app.utils.config import Config, API_ENV_FILE, VIEW_ENV_FILE
+from app.utils.config import get_config, API_ENV_FILE, VIEW_ENV_FILE
 
 from .messages import (
     backup_created,
@@ -157,7 +157,7 @@ class BaseEnvironmentManager:
         if env_file:
             return env_file
 
-        config = Config()
+        config = get_config()
         if service == "api":
             default_path = config.get_yaml_value(API_ENV_FILE)
             return default_path
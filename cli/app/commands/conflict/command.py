@@ -20,6 +20,7 @@ def conflict_callback(
     timeout: int = typer.Option(5, "--timeout", "-t", help="Timeout for tool checks in seconds"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
     output: str = typer.Option("text", "--output", "-o", help="Output format (text/json)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Run every version command again instead of reusing earlier output"),
 ) -> None:
     """Check for tool version conflicts"""
     if ctx.invoked_subcommand is None:
@@ -33,6 +34,7 @@ def conflict_callback(
                 config_file=config_file,
                 verbose=verbose,
                 output=output,
+                use_cache=not no_cache,
             )
 
             service = ConflictService(config, logger=logger)
@@ -1,6 +1,8 @@
 import os
 import subprocess
 import re
+import threading
+from concurrent.futures import Future
 from typing import Dict, List, Optional, Any, Tuple
 from packaging import version
 from packaging.specifiers import SpecifierSet
@@ -9,8 +11,10 @@ from packaging.version import Version
 from app.utils.logger import Logger
 from app.utils.protocols import LoggerProtocol
 from app.utils.output_formatter import OutputFormatter
-from app.utils.lib import ParallelProcessor
-from app.utils.config import Config, DEPS
+from app.utils.executor import SUBPROCESS, process_items
+from app.utils.config import get_config, DEPS
+from app.utils.timeout import run_with_deadline
+from app.utils.tool_versions import ToolVersionCache, get_tool_version_cache
 from .models import ConflictCheckResult, ConflictConfig
 from .messages import *
 
@@ -181,10 +185,21 @@ class ToolVersionChecker:
     # Tool name mappings for command execution
     TOOL_MAPPING = {"open-ssh": "ssh", "open-sshserver": "sshd", "python3-venv": "python3"}  # TODO: @shravan20 Fix this issue
 
-    def __init__(self, logger: LoggerProtocol, deps_config: Optional[Dict[str, Any]] = None, timeout: int = 10):
+    def __init__(
+        self,
+        logger: LoggerProtocol,
+        deps_config: Optional[Dict[str, Any]] = None,
+        timeout: int = 10,
+        cache: Optional[ToolVersionCache] = None,
+        use_cache: bool = True,
+    ):
         self.timeout = timeout  # Default timeout for individual subprocess calls
         self.logger = logger
         self.deps_config = deps_config or {}
+        self.cache = (cache or get_tool_version_cache()) if use_cache else None
+        # One probe per distinct version command, shared by every tool that uses it
+        self._probes: Dict[Tuple[Tuple[str, ...], ...], Future] = {}
+        self._probes_lock = threading.Lock()
 
     def get_tool_version(self, tool: str) -> Optional[str]:
         """Get version of a tool."""
@@ -198,16 +213,9 @@ class ToolVersionChecker:
             if not cmd:
                 cmd = [tool, "--version"]
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
-
-            if result.returncode == 0:
-                return VersionParser.parse_version_output(tool, result.stdout)
-            else:
-                # fallback to alternative command if available
-                alt_cmd = [tool, "-v"]
-                result = subprocess.run(alt_cmd, capture_output=True, text=True, timeout=self.timeout)
-                if result.returncode == 0:
-                    return VersionParser.parse_version_output(tool, result.stdout)
+            output = self._probe(tuple(cmd), (tool, "-v"))
+            if output is not None:
+                return VersionParser.parse_version_output(tool, output)
 
         except subprocess.TimeoutExpired:
             self.logger.error(timeout_checking_tool.format(tool=tool))
@@ -218,6 +226,41 @@ class ToolVersionChecker:
 
         return None
 
+    def _probe(self, cmd: Tuple[str, ...], alt_cmd: Tuple[str, ...]) -> Optional[str]:
+        """Output of the version command, run at most once per checker for identical commands"""
+        key = (cmd, alt_cmd)
+        with self._probes_lock:
+            future = self._probes.get(key)
+            owner = future is None
+            if owner:
+                future = self._probes[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            output = self._run_version_command(cmd, alt_cmd)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        future.set_result(output)
+        return output
+
+    def _run_version_command(self, cmd: Tuple[str, ...], alt_cmd: Tuple[str, ...]) -> Optional[str]:
+        cached = self.cache.get(cmd + alt_cmd) if self.cache else None
+        if cached is not None:
+            self.logger.debug(debug_tool_version_cached.format(command=" ".join(cmd)))
+            return cached
+
+        result = run_with_deadline(list(cmd), capture_output=True, text=True, timeout=self.timeout)
+        if result.returncode != 0:
+            # fallback to alternative command if available
+            result = run_with_deadline(list(alt_cmd), capture_output=True, text=True, timeout=self.timeout)
+            if result.returncode != 0:
+                return None
+
+        if self.cache:
+            self.cache.put(cmd + alt_cmd, result.stdout)
+        return result.stdout
+
     def check_tool_version(self, tool: str, expected_version: Optional[str]) -> ConflictCheckResult:
         """Check a single tool's version against expected version."""
         command_name = self.TOOL_MAPPING.get(tool, tool)
@@ -255,11 +298,11 @@ class ConflictChecker:
     def __init__(self, config: ConflictConfig, logger: LoggerProtocol):
         self.config = config
         self.logger = logger
-        self.yaml_config = Config()
+        self.yaml_config = get_config()
         # Load deps config for version-command lookup
         config_data = self._load_user_config(self.config.config_file)
         deps_config = config_data.get("deps", {})
-        self.version_checker = ToolVersionChecker(logger, deps_config)
+        self.version_checker = ToolVersionChecker(logger, deps_config, use_cache=self.config.use_cache)
 
     def check_conflicts(self) -> List[ConflictCheckResult]:
         """Check for version conflicts."""
@@ -312,15 +355,15 @@ class ConflictChecker:
             return []
 
         # Check versions in parallel
-        results = ParallelProcessor.process_items(
-            items=list(version_requirements.items()),
-            processor_func=self._check_tool_version,
-            max_workers=min(len(version_requirements), 10),
+        return process_items(
+            self._check_tool_version,
+            version_requirements.items(),
+            kind=SUBPROCESS,
+            max_workers=10,
+            ordered=True,
             error_handler=self._handle_check_error,
         )
 
-        return results
-
     def _extract_version_requirements(self, deps: Dict[str, Any]) -> Dict[str, Optional[str]]:
         """Extract version requirements from deps configuration."""
         version_requirements = {}
@@ -19,6 +19,7 @@ tool_version_compatible = "Version compatible"
 error_checking_tool_version = "Error checking version for {tool}: {error}"
 error_parsing_version = "Error parsing version for {tool}: {error}"
 timeout_checking_tool = "Timeout checking tool: {tool}"
+debug_tool_version_cached = "Using cached output of {command}, the binary is unchanged"
 
 # Success/Info messages
 conflicts_found_warning = "Found {count} version conflict(s)"
@@ -21,3 +21,4 @@ class ConflictConfig(BaseModel):
     config_file: str = Field("helpers/config.prod.yaml", description="Path to configuration file")
     verbose: bool = Field(False, description="Verbose output")
     output: str = Field("text", description="Output format (text/json)")
+    use_cache: bool = Field(True, description="Reuse tool versions probed by earlier runs while the binaries are unchanged")
@@ -0,0 +1 @@
+# cli commands daemon module
@@ -0,0 +1,171 @@
+"""Thin client for the nixopus daemon.
+
+Only the standard library is imported here so the client starts in a few milliseconds. The
+caller's stdin, stdout and stderr are handed to the daemon over the unix socket, so the
+forked worker writes straight to the caller's terminal. When no daemon is listening the
+regular CLI is executed instead.
+
+Because the caller's environment and terminal go to whatever listens on the socket, the client
+connects only when the socket's directory is private to the current user and the listening
+process runs as that user or root.
+"""
+
+import json
+import os
+import signal
+import socket
+import stat
+import struct
+import sys
+from typing import List, Optional, Sequence
+
+SOCKET_PATH_ENV = "NIXOPUS_DAEMON_SOCKET"
+MAX_MESSAGE_SIZE = 1 << 20
+SHARED_TMP_DIR = "/tmp"
+SOCKET_DIR_MODE = 0o700
+
+
+def get_socket_path() -> str:
+    override = os.environ.get(SOCKET_PATH_ENV)
+    if override:
+        return override
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or os.path.join("/tmp", f"nixopus-{os.getuid()}")
+    return os.path.join(runtime_dir, "nixopus", "daemon.sock")
+
+
+def socket_dirs(socket_path: str) -> List[str]:
+    """The socket's directory and, for a socket under /tmp, each parent below /tmp, outermost first"""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    dirs = [directory]
+    parent = os.path.dirname(directory)
+    while parent.startswith(SHARED_TMP_DIR + os.sep):
+        dirs.append(parent)
+        parent = os.path.dirname(parent)
+    return dirs[::-1]
+
+
+def check_socket_dir(socket_path: str, create: bool = False) -> None:
+    """Raise PermissionError unless the socket's directories are owned by this user with mode 0700.
+
+    Anyone can create directories in /tmp, so a directory there that another user made first could
+    hold a socket of theirs. With create, missing directories are created with mode 0700.
+    """
+    dirs = socket_dirs(socket_path)
+    if create:
+        os.makedirs(os.path.dirname(dirs[0]), exist_ok=True)
+    for directory in dirs:
+        if create:
+            try:
+                os.mkdir(directory, SOCKET_DIR_MODE)
+            except FileExistsError:
+                pass
+        info = os.lstat(directory)
+        if (
+            not stat.S_ISDIR(info.st_mode)
+            or info.st_uid != os.getuid()
+            or stat.S_IMODE(info.st_mode) != SOCKET_DIR_MODE
+        ):
+            raise PermissionError(f"{directory} must be a directory owned by uid {os.getuid()} with mode 0700")
+
+
+def peer_uid(sock: socket.socket) -> Optional[int]:
+    """uid of the process at the other end of a unix socket, None where the platform cannot tell"""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid
+
+
+def peer_allowed(sock: socket.socket) -> bool:
+    uid = peer_uid(sock)
+    return uid is None or uid in (0, os.getuid())
+
+
+def encode_message(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def read_message(sock: socket.socket, buffer: bytes = b"") -> dict:
+    """Read one newline-terminated JSON message"""
+    while b"\n" not in buffer:
+        if len(buffer) > MAX_MESSAGE_SIZE:
+            raise ValueError("message too large")
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("daemon closed the connection")
+        buffer += chunk
+    return json.loads(buffer.split(b"\n", 1)[0])
+
+
+def connect(socket_path: Optional[str] = None, timeout: Optional[float] = None) -> socket.socket:
+    """Connect to the daemon; raises OSError, PermissionError included, when it cannot be trusted"""
+    socket_path = socket_path or get_socket_path()
+    check_socket_dir(socket_path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+        if not peer_allowed(sock):
+            raise PermissionError(f"{socket_path} is served by uid {peer_uid(sock)}")
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def send_control(action: str, socket_path: Optional[str] = None, timeout: float = 5) -> dict:
+    """Send a control request (ping, stop) and return the daemon's reply"""
+    with connect(socket_path, timeout) as sock:
+        sock.sendall(encode_message({"control": action}))
+        return read_message(sock)
+
+
+def run_command(argv: List[str], socket_path: Optional[str] = None, fds: Sequence[int] = (0, 1, 2)) -> int:
+    """Run a CLI command in the daemon and return its exit code.
+
+    Raises OSError when the daemon is not reachable.
+    """
+    sock = connect(socket_path)
+    with sock:
+        request = {"argv": list(argv), "cwd": os.getcwd(), "env": dict(os.environ)}
+        socket.send_fds(sock, [encode_message(request)], list(fds))
+
+        # Ctrl-C reaches only the client's process group, so it is forwarded to the worker
+        def forward(signum, frame):
+            try:
+                sock.sendall(encode_message({"signal": signum}))
+            except OSError:
+                pass
+
+        previous = {sig: signal.signal(sig, forward) for sig in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            reply = read_message(sock)
+        except (OSError, ValueError):
+            # The command may already have run, so this must not fall back to the local CLI
+            return 1
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+    return int(reply.get("exit_code", 1))
+
+
+def exec_cli(argv: List[str]) -> None:
+    """Replace this process with the regular CLI"""
+    try:
+        os.execvp("nixopus", ["nixopus", *argv])
+    except OSError:
+        os.execv(sys.executable, [sys.executable, "-m", "app.main", *argv])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        return run_command(argv)
+    except OSError:
+        exec_cli(argv)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
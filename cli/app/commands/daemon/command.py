@@ -0,0 +1,105 @@
+import typer
+
+from app.utils.logger import Logger
+
+from .client import get_socket_path
+from .daemon import DaemonConfig, DaemonService
+from .messages import (
+    daemon_help,
+    daemon_start_help,
+    daemon_status_help,
+    daemon_stop_help,
+    daemon_stopped,
+    unexpected_error,
+)
+
+daemon_app = typer.Typer(help=daemon_help)
+
+
+@daemon_app.command(help=daemon_start_help)
+def start(
+    socket_path: str = typer.Option(..., "--socket", "-s", default_factory=get_socket_path, help="Unix socket path"),
+    detach: bool = typer.Option(False, "--detach", "-d", help="Run in the background"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    output: str = typer.Option("text", "--output", "-o", help="Output format: text, json"),
+):
+    """Start the daemon"""
+    logger = Logger(verbose=verbose)
+
+    try:
+        config = DaemonConfig(socket_path=socket_path, detach=detach, verbose=verbose, output=output)
+        service = DaemonService(config, logger=logger)
+        result = service.start()
+
+        if not detach:
+            logger.info(daemon_stopped)
+        elif result.running:
+            logger.success(service.format_output(result))
+        else:
+            logger.error(service.format_output(result))
+            raise typer.Exit(1)
+
+    except (ValueError, RuntimeError) as e:
+        logger.error(str(e))
+        raise typer.Exit(1)
+    except Exception as e:
+        if not isinstance(e, typer.Exit):
+            logger.error(unexpected_error.format(error=str(e)))
+        raise typer.Exit(1)
+
+
+@daemon_app.command(help=daemon_stop_help)
+def stop(
+    socket_path: str = typer.Option(..., "--socket", "-s", default_factory=get_socket_path, help="Unix socket path"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    output: str = typer.Option("text", "--output", "-o", help="Output format: text, json"),
+):
+    """Stop the daemon"""
+    logger = Logger(verbose=verbose)
+
+    try:
+        config = DaemonConfig(socket_path=socket_path, verbose=verbose, output=output)
+        service = DaemonService(config, logger=logger)
+        result = service.stop()
+
+        if result.error:
+            logger.error(service.format_output(result))
+            raise typer.Exit(1)
+        logger.success(daemon_stopped)
+
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(1)
+    except Exception as e:
+        if not isinstance(e, typer.Exit):
+            logger.error(unexpected_error.format(error=str(e)))
+        raise typer.Exit(1)
+
+
+@daemon_app.command(help=daemon_status_help)
+def status(
+    socket_path: str = typer.Option(..., "--socket", "-s", default_factory=get_socket_path, help="Unix socket path"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    output: str = typer.Option("text", "--output", "-o", help="Output format: text, json"),
+):
+    """Show daemon status"""
+    logger = Logger(verbose=verbose)
+
+    try:
+        config = DaemonConfig(socket_path=socket_path, verbose=verbose, output=output)
+        service = DaemonService(config, logger=logger)
+        result = service.status()
+
+        if result.running:
+            logger.success(service.format_output(result))
+        else:
+            logger.error(service.format_output(result))
+            raise typer.Exit(1)
+
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(1)
+    except Exception as e:
+        if not isinstance(e, typer.Exit):
+            logger.error(unexpected_error.format(error=str(e)))
+        raise typer.Exit(1)
@@ -0,0 +1,297 @@
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+import click
+import typer
+from pydantic import BaseModel, Field, field_validator
+
+from app.utils.config import PORTS, get_config
+from app.utils.logger import Logger
+from app.utils.output_formatter import OutputFormatter
+from app.utils.protocols import LoggerProtocol
+
+from .client import check_socket_dir, encode_message, get_socket_path, peer_allowed, read_message, send_control
+from .messages import (
+    daemon_already_running,
+    daemon_listening,
+    daemon_not_running,
+    daemon_running,
+    daemon_stopping,
+    daemon_warmed_up,
+    debug_removing_stale_socket,
+    insecure_socket_dir,
+    invalid_socket_path,
+)
+
+PROG_NAME = "nixopus"
+
+
+class DaemonStopped(Exception):
+    pass
+
+
+class DaemonConfig(BaseModel):
+    socket_path: str = Field(default_factory=get_socket_path, description="Unix socket the daemon listens on")
+    detach: bool = Field(False, description="Run the daemon in the background")
+    verbose: bool = Field(False, description="Verbose output")
+    output: str = Field("text", description="Output format: text, json")
+
+    @field_validator("socket_path")
+    @classmethod
+    def validate_socket_path(cls, socket_path: str) -> str:
+        stripped = socket_path.strip()
+        if not stripped:
+            raise ValueError(invalid_socket_path)
+        return os.path.abspath(stripped)
+
+
+class DaemonResult(BaseModel):
+    socket_path: str
+    running: bool
+    pid: Optional[int] = None
+    uptime: Optional[float] = None
+    served: int = 0
+    error: Optional[str] = None
+    output: str = "text"
+
+
+class DaemonRequestHandler(socketserver.BaseRequestHandler):
+    """Handles one client connection; runs in a worker forked from the warm daemon"""
+
+    server: "DaemonServer"
+
+    def handle(self):
+        if not peer_allowed(self.request):
+            return
+        try:
+            message, fds = self._receive()
+        except (OSError, ValueError):
+            return
+
+        if "control" in message:
+            self._handle_control(message["control"])
+            return
+
+        exit_code = self.server.run_cli(message, fds, self.request)
+        try:
+            self.request.sendall(encode_message({"exit_code": exit_code}))
+        except OSError:
+            pass
+
+    def _receive(self):
+        data, fds, _, _ = socket.recv_fds(self.request, 65536, 3)
+        return read_message(self.request, data), fds
+
+    def _handle_control(self, action: str):
+        reply = self.server.describe()
+        if action == "stop":
+            reply["stopping"] = True
+        self.request.sendall(encode_message(reply))
+        if action == "stop":
+            os.kill(self.server.pid, signal.SIGTERM)
+
+
+class DaemonServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Keeps the CLI imported and its config parsed; each request runs in a fork of this process"""
+
+    def __init__(self, socket_path: str, cli: click.Command):
+        self.socket_path = socket_path
+        self.cli = cli
+        self.pid = os.getpid()
+        self.started_at = time.time()
+        self.served = 0
+        super().__init__(socket_path, DaemonRequestHandler)
+
+    def server_bind(self):
+        old_umask = os.umask(0o077)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+    def process_request(self, request, client_address):
+        self.served += 1
+        super().process_request(request, client_address)
+
+    def describe(self) -> dict:
+        return {"pid": self.pid, "uptime": round(time.time() - self.started_at, 1), "served": self.served - 1}
+
+    def run_cli(self, request: dict, fds: List[int], conn: socket.socket) -> int:
+        """Run one CLI invocation with the client's stdio, cwd and environment"""
+        for target, fd in enumerate(fds[:3]):
+            os.dup2(fd, target)
+            os.close(fd)
+        _rebind_std_streams()
+
+        os.environ.clear()
+        os.environ.update(request.get("env", {}))
+        os.chdir(request.get("cwd") or "/")
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        threading.Thread(target=_forward_signals, args=(conn,), daemon=True).start()
+
+        try:
+            self.cli.main(args=request.get("argv", []), prog_name=PROG_NAME, standalone_mode=True)
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except KeyboardInterrupt:
+            exit_code = 130
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        return exit_code
+
+
+def _rebind_std_streams():
+    # Buffering and tty detection were decided for the daemon's own stdio, so start fresh
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", buffering=1 if os.isatty(1) else -1, closefd=False)
+    sys.stderr = open(2, "w", buffering=1, closefd=False, errors="backslashreplace")
+
+
+def _forward_signals(conn: socket.socket):
+    try:
+        while True:
+            message = read_message(conn)
+            if "signal" in message:
+                os.kill(os.getpid(), int(message["signal"]))
+    except (OSError, ValueError):
+        pass
+
+
+def build_cli() -> click.Command:
+    """Build the CLI once with every subcommand imported, so forked workers start warm"""
+    from app.main import app
+
+    cli = typer.main.get_command(app)
+    ctx = click.Context(cli, info_name=PROG_NAME)
+    for name in cli.list_commands(ctx):
+        cli.get_command(ctx, name)
+    get_config().get_yaml_value(PORTS)
+    return cli
+
+
+class DaemonFormatter:
+    def __init__(self):
+        self.output_formatter = OutputFormatter()
+
+    def format_output(self, result: DaemonResult, output: str) -> str:
+        if result.running:
+            message = daemon_running.format(
+                pid=result.pid, uptime=result.uptime, served=result.served, socket=result.socket_path
+            )
+            output_message = self.output_formatter.create_success_message(message, result.model_dump())
+        else:
+            error = result.error or daemon_not_running.format(socket=result.socket_path)
+            output_message = self.output_formatter.create_error_message(error, result.model_dump())
+        return self.output_formatter.format_output(output_message, output)
+
+
+class DaemonService:
+    def __init__(self, config: DaemonConfig, logger: LoggerProtocol = None):
+        self.config = config
+        self.logger = logger or Logger(verbose=config.verbose)
+        self.formatter = DaemonFormatter()
+
+    def _create_result(self, reply: Optional[dict] = None, error: str = None) -> DaemonResult:
+        reply = reply or {}
+        return DaemonResult(
+            socket_path=self.config.socket_path,
+            running=bool(reply) and error is None,
+            pid=reply.get("pid"),
+            uptime=reply.get("uptime"),
+            served=reply.get("served", 0),
+            error=error,
+            output=self.config.output,
+        )
+
+    def status(self) -> DaemonResult:
+        try:
+            return self._create_result(send_control("ping", self.config.socket_path))
+        except (OSError, ValueError):
+            return self._create_result(error=daemon_not_running.format(socket=self.config.socket_path))
+
+    def stop(self) -> DaemonResult:
+        try:
+            reply = send_control("stop", self.config.socket_path)
+        except (OSError, ValueError):
+            return self._create_result(error=daemon_not_running.format(socket=self.config.socket_path))
+        self.logger.debug(daemon_stopping.format(pid=reply.get("pid")))
+        return self._create_result(reply).model_copy(update={"running": False})
+
+    def _prepare_socket(self):
+        if self.status().running:
+            raise RuntimeError(daemon_already_running.format(socket=self.config.socket_path))
+        try:
+            check_socket_dir(self.config.socket_path, create=True)
+        except PermissionError as e:
+            raise RuntimeError(insecure_socket_dir.format(error=e))
+        if os.path.exists(self.config.socket_path):
+            self.logger.debug(debug_removing_stale_socket.format(socket=self.config.socket_path))
+            os.unlink(self.config.socket_path)
+
+    def start(self) -> DaemonResult:
+        """Serve until stopped; with detach the calling process returns once the daemon answers"""
+        self._prepare_socket()
+        cli = build_cli()
+        self.logger.debug(daemon_warmed_up)
+
+        if self.config.detach and os.fork() != 0:
+            return self._wait_until_running()
+        if self.config.detach:
+            _detach_from_terminal()
+
+        try:
+            server = DaemonServer(self.config.socket_path, cli)
+            self.logger.info(daemon_listening.format(socket=self.config.socket_path, pid=server.pid))
+            self.serve(server)
+        finally:
+            if self.config.detach:
+                os._exit(0)
+        return self._create_result()
+
+    def serve(self, server: DaemonServer):
+        def request_stop(signum, frame):
+            raise DaemonStopped()
+
+        previous = signal.signal(signal.SIGTERM, request_stop)
+        try:
+            server.serve_forever()
+        except (DaemonStopped, KeyboardInterrupt):
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            server.server_close()
+            if os.path.exists(self.config.socket_path):
+                os.unlink(self.config.socket_path)
+
+    def _wait_until_running(self, timeout: float = 10) -> DaemonResult:
+        deadline = time.monotonic() + timeout
+        result = self.status()
+        while not result.running and time.monotonic() < deadline:
+            time.sleep(0.05)
+            result = self.status()
+        return result
+
+    def format_output(self, result: DaemonResult) -> str:
+        return self.formatter.format_output(result, self.config.output)
+
+
+def _detach_from_terminal():
+    os.setsid()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+    os.chdir("/")
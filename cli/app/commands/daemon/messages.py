@@ -0,0 +1,15 @@
+daemon_help = "Run a resident daemon that serves CLI commands without interpreter startup"
+daemon_start_help = "Start the daemon"
+daemon_stop_help = "Stop the daemon"
+daemon_status_help = "Show daemon status"
+daemon_running = "Daemon running (pid {pid}, up {uptime}s, {served} requests served) on {socket}"
+daemon_not_running = "Daemon is not running on {socket}"
+daemon_already_running = "Daemon is already running on {socket}"
+daemon_listening = "Daemon listening on {socket} (pid {pid})"
+daemon_stopping = "Stopping daemon (pid {pid})"
+daemon_stopped = "Daemon stopped"
+daemon_warmed_up = "CLI commands and configuration loaded"
+invalid_socket_path = "Socket path cannot be empty"
+insecure_socket_dir = "Refusing to use the socket directory: {error}"
+debug_removing_stale_socket = "Removing stale socket: {socket}"
+unexpected_error = "Unexpected error: {error}"
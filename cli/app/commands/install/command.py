@@ -6,7 +6,7 @@ from app.utils.timeout import TimeoutWrapper
 from .deps import install_all_deps
 
 from .run import Install
-from .ssh import SSH, SSHConfig
+from .ssh import DEFAULT_SSH_KEY_PATH, SSH, SSHConfig, default_key_path
 
 install_app = typer.Typer(help="Install Nixopus", invoke_without_command=True)
 
@@ -21,6 +21,9 @@ def install_callback(
     config_file: str = typer.Option(None, "--config-file", "-c", help="Path to custom config file (defaults to built-in config)"),
     api_domain: str = typer.Option(None, "--api-domain", "-ad", help="The domain where the nixopus api will be accessible (e.g. api.nixopus.com), if not provided you can use the ip address of the server and the port (e.g. 192.168.1.100:8443)"),
     view_domain: str = typer.Option(None, "--view-domain", "-vd", help="The domain where the nixopus view will be accessible (e.g. nixopus.com), if not provided you can use the ip address of the server and the port (e.g. 192.168.1.100:80)"),
+    jobs: int = typer.Option(4, "--jobs", "-j", min=1, help="How many independent install steps may run at the same time"),
+    resume: bool = typer.Option(False, "--resume", "-r", help="Skip steps a previous install already completed with the same inputs"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Probe the host again instead of reusing cached host facts"),
 ):
     """Install Nixopus"""
     if ctx.invoked_subcommand is None:
@@ -33,7 +36,10 @@ def install_callback(
             dry_run=dry_run, 
             config_file=config_file,
             api_domain=api_domain,
-            view_domain=view_domain
+            view_domain=view_domain,
+            jobs=jobs,
+            resume=resume,
+            no_cache=no_cache,
         )
         install.run()
 
@@ -46,9 +52,9 @@ def main_install_callback(value: bool):
 
 @install_app.command(name="ssh")
 def ssh(
-    path: str = typer.Option("~/.ssh/nixopus_rsa", "--path", "-p", help="The SSH key path to generate"),
-    key_type: str = typer.Option("rsa", "--key-type", "-t", help="The SSH key type (rsa, ed25519, ecdsa)"),
-    key_size: int = typer.Option(4096, "--key-size", "-s", help="The SSH key size"),
+    path: str = typer.Option(DEFAULT_SSH_KEY_PATH, "--path", "-p", help="The SSH key path to generate"),
+    key_type: str = typer.Option("ed25519", "--key-type", "-t", help="The SSH key type (rsa, ed25519, ecdsa)"),
+    key_size: int = typer.Option(256, "--key-size", "-s", help="The SSH key size (ignored for ed25519)"),
     passphrase: str = typer.Option(None, "--passphrase", "-P", help="The passphrase to use for the SSH key"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
     output: str = typer.Option("text", "--output", "-o", help="Output format, text, json"),
@@ -66,6 +72,8 @@ def ssh(
     """Generate an SSH key pair with proper permissions and optional authorized_keys integration"""
     try:
         logger = Logger(verbose=verbose)
+        if path == DEFAULT_SSH_KEY_PATH:
+            path = default_key_path()
         config = SSHConfig(
             path=path,
             key_type=key_type,
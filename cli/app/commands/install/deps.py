@@ -1,10 +1,14 @@
+import glob
+import os
 import subprocess
-import shutil
 import json
-from app.utils.config import Config
-from app.utils.lib import HostInformation
+import time
+from app.utils.config import get_config
+from app.utils.host_facts import HostFacts, get_host_facts, invalidate_host_facts
 from app.utils.logger import Logger
-from app.utils.config import DEPS
+from app.utils.path_index import get_path_index
+from app.utils.config import DEPS, PACKAGE_INDEX_MAX_AGE
+from app.utils.timeout import check_call_with_deadline
 from .messages import (
     unsupported_package_manager,
     no_supported_package_manager,
@@ -12,11 +16,14 @@ from .messages import (
     installing_dep,
     dry_run_update_cmd,
     dry_run_install_cmd,
+    retrying_packages_individually,
+    refreshing_index_after_failed_install,
+    package_index_fresh,
 )
-from app.utils.lib import ParallelProcessor
+from app.utils.executor import SUBPROCESS, process_items
 
 def get_deps_from_config():
-    config = Config()
+    config = get_config()
     deps = config.get_yaml_value(DEPS)
     return [
         {
@@ -28,62 +35,151 @@ def get_deps_from_config():
         for name, dep in deps.items()
     ]
 
+def get_package_index_max_age():
+    return int(get_config().get_yaml_value(PACKAGE_INDEX_MAX_AGE))
+
 def get_installed_deps(deps, os_name, package_manager, timeout=2, verbose=False):
     checker = DependencyChecker(Logger(verbose=verbose))
     return {dep["name"]: checker.check_dependency(dep, package_manager) for dep in deps}
 
-def update_system_packages(package_manager, logger, dry_run=False):
-    if package_manager == "apt":
-        cmd = ["sudo", "apt-get", "update"]
-    elif package_manager == "brew":
-        cmd = ["brew", "update"]
-    elif package_manager == "apk":
-        cmd = ["sudo", "apk", "update"]
-    elif package_manager == "yum":
-        cmd = ["sudo", "yum", "update"]
-    elif package_manager == "dnf":
-        cmd = ["sudo", "dnf", "update"]
-    elif package_manager == "pacman":
-        cmd = ["sudo", "pacman", "-Sy"]
-    else:
+class PackageManagerBackend:
+    """Command lines for one package manager; packages are installed in a single transaction.
+
+    update_cmd only refreshes package metadata, and index_paths (glob patterns) are touched by that
+    refresh so their modification time tells how old the local index is. When index_files is set,
+    the index only counts as present if that pattern matches, so an emptied index is refreshed.
+    """
+
+    def __init__(self, name, install_cmd, update_cmd, index_paths=(), index_files=None):
+        self.name = name
+        self.install_cmd = install_cmd
+        self.update_cmd = update_cmd
+        self.index_paths = index_paths
+        self.index_files = index_files
+
+    def install_command(self, packages):
+        return [*self.install_cmd, *packages]
+
+    def update_command(self):
+        return list(self.update_cmd)
+
+    def index_age(self):
+        """Seconds since the package index was last refreshed, or None when it cannot be told"""
+        if self.index_files and not glob.glob(self.index_files):
+            return None
+        mtimes = []
+        for pattern in self.index_paths:
+            for path in glob.glob(pattern):
+                try:
+                    mtimes.append(os.path.getmtime(path))
+                except OSError:
+                    continue
+        return time.time() - max(mtimes) if mtimes else None
+
+    def index_is_fresh(self, max_age):
+        age = self.index_age()
+        return age is not None and age <= max_age
+
+
+PACKAGE_MANAGER_BACKENDS = {
+    # Not the lists directories: `rm -rf /var/lib/apt/lists/*` bumps their mtime while emptying the index
+    "apt": PackageManagerBackend(
+        "apt",
+        ["sudo", "apt-get", "install", "-y"],
+        ["sudo", "apt-get", "update"],
+        ["/var/lib/apt/periodic/update-success-stamp", "/var/lib/apt/lists/*_Packages"],
+        index_files="/var/lib/apt/lists/*_Packages",
+    ),
+    "brew": PackageManagerBackend(
+        "brew",
+        ["brew", "install"],
+        ["brew", "update"],
+        ["/opt/homebrew/.git/FETCH_HEAD", "/usr/local/Homebrew/.git/FETCH_HEAD"],
+    ),
+    "apk": PackageManagerBackend("apk", ["sudo", "apk", "add"], ["sudo", "apk", "update"], ["/var/cache/apk"]),
+    "yum": PackageManagerBackend("yum", ["sudo", "yum", "install", "-y"], ["sudo", "yum", "makecache"], ["/var/cache/yum"]),
+    "dnf": PackageManagerBackend("dnf", ["sudo", "dnf", "install", "-y"], ["sudo", "dnf", "makecache"], ["/var/cache/dnf"]),
+    "pacman": PackageManagerBackend(
+        "pacman", ["sudo", "pacman", "-S", "--noconfirm"], ["sudo", "pacman", "-Sy"], ["/var/lib/pacman/sync"]
+    ),
+}
+
+# Custom install scripts do not share the package manager transaction, so a few may run at once
+MAX_SCRIPT_INSTALL_WORKERS = 4
+
+def get_package_manager_backend(package_manager):
+    backend = PACKAGE_MANAGER_BACKENDS.get(package_manager)
+    if backend is None:
         raise Exception(unsupported_package_manager.format(package_manager=package_manager))
+    return backend
+
+def update_system_packages(package_manager, logger, dry_run=False, max_age=None):
+    """Refresh the package index unless it was refreshed within max_age seconds; returns whether it ran"""
+    backend = get_package_manager_backend(package_manager)
+    if max_age is not None and backend.index_is_fresh(max_age):
+        logger.debug(package_index_fresh.format(package_manager=backend.name, age=int(backend.index_age())))
+        return False
+    cmd = backend.update_command()
     if dry_run:
         logger.info(dry_run_update_cmd.format(cmd=' '.join(cmd)))
     else:
-        subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        check_call_with_deadline(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return True
 
-def install_dep(dep, package_manager, logger, dry_run=False):
-    package = dep["package"]
-    install_command = dep.get("install_command", "")
+def _run_install(cmd, dep, logger, dry_run=False):
+    if dry_run:
+        logger.info(dry_run_install_cmd.format(cmd=' '.join(cmd)))
+        return True
     try:
-        if install_command:
-            if dry_run:
-                logger.info(f"[DRY RUN] Would run: {install_command}")
-                return True
-            subprocess.check_call(install_command, shell=True)
-            return True
-        if package_manager == "apt":
-            cmd = ["sudo", "apt-get", "install", "-y", package]
-        elif package_manager == "brew":
-            cmd = ["brew", "install", package]
-        elif package_manager == "apk":
-            cmd = ["sudo", "apk", "add", package]
-        elif package_manager == "yum":
-            cmd = ["sudo", "yum", "install", "-y", package]
-        elif package_manager == "dnf":
-            cmd = ["sudo", "dnf", "install", "-y", package]
-        elif package_manager == "pacman":
-            cmd = ["sudo", "pacman", "-S", "--noconfirm", package]
+        check_call_with_deadline(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return True
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.error(failed_to_install.format(dep=dep, error=e))
+        return False
+
+def install_packages(deps, package_manager, logger, dry_run=False, index_refreshed=False):
+    """Install every package in one package manager call and return {dependency name: installed}.
+
+    A failed call is retried once after refreshing the package index, unless index_refreshed says
+    it was already refreshed in this run, since a stale index is the usual reason packages are missing.
+    """
+    if not deps:
+        return {}
+    backend = get_package_manager_backend(package_manager)
+    packages = list(dict.fromkeys(dep["package"] for dep in deps))
+    logger.info(installing_dep.format(dep=', '.join(packages)))
+    if _run_install(backend.install_command(packages), ', '.join(packages), logger, dry_run):
+        return {dep["name"]: True for dep in deps}
+    if not index_refreshed:
+        logger.debug(refreshing_index_after_failed_install.format(package_manager=backend.name))
+        try:
+            update_system_packages(package_manager, logger, dry_run=dry_run)
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.error(failed_to_install.format(dep=', '.join(packages), error=e))
         else:
-            raise Exception(unsupported_package_manager.format(package_manager=package_manager))
-        logger.info(installing_dep.format(dep=package))
-        if dry_run:
-            logger.info(dry_run_install_cmd.format(cmd=' '.join(cmd)))
-            return True
-        subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if _run_install(backend.install_command(packages), ', '.join(packages), logger, dry_run):
+                return {dep["name"]: True for dep in deps}
+    if len(packages) == 1:
+        return {dep["name"]: False for dep in deps}
+
+    # One unavailable package fails the whole transaction, so retry one at a time to report per package
+    logger.debug(retrying_packages_individually)
+    return {
+        dep["name"]: _run_install(backend.install_command([dep["package"]]), dep["package"], logger, dry_run)
+        for dep in deps
+    }
+
+def run_install_command(dep, logger, dry_run=False):
+    install_command = dep["install_command"]
+    if dry_run:
+        logger.info(dry_run_install_cmd.format(cmd=install_command))
+        return True
+    logger.info(installing_dep.format(dep=dep["package"]))
+    try:
+        check_call_with_deadline(install_command, shell=True)
         return True
-    except Exception as e:
-        logger.error(failed_to_install.format(dep=package, error=e))
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.error(failed_to_install.format(dep=dep["package"], error=e))
         return False
 
 class DependencyChecker:
@@ -93,38 +189,51 @@ class DependencyChecker:
     def check_dependency(self, dep, package_manager):
         try:
             if dep["command"]:
-                is_available = shutil.which(dep["command"]) is not None
+                is_available = get_path_index().has(dep["command"])
                 return is_available
             return True
         except Exception:
             return False
 
-def install_all_deps(verbose=False, output="text", dry_run=False):
+def install_all_deps(verbose=False, output="text", dry_run=False, facts: HostFacts = None):
     logger = Logger(verbose=verbose)
     deps = get_deps_from_config()
-    os_name = HostInformation.get_os_name()
-    package_manager = HostInformation.get_package_manager()
+    facts = facts or get_host_facts()
+    os_name = facts.os_name
+    package_manager = facts.package_manager
     if not package_manager:
         raise Exception(no_supported_package_manager)
     installed = get_installed_deps(deps, os_name, package_manager, verbose=verbose)
-    update_system_packages(package_manager, logger, dry_run=dry_run)
     to_install = [dep for dep in deps if not installed.get(dep["name"])]
+    index_refreshed = False
+    if to_install:
+        index_refreshed = update_system_packages(package_manager, logger, dry_run=dry_run, max_age=get_package_index_max_age())
+    packaged = [dep for dep in to_install if not dep["install_command"]]
+    scripted = [dep for dep in to_install if dep["install_command"]]
+
+    results = [
+        {"dependency": name, "installed": ok}
+        for name, ok in install_packages(packaged, package_manager, logger, dry_run=dry_run, index_refreshed=index_refreshed).items()
+    ]
 
+    # Scripts run after the batch because they may rely on its packages (e.g. curl for get-docker.sh)
     def install_wrapper(dep):
-        ok = install_dep(dep, package_manager, logger, dry_run=dry_run)
+        ok = run_install_command(dep, logger, dry_run=dry_run)
         return {"dependency": dep["name"], "installed": ok}
 
     def error_handler(dep, exc):
         logger.error(f"Failed to install {dep['name']}: {exc}")
         return {"dependency": dep["name"], "installed": False}
 
-    results = ParallelProcessor.process_items(
-        to_install,
-        install_wrapper,
-        max_workers=min(len(to_install), 8),
-        error_handler=error_handler,
+    results += process_items(
+        install_wrapper, scripted, kind=SUBPROCESS, max_workers=MAX_SCRIPT_INSTALL_WORKERS, ordered=True, error_handler=error_handler
     )
 
+    # Installed packages add binaries to PATH that the index has not seen yet, and may start docker
+    if to_install and not dry_run:
+        get_path_index().invalidate()
+        invalidate_host_facts()
+
     installed_after = get_installed_deps(deps, os_name, package_manager, verbose=verbose)
     failed = [dep["name"] for dep in deps if not installed_after.get(dep["name"])]
     if failed and not dry_run:
@@ -0,0 +1,47 @@
+from typing import Dict, List
+
+from app.utils.config import IMAGE_PULL_JOBS, get_config
+from app.utils.executor import SUBPROCESS, process_items
+from app.utils.protocols import LoggerProtocol
+from app.utils.timeout import run_with_deadline
+
+from .messages import dry_run_pull_image, image_pull_failed, pulling_image
+
+IMAGE_KEYS = [
+    "services.api.env.API_IMAGE",
+    "services.view.env.VIEW_IMAGE",
+    "services.redis.env.REDIS_IMAGE",
+    "services.db.env.DB_IMAGE",
+    "services.caddy.env.CADDY_IMAGE",
+]
+
+
+def get_images_from_config() -> List[str]:
+    """Images of the stack services, read from their *_IMAGE env values"""
+    config = get_config()
+    images = [config.get_yaml_value(key) for key in IMAGE_KEYS]
+    return list(dict.fromkeys(image for image in images if image))
+
+
+def get_image_pull_jobs() -> int:
+    return max(1, int(get_config().get_yaml_value(IMAGE_PULL_JOBS)))
+
+
+def pull_images(images: List[str], logger: LoggerProtocol, max_workers: int = 3, dry_run: bool = False) -> Dict[str, bool]:
+    """Pull images concurrently and return {image: pulled}; failures are logged, not raised"""
+
+    def pull(image: str):
+        if dry_run:
+            logger.info(dry_run_pull_image.format(image=image))
+            return image, True
+        logger.debug(pulling_image.format(image=image))
+        result = run_with_deadline(["docker", "pull", "--quiet", image], capture_output=True, text=True)
+        if result.returncode != 0:
+            logger.warning(image_pull_failed.format(image=image, error=result.stderr.strip() or result.returncode))
+        return image, result.returncode == 0
+
+    def error_handler(image: str, exc: Exception):
+        logger.warning(image_pull_failed.format(image=image, error=exc))
+        return image, False
+
+    return dict(process_items(pull, images, kind=SUBPROCESS, max_workers=max_workers, error_handler=error_handler))
@@ -0,0 +1,39 @@
+import os
+import threading
+
+from app.utils.cache import read_json_file, write_json_file
+
+JOURNAL_FILE = ".install-state.json"
+JOURNAL_VERSION = 1
+
+
+class InstallJournal:
+    """Records completed install steps with a fingerprint of their inputs, so a failed install can resume"""
+
+    def __init__(self, config_dir: str):
+        self.path = os.path.join(config_dir, JOURNAL_FILE)
+        self._lock = threading.Lock()
+        self._steps = self._load()
+
+    def _load(self) -> dict:
+        data = read_json_file(self.path)
+        if isinstance(data, dict) and data.get("version") == JOURNAL_VERSION and isinstance(data.get("steps"), dict):
+            return data["steps"]
+        return {}
+
+    def is_done(self, step: str, step_fingerprint: str) -> bool:
+        with self._lock:
+            return self._steps.get(step) == step_fingerprint
+
+    def record(self, step: str, step_fingerprint: str) -> bool:
+        with self._lock:
+            self._steps[step] = step_fingerprint
+            return write_json_file(self.path, {"version": JOURNAL_VERSION, "steps": dict(self._steps)})
+
+    def reset(self):
+        with self._lock:
+            self._steps = {}
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
@@ -1,6 +1,7 @@
 path_already_exists_use_force = "Path {path} already exists. Use --force to overwrite."
 executing_command = "Executing: {command}"
 installing_nixopus = "Installing nixopus"
+resume_skipping_step = "Skipping {step}, already completed with the same inputs"
 invalid_output_format = "Invalid output format"
 invalid_dry_run = "Invalid dry run format"
 invalid_force = "Invalid force format"
@@ -45,6 +46,9 @@ failed_to_install = "Failed to install {dep}: {error}"
 installing_dep = "Installing {dep}"
 dry_run_update_cmd = "[DRY RUN] Would run: {cmd}"
 dry_run_install_cmd = "[DRY RUN] Would run: {cmd}"
+package_index_fresh = "Skipping {package_manager} index refresh, last refreshed {age}s ago"
+retrying_packages_individually = "Batched package install failed, retrying packages one at a time"
+refreshing_index_after_failed_install = "Package install failed, refreshing the {package_manager} index and retrying"
 timeout_error = "Operation timed out after {timeout} seconds"
 failed_to_run_ssh = "Failed to run SSH setup"
 failed_to_run_up = "Failed to start services"
@@ -60,6 +64,12 @@ env_file_permissions_failed = "Failed to set environment file permissions"
 proxy_config_created = "Created Caddyfile"
 ssh_setup_failed = "SSH setup failed"
 services_start_failed = "Services failed to start"
+services_not_ready = "Services did not become healthy"
+pulling_image = "Pulling image {image}"
+dry_run_pull_image = "[DRY RUN] Would run: docker pull {image}"
+image_pull_failed = "Failed to pull image {image}, it will be pulled when services start: {error}"
+images_pulled = "Pulled {pulled}/{total} images in {duration:.0f}s ({overlapped:.0f}s overlapped with other steps)"
+service_progress_timing = "{kind} {name}: {state} after {duration}s"
 proxy_load_failed = "Failed to load Caddy proxy configuration"
 debug_ssh_config_validation = "DEBUG: Validating SSH configuration: path={path}, type={key_type}, size={key_size}"
 debug_ssh_path_expansion = "DEBUG: Expanding SSH path from '{original}' to '{expanded}'"
@@ -112,6 +122,14 @@ debug_ssh_permissions_failed_abort = "Permission setting failed: {error}"
 debug_ssh_authorized_keys_enabled = "Adding to authorized_keys enabled, updating authorized_keys file"
 debug_ssh_authorized_keys_failed_abort = "Adding to authorized_keys failed: {error}"
 debug_ssh_process_completed = "SSH key generation process completed successfully"
+debug_ssh_key_reuse_check = "Checking whether the existing key pair can be reused: {path}"
+debug_ssh_key_pair_invalid = "Existing key pair is missing or does not match its public key: {path}"
+debug_ssh_key_reuse_mismatch = "Existing {key_type} key ({bits} bits) does not match the requested {requested_type} key, regenerating"
+debug_ssh_key_reused = "Reusing existing key pair {path} ({fingerprint})"
+debug_ssh_key_already_authorized = "Public key is already in authorized_keys: {path}"
+ssh_key_reused = "Reusing existing SSH key: {key} ({fingerprint})"
+dry_run_ssh_key_reuse = "Existing key {fingerprint} would be reused"
+invalid_public_key = "Invalid public key: {path}"
 operation_timed_out = "Operation timed out"
 created_env_file = "Created {service_name} environment file: {env_file}"
 config_file_not_found = "Config file not found: {config_file}"
@@ -3,16 +3,25 @@ import os
 import yaml
 import json
 import shutil
+import subprocess
+import time
+from functools import lru_cache
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from app.utils.protocols import LoggerProtocol
-from app.utils.config import Config, VIEW_ENV_FILE, API_ENV_FILE, DEFAULT_REPO, DEFAULT_BRANCH, DEFAULT_PATH, NIXOPUS_CONFIG_DIR, PORTS, DEFAULT_COMPOSE_FILE, PROXY_PORT, SSH_KEY_TYPE, SSH_KEY_SIZE, SSH_FILE_PATH, VIEW_PORT, API_PORT, DOCKER_PORT, CADDY_CONFIG_VOLUME
-from app.utils.timeout import TimeoutWrapper
+from app.utils.config import get_config, VIEW_ENV_FILE, API_ENV_FILE, DEFAULT_REPO, DEFAULT_BRANCH, DEFAULT_PATH, SPARSE_PATHS, MIRROR_DIR, NIXOPUS_CONFIG_DIR, PUBLIC_IP, PORTS, DEFAULT_COMPOSE_FILE, PROXY_PORT, SSH_KEY_TYPE, SSH_KEY_SIZE, SSH_FILE_PATH, VIEW_PORT, API_PORT, DOCKER_PORT, CADDY_CONFIG_VOLUME
+from app.utils.timeout import TimeoutWrapper, run_with_deadline
+from app.utils.cache import file_digest, fingerprint
+from app.utils.path_index import get_path_index
+from app.utils.host_facts import get_host_facts, invalidate_host_facts
+from app.utils.scheduler import Step, StepScheduler, STEP_DONE, STEP_FAILED, STEP_RUNNING, STEP_SKIPPED
 from app.commands.preflight.run import PreflightRunner
 from app.commands.clone.clone import Clone, CloneConfig
 from app.utils.lib import HostInformation, FileManager
 from app.commands.conf.base import BaseEnvironmentManager
 import re
 from app.commands.service.up import Up, UpConfig
+from app.commands.service.progress import ComposeProgressDisplay
+from app.commands.service.wait import Wait, WaitConfig
 from app.commands.proxy.load import Load, LoadConfig
 from .ssh import SSH, SSHConfig
 from .messages import (
@@ -20,61 +29,98 @@ from .messages import (
     dependency_installation_timeout,
     clone_failed, env_file_creation_failed, env_file_permissions_failed, 
     proxy_config_created, ssh_setup_failed, services_start_failed, proxy_load_failed,
-    operation_timed_out, created_env_file, configuration_key_has_no_default_value
+    operation_timed_out, created_env_file, configuration_key_has_no_default_value,
+    resume_skipping_step, service_progress_timing, images_pulled, services_not_ready,
 )
-from .deps import install_all_deps
-
-_config = Config()
-_config_dir = _config.get_yaml_value(NIXOPUS_CONFIG_DIR)
-_source_path = _config.get_yaml_value(DEFAULT_PATH)
-
-DEFAULTS = {
-    'proxy_port': _config.get_yaml_value(PROXY_PORT),
-    'ssh_key_type': _config.get_yaml_value(SSH_KEY_TYPE),   
-    'ssh_key_size': _config.get_yaml_value(SSH_KEY_SIZE),
-    'ssh_passphrase': None,
-    'service_name': 'all',
-    'service_detach': True,
-    'required_ports': [int(port) for port in _config.get_yaml_value(PORTS)],
-    'repo_url': _config.get_yaml_value(DEFAULT_REPO),
-    'branch_name': _config.get_yaml_value(DEFAULT_BRANCH),
-    'source_path': _source_path,
-    'config_dir': _config_dir,
-    'api_env_file_path': _config.get_yaml_value(API_ENV_FILE),
-    'view_env_file_path': _config.get_yaml_value(VIEW_ENV_FILE),
-    'compose_file': _config.get_yaml_value(DEFAULT_COMPOSE_FILE),
-    'full_source_path': os.path.join(_config_dir, _source_path),
-    'ssh_key_path': _config_dir + "/" + _config.get_yaml_value(SSH_FILE_PATH),
-    'compose_file_path': _config_dir + "/" + _config.get_yaml_value(DEFAULT_COMPOSE_FILE),
-    'host_os': HostInformation.get_os_name(),
-    'package_manager': HostInformation.get_package_manager(),
-    'view_port': _config.get_yaml_value(VIEW_PORT),
-    'api_port': _config.get_yaml_value(API_PORT),   
-    'docker_port': _config.get_yaml_value(DOCKER_PORT),
-}
+from .deps import install_all_deps, get_deps_from_config
+from .journal import InstallJournal
+from .images import get_image_pull_jobs, get_images_from_config, pull_images
+
+_config = get_config()
+
+# Steps that check live state rather than produce output, so a resumed install never skips them
+UNJOURNALED_STEPS = {"wait_ready"}
+
+
+def get_source_revision(source_path: str):
+    """Commit checked out at source_path, None when it is not a git checkout"""
+    try:
+        result = run_with_deadline(["git", "-C", source_path, "rev-parse", "HEAD"], capture_output=True, text=True)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+@lru_cache(maxsize=None)
+def get_defaults() -> dict:
+    """Resolve install defaults from the built-in config on first use rather than at import time"""
+    config_dir = _config.get_yaml_value(NIXOPUS_CONFIG_DIR)
+    source_path = _config.get_yaml_value(DEFAULT_PATH)
+    return {
+        'proxy_port': _config.get_yaml_value(PROXY_PORT),
+        'ssh_key_type': _config.get_yaml_value(SSH_KEY_TYPE),
+        'ssh_key_size': _config.get_yaml_value(SSH_KEY_SIZE),
+        'ssh_passphrase': None,
+        'service_name': 'all',
+        'service_detach': True,
+        'required_ports': [int(port) for port in _config.get_yaml_value(PORTS)],
+        'repo_url': _config.get_yaml_value(DEFAULT_REPO),
+        'branch_name': _config.get_yaml_value(DEFAULT_BRANCH),
+        'source_path': source_path,
+        'sparse_paths': _config.get_yaml_value(SPARSE_PATHS),
+        'config_dir': config_dir,
+        'api_env_file_path': _config.get_yaml_value(API_ENV_FILE),
+        'view_env_file_path': _config.get_yaml_value(VIEW_ENV_FILE),
+        'compose_file': _config.get_yaml_value(DEFAULT_COMPOSE_FILE),
+        'full_source_path': os.path.join(config_dir, source_path),
+        'ssh_key_path': config_dir + "/" + _config.get_yaml_value(SSH_FILE_PATH),
+        'compose_file_path': config_dir + "/" + _config.get_yaml_value(DEFAULT_COMPOSE_FILE),
+        'view_port': _config.get_yaml_value(VIEW_PORT),
+        'api_port': _config.get_yaml_value(API_PORT),
+        'docker_port': _config.get_yaml_value(DOCKER_PORT),
+        'public_ip': _config.get_yaml_value(PUBLIC_IP),
+    }
 
 
 class Install:
-    def __init__(self, logger: LoggerProtocol = None, verbose: bool = False, timeout: int = 300, force: bool = False, dry_run: bool = False, config_file: str = None, api_domain: str = None, view_domain: str = None):
+    def __init__(self, logger: LoggerProtocol = None, verbose: bool = False, timeout: int = 300, force: bool = False, dry_run: bool = False, config_file: str = None, api_domain: str = None, view_domain: str = None, jobs: int = 4, resume: bool = False, no_cache: bool = False):
         self.logger = logger
         self.verbose = verbose
         self.timeout = timeout
+        self.jobs = jobs
+        self.resume = resume
+        self.no_cache = no_cache
         self.force = force
         self.dry_run = dry_run
         self.config_file = config_file
         self.api_domain = api_domain
         self.view_domain = view_domain
         self._user_config = _config.load_user_config(self.config_file)
+        if self.no_cache:
+            invalidate_host_facts()
         self.progress = None
         self.main_task = None
+        self._journal = None
+        self._ran_steps = set()
+        self._step_times = {}
+        self._pull_results = {}
         self._validate_domains()
     
     def _get_config(self, key: str):
         try:
-            return _config.get_config_value(key, self._user_config, DEFAULTS)
+            return _config.get_config_value(key, self._user_config, get_defaults())
         except ValueError:
             raise ValueError(configuration_key_has_no_default_value.format(key=key))
     
+    def _config_dir(self) -> str:
+        return os.path.abspath(os.path.expanduser(self._get_config('config_dir')))
+
+    def _host_facts(self):
+        """Host facts for the install's config dir, collected on first use and shared with preflight"""
+        return get_host_facts(self._config_dir())
+
     def _validate_domains(self):
         if (self.api_domain is None) != (self.view_domain is None):
             raise ValueError("Both api_domain and view_domain must be provided together, or neither should be provided")
@@ -85,21 +131,122 @@ class Install:
                 raise ValueError("Invalid domain format. Domains must be valid hostnames")
 
 
-    def run(self):
+    def _build_steps(self) -> list:
+        """Install steps and their dependencies; independent steps run concurrently"""
+        # Clone and key generation need git and ssh-keygen, which the dependency step may install
+        path_index = get_path_index()
+        clone_deps = [] if path_index.has("git") else ["deps"]
+        ssh_deps = [] if path_index.has("ssh-keygen") else ["deps"]
+        # Images are pre-pulled as soon as docker is there, overlapping clone, key generation and env rendering
+        docker_deps = [] if path_index.has("docker") else ["deps"]
         steps = [
-            ("Preflight checks", self._run_preflight_checks),
-            ("Installing dependencies", self._install_dependencies),
-            ("Cloning repository", self._setup_clone_and_config),
-            ("Setting up proxy config", self._setup_proxy_config),
-            ("Creating environment files", self._create_env_files),
-            ("Generating SSH keys", self._setup_ssh),
-            ("Starting services", self._start_services),
+            ("preflight", "Preflight checks", self._run_preflight_checks, []),
+            ("deps", "Installing dependencies", self._install_dependencies, []),
+            ("pull_images", "Pulling images", self._pull_images, docker_deps),
+            ("clone", "Cloning repository", self._setup_clone_and_config, clone_deps),
+            ("proxy_config", "Setting up proxy config", self._setup_proxy_config, ["clone"]),
+            ("env_files", "Creating environment files", self._create_env_files, ["clone"]),
+            ("ssh", "Generating SSH keys", self._setup_ssh, ssh_deps),
+            (
+                "services",
+                "Starting services",
+                self._start_services,
+                ["preflight", "deps", "pull_images", "proxy_config", "env_files", "ssh"],
+            ),
+            ("wait_ready", "Waiting for services to become healthy", self._wait_for_services, ["services"]),
         ]
-        
+
         # Only add proxy steps if both api_domain and view_domain are provided
         if self.api_domain and self.view_domain:
-            steps.append(("Loading proxy configuration", self._load_proxy))
-        
+            steps.append(("load_proxy", "Loading proxy configuration", self._load_proxy, ["wait_ready"]))
+        return [
+            Step(name, description, self._journaled(name, func, depends_on), depends_on, timeout=self.timeout)
+            for name, description, func, depends_on in steps
+        ]
+
+    def _journaled(self, name: str, func, depends_on: list):
+        """Wrap a step so it is recorded in the journal, and skipped on resume when its inputs are unchanged"""
+
+        def run():
+            if self._journal is None or name in UNJOURNALED_STEPS:
+                func()
+                return
+            # A dependency that ran again may have replaced this step's output (e.g. a fresh clone)
+            if self.resume and not self._ran_steps.intersection(depends_on):
+                if self._journal.is_done(name, self._step_fingerprint(name)):
+                    self.logger.debug(resume_skipping_step.format(step=name))
+                    return
+            func()
+            self._ran_steps.add(name)
+            self._journal.record(name, self._step_fingerprint(name))
+
+        return run
+
+    def _step_fingerprint(self, name: str) -> str:
+        """Fingerprint of a step's inputs and of the files it leaves behind"""
+        if name == "preflight":
+            return fingerprint(self._get_config('required_ports'))
+        if name == "deps":
+            deps = [(dep["name"], dep["package"], bool(dep["command"]) and get_path_index().has(dep["command"])) for dep in get_deps_from_config()]
+            return fingerprint(deps)
+        if name == "pull_images":
+            return fingerprint(get_images_from_config())
+        if name == "clone":
+            source_path = self._get_config('full_source_path')
+            return fingerprint(
+                self._get_config('repo_url'),
+                self._get_config('branch_name'),
+                self._get_config('sparse_paths'),
+                source_path,
+                get_source_revision(source_path),
+            )
+        if name == "proxy_config":
+            source_path = self._get_config('full_source_path')
+            return fingerprint(
+                self.api_domain,
+                self.view_domain,
+                self._get_public_ip(),
+                self._get_config('view_port'),
+                self._get_config('api_port'),
+                file_digest(os.path.join(source_path, 'helpers', 'caddy.json')),
+                file_digest(os.path.join(_config.get_yaml_value(CADDY_CONFIG_VOLUME), 'Caddyfile')),
+            )
+        if name == "env_files":
+            env_values = [
+                self._update_environment_variables(_config.get_service_env_values(key))
+                for key in ("services.api.env", "services.view.env")
+            ]
+            env_files = [self._get_config('api_env_file_path'), self._get_config('view_env_file_path')]
+            return fingerprint(env_values, env_files, [file_digest(path) for path in env_files])
+        if name == "ssh":
+            key_path = self._get_config('ssh_key_path')
+            return fingerprint(
+                key_path,
+                self._get_config('ssh_key_type'),
+                self._get_config('ssh_key_size'),
+                file_digest(key_path + ".pub"),
+            )
+        if name == "services":
+            env_files = [self._get_config('api_env_file_path'), self._get_config('view_env_file_path')]
+            compose_file = self._get_config('compose_file_path')
+            return fingerprint(
+                self._get_config('service_name'),
+                compose_file,
+                file_digest(compose_file),
+                [file_digest(path) for path in env_files],
+            )
+        if name == "load_proxy":
+            caddy_json = os.path.join(self._get_config('full_source_path'), 'helpers', 'caddy.json')
+            return fingerprint(self._get_config('proxy_port'), file_digest(caddy_json))
+        return fingerprint(name)
+
+    def run(self):
+        steps = self._build_steps()
+        if not self.dry_run:
+            self._journal = InstallJournal(self._get_config('config_dir'))
+            if not self.resume:
+                self._journal.reset()
+
         try:
             with Progress(
                 SpinnerColumn(),
@@ -111,17 +258,30 @@ class Install:
             ) as progress:
                 self.progress = progress
                 self.main_task = progress.add_task(installing_nixopus, total=len(steps))
-                
-                for i, (step_name, step_func) in enumerate(steps):
-                    progress.update(self.main_task, description=f"{installing_nixopus} - {step_name} ({i+1}/{len(steps)})")
-                    try:
-                        step_func()
+                step_tasks = {step.name: progress.add_task(step.description, total=1, visible=False) for step in steps}
+
+                def on_event(step: Step, status: str):
+                    task = step_tasks[step.name]
+                    if status == STEP_RUNNING:
+                        self._step_times[step.name] = [time.monotonic(), None]
+                        progress.update(task, visible=True)
+                    elif status == STEP_DONE:
+                        self._step_times[step.name][1] = time.monotonic()
+                        progress.update(task, completed=1)
                         progress.advance(self.main_task, 1)
-                    except Exception as e:
-                        progress.update(self.main_task, description=f"Failed at {step_name}")
-                        raise
-                
-                progress.update(self.main_task, completed=True, description="Installation completed")
+                        if step.name == "pull_images" and self._pull_results:
+                            summary = self._pull_summary()
+                            progress.update(task, description=summary)
+                            self.logger.debug(summary)
+                    elif status == STEP_FAILED:
+                        progress.update(task, description=f"Failed at {step.description}")
+                        progress.update(self.main_task, description=f"Failed at {step.description}")
+                    elif status == STEP_SKIPPED:
+                        progress.update(task, description=f"Skipped {step.description}")
+
+                StepScheduler(steps, max_workers=self.jobs, on_event=on_event).run()
+
+                progress.update(self.main_task, completed=len(steps), description="Installation completed")
             
             self._show_success_message()
             
@@ -138,20 +298,45 @@ class Install:
             self.logger.error(f"{installation_failed}{context_msg}")
 
     def _run_preflight_checks(self):
-        preflight_runner = PreflightRunner(logger=self.logger, verbose=self.verbose)
+        preflight_runner = PreflightRunner(logger=self.logger, verbose=self.verbose, use_cache=not self.no_cache)
+        # The same facts as the deps step; --no-cache already discarded the cached ones
+        preflight_runner.check_capacity(self._host_facts())
         preflight_runner.check_ports_from_config(
             config_key='required_ports', 
             user_config=self._user_config, 
-            defaults=DEFAULTS
+            defaults=get_defaults()
         )
 
     def _install_dependencies(self):
         try:
             with TimeoutWrapper(self.timeout):
-                result = install_all_deps(verbose=self.verbose, output="json", dry_run=self.dry_run)
+                result = install_all_deps(verbose=self.verbose, output="json", dry_run=self.dry_run, facts=self._host_facts())
         except TimeoutError:
             raise Exception(dependency_installation_timeout)
 
+    def _pull_images(self):
+        self._pull_results = pull_images(
+            get_images_from_config(), self.logger, max_workers=get_image_pull_jobs(), dry_run=self.dry_run
+        )
+
+    def _pull_summary(self) -> str:
+        """How long the pre-pull took and how much of it ran alongside other steps"""
+        start, end = self._step_times["pull_images"]
+        now = time.monotonic()
+        others = sorted(
+            (max(s, start), min(e if e is not None else now, end))
+            for name, (s, e) in self._step_times.items()
+            if name != "pull_images"
+        )
+        overlapped, covered_until = 0.0, start
+        for s, e in others:
+            s = max(s, covered_until)
+            if e > s:
+                overlapped += e - s
+                covered_until = e
+        pulled = sum(1 for ok in self._pull_results.values() if ok)
+        return images_pulled.format(pulled=pulled, total=len(self._pull_results), duration=end - start, overlapped=overlapped)
+
     def _setup_clone_and_config(self):        
         clone_config = CloneConfig(
             repo=self._get_config('repo_url'),
@@ -160,7 +345,9 @@ class Install:
             force=self.force,
             verbose=self.verbose,
             output="text",
-            dry_run=self.dry_run
+            dry_run=self.dry_run,
+            sparse_paths=self._get_config('sparse_paths'),
+            mirror_dir=_config.get_yaml_value(MIRROR_DIR) or None,
         )
         clone_service = Clone(logger=self.logger)
         try:
@@ -201,7 +388,7 @@ class Install:
             with open(caddy_json_template, 'r') as f:
                 config_str = f.read()
             
-            host_ip = HostInformation.get_public_ip()
+            host_ip = self._get_public_ip()
             view_port = self._get_config('view_port')
             api_port = self._get_config('api_port')
 
@@ -258,14 +445,33 @@ class Install:
         )
 
         up_service = Up(logger=self.logger)
+        on_progress = ComposeProgressDisplay(self.progress).update if self.progress else None
         try:
             with TimeoutWrapper(self.timeout):
-                result = up_service.up(config)
+                result = up_service.up(config, on_progress=on_progress)
         except TimeoutError:
             raise Exception(f"{services_start_failed}: {operation_timed_out}")
+        for service in result.services:
+            self.logger.debug(service_progress_timing.format(kind=service.kind, name=service.name, state=service.state, duration=service.duration))
         if not result.success:
             raise Exception(services_start_failed)
 
+    def _wait_for_services(self):
+        if self.dry_run:
+            return
+        config = WaitConfig(
+            name=self._get_config('service_name'),
+            verbose=self.verbose,
+            output="text",
+            compose_file=self._get_config('compose_file_path'),
+            timeout=self.timeout,
+            proxy_port=int(self._get_config('proxy_port')),
+            api_port=int(self._get_config('api_port')),
+        )
+        result = Wait(logger=self.logger).wait(config)
+        if not result.success:
+            raise Exception(f"{services_not_ready}: {result.error}")
+
     def _load_proxy(self):
         proxy_port = self._get_config('proxy_port')
         full_source_path = self._get_config('full_source_path')
@@ -298,7 +504,7 @@ class Install:
     
     def _update_environment_variables(self, env_values: dict) -> dict:
         updated_env = env_values.copy()
-        host_ip = HostInformation.get_public_ip()
+        host_ip = self._get_public_ip()
         secure = self.api_domain is not None and self.view_domain is not None
 
         api_host = self.api_domain if secure else f"{host_ip}:{self._get_config('api_port')}"
@@ -336,6 +542,9 @@ class Install:
         except Exception as e:
             self.logger.error(f"Failed to copy Caddyfile: {str(e)}")
 
+    def _get_public_ip(self):
+        return HostInformation.get_public_ip(override=self._get_config('public_ip'))
+
     def _get_access_url(self):
         if self.view_domain:
             return f"https://{self.view_domain}"
@@ -343,5 +552,5 @@ class Install:
             return f"https://{self.api_domain}"
         else:
             view_port = self._get_config('view_port')
-            host_ip = HostInformation.get_public_ip()
+            host_ip = self._get_public_ip()
             return f"http://{host_ip}:{view_port}"
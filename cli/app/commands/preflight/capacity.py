@@ -0,0 +1,50 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from app.utils.config import MIN_CPUS, MIN_DISK_MB, MIN_INODES, MIN_MEMORY_MB, get_config
+from app.utils.host_facts import HostFacts
+
+from .messages import (
+    insufficient_cpus,
+    insufficient_disk,
+    insufficient_inodes,
+    insufficient_memory,
+)
+
+MB = 1024 * 1024
+
+
+class CapacityRequirements(BaseModel):
+    min_cpus: float = Field(1, ge=0, description="CPUs available after cgroup quotas")
+    min_memory_mb: int = Field(1800, ge=0, description="Memory available after cgroup limits, in MB")
+    min_disk_mb: int = Field(10240, ge=0, description="Free space at the config dir and the docker data root, in MB")
+    min_inodes: int = Field(100000, ge=0, description="Free inodes at the config dir and the docker data root")
+
+    @classmethod
+    def from_config(cls) -> "CapacityRequirements":
+        config = get_config()
+        return cls(
+            min_cpus=float(config.get_yaml_value(MIN_CPUS)),
+            min_memory_mb=int(config.get_yaml_value(MIN_MEMORY_MB)),
+            min_disk_mb=int(config.get_yaml_value(MIN_DISK_MB)),
+            min_inodes=int(config.get_yaml_value(MIN_INODES)),
+        )
+
+
+def check_capacity(facts: HostFacts, requirements: CapacityRequirements) -> List[str]:
+    """Every way the host falls short of the requirements; facts that could not be collected are not held against it"""
+    shortfalls = []
+    if facts.effective_cpus < requirements.min_cpus:
+        shortfalls.append(insufficient_cpus.format(available=f"{facts.effective_cpus:g}", required=f"{requirements.min_cpus:g}"))
+
+    memory = facts.effective_memory
+    if memory is not None and memory < requirements.min_memory_mb * MB:
+        shortfalls.append(insufficient_memory.format(available=memory // MB, required=requirements.min_memory_mb))
+
+    for disk in facts.disks:
+        if disk.free_bytes < requirements.min_disk_mb * MB:
+            shortfalls.append(insufficient_disk.format(path=disk.path, available=disk.free_bytes // MB, required=requirements.min_disk_mb))
+        if disk.free_inodes is not None and disk.free_inodes < requirements.min_inodes:
+            shortfalls.append(insufficient_inodes.format(path=disk.path, available=disk.free_inodes, required=requirements.min_inodes))
+    return shortfalls
@@ -1,6 +1,6 @@
 import typer
 
-from app.utils.lib import HostInformation
+from app.utils.host_facts import get_host_facts
 from app.utils.logger import Logger
 from app.utils.timeout import TimeoutWrapper
 
@@ -26,7 +26,7 @@ from .messages import (
     error_validation_failed,
     running_preflight_checks,
 )
-from .port import PortConfig, PortService
+from .port import DEFAULT_CONNECT_TIMEOUT, DEFAULT_SCAN_CONCURRENCY, PortConfig, PortService, parse_port_specs
 
 preflight_app = typer.Typer(no_args_is_help=False)
 
@@ -43,6 +43,7 @@ def check(
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
     output: str = typer.Option("text", "--output", "-o", help="Output format, text,json"),
     timeout: int = typer.Option(10, "--timeout", "-t", help="Timeout in seconds"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Collect host facts again instead of reusing cached ones"),
 ):
     """Run all preflight checks"""
     try:
@@ -52,7 +53,8 @@ def check(
         
         logger.debug(debug_timeout_wrapper_start.format(timeout=timeout))
         with TimeoutWrapper(timeout):
-            preflight_runner = PreflightRunner(logger=logger, verbose=verbose)
+            preflight_runner = PreflightRunner(logger=logger, verbose=verbose, use_cache=not no_cache)
+            preflight_runner.check_capacity()
             preflight_runner.check_ports_from_config()
             logger.debug(debug_timeout_wrapper_end)
             logger.debug(debug_preflight_check_completed)
@@ -68,19 +70,28 @@ def check(
 
 @preflight_app.command()
 def ports(
-    ports: list[int] = typer.Argument(..., help="The list of ports to check"),
-    host: str = typer.Option("localhost", "--host", "-h", help="The host to check"),
+    ports: list[str] = typer.Argument(..., help="Ports or ranges to check, e.g. 80 443 8000-9000"),
+    host: list[str] = typer.Option(["localhost"], "--host", "-h", help="Host to check, repeat for several hosts"),
+    concurrency: int = typer.Option(DEFAULT_SCAN_CONCURRENCY, "--concurrency", "-c", help="Connection attempts in flight at once"),
+    connect_timeout: float = typer.Option(DEFAULT_CONNECT_TIMEOUT, "--connect-timeout", "-C", help="Seconds to wait for each connection"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
     output: str = typer.Option("text", "--output", "-o", help="Output format, text, json"),
     timeout: int = typer.Option(10, "--timeout", "-t", help="Timeout in seconds"),
 ) -> None:
-    """Check if list of ports are available on a host"""
+    """Check if ports or port ranges are available on one or more hosts"""
     try:
         logger = Logger(verbose=verbose)
         logger.debug(debug_starting_ports_check)
         
         logger.debug(debug_creating_port_config)
-        config = PortConfig(ports=ports, host=host, verbose=verbose)
+        config = PortConfig(
+            ports=parse_port_specs(ports),
+            host=host[0],
+            hosts=host,
+            concurrency=concurrency,
+            connect_timeout=connect_timeout,
+            verbose=verbose,
+        )
         
         logger.debug(debug_initializing_port_service)
         port_service = PortService(config, logger=logger)
@@ -121,12 +132,13 @@ def deps(
         logger.debug(debug_starting_deps_check)
         
         logger.debug(debug_creating_deps_config)
+        facts = get_host_facts()
         config = DepsConfig(
             deps=deps,
             verbose=verbose,
             output=output,
-            os=HostInformation.get_os_name(),
-            package_manager=HostInformation.get_package_manager(),
+            os=facts.os_name,
+            package_manager=facts.package_manager,
         )
         
         logger.debug(debug_initializing_deps_service)
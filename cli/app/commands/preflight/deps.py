@@ -1,12 +1,13 @@
-import shutil
 import subprocess
 from typing import Optional, Protocol
 
 from pydantic import BaseModel, Field, field_validator
 
-from app.utils.lib import ParallelProcessor, Supported
+from app.utils.executor import process_items
+from app.utils.lib import Supported
 from app.utils.logger import Logger
 from app.utils.output_formatter import OutputFormatter
+from app.utils.path_index import get_path_index
 from app.utils.protocols import LoggerProtocol
 
 from .messages import (
@@ -30,7 +31,7 @@ class DependencyChecker:
 
     def check_dependency(self, dep: str) -> bool:
         try:
-            is_available = shutil.which(dep) is not None
+            is_available = get_path_index().has(dep)
             self.logger.debug(debug_dep_check_result.format(dep=dep, status="available" if is_available else "not available"))
             return is_available
 
@@ -177,14 +178,7 @@ class DepsService:
                 self.logger.error(error_checking_dependency.format(dep=dep, error=error))
             return self._create_result(dep, False, str(error))
 
-        results = ParallelProcessor.process_items(
-            items=self.config.deps,
-            processor_func=process_dep,
-            max_workers=min(len(self.config.deps), 50),
-            error_handler=error_handler,
-        )
-
-        return results
+        return process_items(process_dep, self.config.deps, ordered=True, error_handler=error_handler)
 
     def check_and_format(self) -> str:
         results = self.check_dependencies()
@@ -0,0 +1,114 @@
+import ipaddress
+import os
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+PROC_NET_TABLES = {"tcp": "net/tcp", "tcp6": "net/tcp6", "udp": "net/udp", "udp6": "net/udp6"}
+
+# Socket states in /proc/net: 0A is TCP LISTEN, 07 is an unconnected (bound) UDP socket
+LISTENING_STATES = {"tcp": "0A", "udp": "07"}
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+class Listener(BaseModel):
+    protocol: str
+    address: str
+    port: int
+    inode: int
+    pid: Optional[int] = None
+    process: Optional[str] = None
+
+
+def _parse_address(hex_address: str) -> tuple:
+    host, port = hex_address.split(":")
+    raw = bytes.fromhex(host)
+    if len(raw) == 4:
+        address = ipaddress.IPv4Address(raw[::-1])
+    else:
+        # Four 32-bit words, each in host (little-endian) byte order
+        address = ipaddress.IPv6Address(b"".join(raw[i:i + 4][::-1] for i in range(0, 16, 4)))
+    return str(address), int(port, 16)
+
+
+def parse_proc_net(content: str, protocol: str) -> List[Listener]:
+    """Listening TCP and bound UDP sockets from one /proc/net/{tcp,udp}[6] table"""
+    listening = LISTENING_STATES[protocol.rstrip("6")]
+    listeners = []
+    for line in content.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 10 or fields[3] != listening:
+            continue
+        address, port = _parse_address(fields[1])
+        listeners.append(Listener(protocol=protocol, address=address, port=port, inode=int(fields[9])))
+    return listeners
+
+
+class ListenerSnapshot:
+    """Every listening socket of this network namespace, read once from /proc/net.
+
+    Port lookups are dictionary lookups. Owning processes are found by scanning /proc/<pid>/fd for
+    the socket inodes, which only happens the first time an owner is asked for.
+    """
+
+    def __init__(self, listeners: Iterable[Listener], proc_root: str = "/proc"):
+        self.proc_root = proc_root
+        self._by_port: Dict[int, List[Listener]] = {}
+        for listener in listeners:
+            self._by_port.setdefault(listener.port, []).append(listener)
+        self._owners_resolved = False
+
+    @classmethod
+    def is_supported(cls, proc_root: str = "/proc") -> bool:
+        return os.path.exists(os.path.join(proc_root, PROC_NET_TABLES["tcp"]))
+
+    @classmethod
+    def take(cls, proc_root: str = "/proc") -> "ListenerSnapshot":
+        listeners = []
+        for protocol, table in PROC_NET_TABLES.items():
+            try:
+                with open(os.path.join(proc_root, table)) as f:
+                    listeners.extend(parse_proc_net(f.read(), protocol))
+            except OSError:
+                continue
+        return cls(listeners, proc_root)
+
+    def listeners(self, port: int) -> List[Listener]:
+        """Sockets bound to port, with their owners filled in where /proc allows it"""
+        found = self._by_port.get(port, [])
+        if found and not self._owners_resolved:
+            self._resolve_owners()
+        return found
+
+    def _resolve_owners(self):
+        by_inode = {listener.inode: listener for listeners in self._by_port.values() for listener in listeners}
+        try:
+            pids = [entry for entry in os.listdir(self.proc_root) if entry.isdigit()]
+        except OSError:
+            pids = []
+        for pid in pids:
+            fd_dir = os.path.join(self.proc_root, pid, "fd")
+            try:
+                fds = os.listdir(fd_dir)
+            except OSError:
+                continue
+            for fd in fds:
+                try:
+                    target = os.readlink(os.path.join(fd_dir, fd))
+                except OSError:
+                    continue
+                if not target.startswith("socket:["):
+                    continue
+                listener = by_inode.get(int(target[8:-1]))
+                if listener is not None and listener.pid is None:
+                    listener.pid = int(pid)
+                    listener.process = self._process_name(pid)
+        self._owners_resolved = True
+
+    def _process_name(self, pid: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.proc_root, pid, "comm")) as f:
+                return f.read().strip()
+        except OSError:
+            return None
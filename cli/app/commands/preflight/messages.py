@@ -43,3 +43,15 @@ error_parallel_processing_failed = "Parallel processing failed: {error}"
 error_socket_connection_failed = "Socket connection failed for port {port}: {error}"
 error_subprocess_execution_failed = "Subprocess execution failed for dependency {dep}: {error}"
 ports_unavailable = "Ports unavailable"
+invalid_port_spec = "Invalid port '{value}': use a port number or a range like 8000-9000 within 1-65535"
+error_resolving_host = "Could not resolve host {host}: {error}"
+debug_scanning_ports = "Scanning {count} ports on {hosts} with up to {concurrency} connections at a time"
+port_in_use_by = "in use by {process} (pid {pid}, {protocol} {address})"
+port_in_use = "in use ({protocol} {address})"
+debug_reading_listeners = "Checking {count} ports against the listening sockets in /proc/net"
+insufficient_capacity = "Host is below the capacity Nixopus needs"
+insufficient_cpus = "{available} CPUs available, {required} required"
+insufficient_memory = "{available} MB memory available, {required} MB required"
+insufficient_disk = "{available} MB free at {path}, {required} MB required"
+insufficient_inodes = "{available} free inodes at {path}, {required} required"
+debug_host_facts = "Host facts: {cpus:g} CPUs, {memory} MB memory, docker {docker}"
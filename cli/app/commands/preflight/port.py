@@ -1,14 +1,16 @@
 import re
 import socket
-from typing import Any, List, Optional, Protocol, TypedDict, Union
+from typing import Any, Callable, Iterable, List, Optional, Protocol, Tuple, TypedDict, Union
 
 from pydantic import BaseModel, Field, field_validator
 
-from app.utils.lib import ParallelProcessor
+from app.utils.executor import NETWORK, process_items
 from app.utils.logger import Logger
 from app.utils.output_formatter import OutputFormatter
 from app.utils.protocols import LoggerProtocol
+from app.utils.timeout import current_deadline
 
+from .listeners import LOCAL_HOSTS, Listener, ListenerSnapshot
 from .messages import (
     available,
     error_checking_port,
@@ -16,9 +18,35 @@ from .messages import (
     not_available,
     debug_processing_ports,
     debug_port_check_result,
+    debug_reading_listeners,
+    debug_scanning_ports,
+    error_resolving_host,
     error_socket_connection_failed,
+    invalid_port_spec,
+    port_in_use,
+    port_in_use_by,
 )
 
+DEFAULT_SCAN_CONCURRENCY = 256
+DEFAULT_CONNECT_TIMEOUT = 1.0
+
+
+def parse_port_specs(specs: Iterable[str]) -> List[int]:
+    """Ports from arguments like "80", "8000-9000" or "80,443", deduplicated in the order given"""
+    ports = {}
+    for spec in specs:
+        for value in str(spec).split(","):
+            start, separator, end = value.strip().partition("-")
+            try:
+                first = int(start)
+                last = int(end) if separator else first
+            except ValueError:
+                raise ValueError(invalid_port_spec.format(value=value))
+            if not 1 <= first <= last <= 65535:
+                raise ValueError(invalid_port_spec.format(value=value))
+            ports.update(dict.fromkeys(range(first, last + 1)))
+    return list(ports)
+
 
 class PortCheckerProtocol(Protocol):
     def check_port(self, port: int, config: "PortConfig") -> "PortCheckResult": ...
@@ -35,8 +63,20 @@ class PortCheckResult(TypedDict):
 class PortConfig(BaseModel):
     ports: List[int] = Field(..., min_length=1, max_length=65535, description="List of ports to check")
     host: str = Field("localhost", min_length=1, description="Host to check")
+    hosts: List[str] = Field(default_factory=list, description="Hosts to check, defaults to [host]")
+    concurrency: int = Field(DEFAULT_SCAN_CONCURRENCY, gt=0, description="Connection attempts in flight at once")
+    connect_timeout: float = Field(DEFAULT_CONNECT_TIMEOUT, gt=0, description="Seconds to wait for each connection")
     verbose: bool = Field(False, description="Verbose output")
 
+    @field_validator("hosts")
+    @classmethod
+    def validate_hosts(cls, hosts: List[str]) -> List[str]:
+        return list(dict.fromkeys(cls.validate_host(host) for host in hosts))
+
+    @property
+    def targets(self) -> List[str]:
+        return self.hosts or [self.host]
+
     @field_validator("host")
     @classmethod
     def validate_host(cls, v: str) -> str:
@@ -137,15 +177,173 @@ class PortChecker:
         }
 
 
+class AsyncPortScanner:
+    """Checks many (host, port) pairs from one thread with non-blocking connects.
+
+    Each host is resolved once. At most `concurrency` connection attempts are in flight, so large
+    ranges cost about ceil(N / concurrency) connect timeouts instead of one thread per port. A port
+    counts as available when nothing accepts the connection, as in PortChecker.
+    """
+
+    def __init__(self, logger: LoggerProtocol, concurrency: int = DEFAULT_SCAN_CONCURRENCY, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT):
+        self.logger = logger
+        self.concurrency = concurrency
+        self.connect_timeout = connect_timeout
+
+    def scan(self, hosts: List[str], ports: List[int], on_result: Callable[[str, int, bool, Optional[str]], None]) -> None:
+        import asyncio
+
+        asyncio.run(self._scan(hosts, ports, on_result))
+
+    async def _resolve(self, host: str) -> Tuple[Optional[str], Optional[str]]:
+        import asyncio
+
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+            return infos[0][4][0], None
+        except OSError as e:
+            return None, error_resolving_host.format(host=host, error=e)
+
+    async def _probe(self, address: str, port: int) -> bool:
+        import asyncio
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            await asyncio.wait_for(asyncio.get_running_loop().sock_connect(sock, (address, port)), self.connect_timeout)
+            return False
+        except (OSError, asyncio.TimeoutError):
+            return True
+        finally:
+            sock.close()
+
+    async def _scan(self, hosts: List[str], ports: List[int], on_result) -> None:
+        import asyncio
+
+        addresses = dict(zip(hosts, await asyncio.gather(*(self._resolve(host) for host in hosts))))
+        pairs = iter([(host, port) for host in hosts for port in ports])
+        in_flight = {}
+
+        def fill():
+            for host, port in pairs:
+                address, error = addresses[host]
+                if address is None:
+                    on_result(host, port, False, error)
+                    continue
+                deadline = current_deadline()
+                if deadline is not None:
+                    deadline.check()
+                in_flight[asyncio.ensure_future(self._probe(address, port))] = (host, port)
+                if len(in_flight) >= self.concurrency:
+                    return
+
+        try:
+            fill()
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    host, port = in_flight.pop(task)
+                    on_result(host, port, task.result(), None)
+                fill()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+
+def describe_listeners(listeners: List[Listener]) -> str:
+    """Who holds a port, for example: in use by nginx (pid 812, tcp 0.0.0.0)"""
+    descriptions = []
+    for listener in listeners:
+        if listener.pid is None:
+            descriptions.append(port_in_use.format(protocol=listener.protocol, address=listener.address))
+        else:
+            descriptions.append(
+                port_in_use_by.format(
+                    process=listener.process or "unknown",
+                    pid=listener.pid,
+                    protocol=listener.protocol,
+                    address=listener.address,
+                )
+            )
+    return "; ".join(descriptions)
+
+
 class PortService:
-    def __init__(self, config: PortConfig, logger: LoggerProtocol = None, checker: PortCheckerProtocol = None):
+    def __init__(
+        self,
+        config: PortConfig,
+        logger: LoggerProtocol = None,
+        checker: PortCheckerProtocol = None,
+        scanner: AsyncPortScanner = None,
+        snapshot: ListenerSnapshot = None,
+    ):
         self.config = config
         self.logger = logger or Logger(verbose=config.verbose)
-        self.checker = checker or PortChecker(self.logger)
+        self.checker = checker
+        self.scanner = scanner or AsyncPortScanner(self.logger, config.concurrency, config.connect_timeout)
+        self.snapshot = snapshot
+        self.prefer_snapshot = scanner is None
         self.formatter = PortFormatter()
 
-    def check_ports(self) -> List[PortCheckResult]:
+    def check_ports(self, on_result: Optional[Callable[[PortCheckResult], None]] = None) -> List[PortCheckResult]:
+        """Results for every host and port in input order; on_result sees each one as soon as it is known.
+
+        Local hosts are answered from a snapshot of the listening sockets in /proc/net when it can be
+        read, which also sees UDP and interface-specific binds and names the process holding a port.
+        Remote hosts, and systems without /proc, are probed with the async scanner.
+        """
         self.logger.debug(debug_processing_ports.format(count=len(self.config.ports)))
+        on_result = on_result or (lambda result: None)
+        if self.checker is not None:
+            return self._check_with_checker()
+        if self.snapshot is None and self._use_snapshot():
+            self.snapshot = ListenerSnapshot.take()
+        if self.snapshot is not None:
+            return self._check_local(on_result)
+        return self._scan(on_result)
+
+    def _use_snapshot(self) -> bool:
+        local = all(host.lower() in LOCAL_HOSTS for host in self.config.targets)
+        return self.prefer_snapshot and local and ListenerSnapshot.is_supported()
+
+    def _check_local(self, on_result: Callable[[PortCheckResult], None]) -> List[PortCheckResult]:
+        self.logger.debug(debug_reading_listeners.format(count=len(self.config.ports)))
+        results = []
+        for host in self.config.targets:
+            for port in self.config.ports:
+                listeners = self.snapshot.listeners(port)
+                status = not_available if listeners else available
+                self.logger.debug(debug_port_check_result.format(port=port, status=status))
+                result = self._create_result(host, port, status, describe_listeners(listeners) or None)
+                results.append(result)
+                on_result(result)
+        return results
+
+    def _scan(self, on_result: Callable[[PortCheckResult], None]) -> List[PortCheckResult]:
+        hosts = self.config.targets
+        self.logger.debug(debug_scanning_ports.format(count=len(self.config.ports), hosts=", ".join(hosts), concurrency=self.config.concurrency))
+        results = {}
+
+        def record(host: str, port: int, is_available: bool, error: Optional[str]):
+            status = available if is_available else not_available
+            self.logger.debug(debug_port_check_result.format(port=port, status=status))
+            results[(host, port)] = result = self._create_result(host, port, status, error)
+            on_result(result)
+
+        self.scanner.scan(hosts, self.config.ports, record)
+        return [results[(host, port)] for host in hosts for port in self.config.ports]
+
+    def _create_result(self, host: str, port: int, status: str, error: Optional[str] = None) -> PortCheckResult:
+        return {
+            "port": port,
+            "status": status,
+            "host": host if host != "localhost" else None,
+            "error": error,
+            "is_available": status == available,
+        }
+
+    def _check_with_checker(self) -> List[PortCheckResult]:
+        """Injected PortChecker-style checkers are called one port at a time on the network pool"""
 
         def process_port(port: int) -> PortCheckResult:
             return self.checker.check_port(port, self.config)
@@ -153,15 +351,9 @@ class PortService:
         def error_handler(port: int, error: Exception) -> PortCheckResult:
             if self.logger.verbose:
                 self.logger.error(error_checking_port.format(port=port, error=str(error)))
-            return self.checker._create_result(port, self.config, not_available, str(error))
-
-        results = ParallelProcessor.process_items(
-            items=self.config.ports,
-            processor_func=process_port,
-            max_workers=min(len(self.config.ports), 50),
-            error_handler=error_handler,
-        )
-        return sorted(results, key=lambda x: x["port"])
+            return self._create_result(self.config.host, port, not_available, str(error))
+
+        return process_items(process_port, self.config.ports, kind=NETWORK, ordered=True, error_handler=error_handler)
 
     def check_and_format(self, output_type: str) -> str:
         results = self.check_ports()
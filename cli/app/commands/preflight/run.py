@@ -1,17 +1,20 @@
 from typing import List, Dict, Any
 from app.utils.protocols import LoggerProtocol
-from app.utils.config import Config
+from app.utils.config import get_config
+from app.utils.host_facts import HostFacts, get_host_facts
+from .capacity import CapacityRequirements, check_capacity
 from .port import PortConfig, PortService
-from .messages import ports_unavailable
+from .messages import debug_host_facts, insufficient_capacity, ports_unavailable
 
 
 class PreflightRunner:
-    """Centralized preflight check runner for port availability"""
+    """Centralized preflight check runner for host capacity and port availability"""
     
-    def __init__(self, logger: LoggerProtocol = None, verbose: bool = False):
+    def __init__(self, logger: LoggerProtocol = None, verbose: bool = False, use_cache: bool = True):
         self.logger = logger
         self.verbose = verbose
-        self.config = Config()
+        self.use_cache = use_cache
+        self.config = get_config()
     
     def run_port_checks(self, ports: List[int], host: str = "localhost") -> List[Dict[str, Any]]:
         """Run port availability checks and return results"""
@@ -20,14 +23,41 @@ class PreflightRunner:
         return port_service.check_ports()
     
     def check_required_ports(self, ports: List[int], host: str = "localhost") -> None:
-        """Check required ports and raise exception if any are unavailable"""
+        """Check required ports and raise exception if any are unavailable.
+
+        Every port is checked on each call: the listener snapshot is cheap, and a port freed after a
+        failed `preflight check` has to pass in the install that follows.
+        """
         port_results = self.run_port_checks(ports, host)
         unavailable_ports = [result for result in port_results if not result.get('is_available', True)]
         
         if unavailable_ports:
-            error_msg = f"{ports_unavailable}: {[p['port'] for p in unavailable_ports]}"
+            details = [f"{p['port']} ({p['error']})" if p.get('error') else str(p['port']) for p in unavailable_ports]
+            error_msg = f"{ports_unavailable}: {', '.join(details)}"
             raise Exception(error_msg)
-    
+
+    def check_capacity(
+        self, facts: HostFacts = None, requirements: CapacityRequirements = None, config_dir: str = None
+    ) -> HostFacts:
+        """Raise if the host has fewer CPUs, less memory, disk or inodes than required, and return the facts used.
+
+        Facts come from the host facts cache unless given, or are collected again without the cache.
+        """
+        requirements = requirements or CapacityRequirements.from_config()
+        if facts is None:
+            facts = get_host_facts(config_dir, refresh=not self.use_cache)
+        if self.logger:
+            memory = facts.effective_memory
+            self.logger.debug(debug_host_facts.format(
+                cpus=facts.effective_cpus,
+                memory=memory // (1024 * 1024) if memory is not None else "unknown",
+                docker=facts.docker.version if facts.docker.reachable else "unreachable",
+            ))
+        shortfalls = check_capacity(facts, requirements)
+        if shortfalls:
+            raise Exception(f"{insufficient_capacity}: {'; '.join(shortfalls)}")
+        return facts
+
     def check_ports_from_config(self, config_key: str = 'required_ports', user_config: dict = None, defaults: dict = None) -> None:
         """Check ports using configuration values"""
         if user_config is not None and defaults is not None:
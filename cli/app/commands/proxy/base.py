@@ -4,7 +4,7 @@ from typing import Generic, Optional, Protocol, TypeVar
 import requests
 from pydantic import BaseModel, Field, field_validator
 
-from app.utils.config import Config, PROXY_PORT, CONFIG_ENDPOINT, LOAD_ENDPOINT, STOP_ENDPOINT, CADDY_BASE_URL
+from app.utils.config import get_config, PROXY_PORT, CONFIG_ENDPOINT, LOAD_ENDPOINT, STOP_ENDPOINT, CADDY_BASE_URL
 from app.utils.logger import Logger
 from app.utils.output_formatter import OutputFormatter
 from app.utils.protocols import LoggerProtocol
@@ -42,33 +42,38 @@ from .messages import (
 TConfig = TypeVar("TConfig", bound=BaseModel)
 TResult = TypeVar("TResult", bound=BaseModel)
 
-config = Config()
-proxy_port = config.get_yaml_value(PROXY_PORT)
-caddy_config_endpoint = config.get_yaml_value(CONFIG_ENDPOINT)
-caddy_load_endpoint = config.get_yaml_value(LOAD_ENDPOINT)
-caddy_stop_endpoint = config.get_yaml_value(STOP_ENDPOINT)
-caddy_base_url = config.get_yaml_value(CADDY_BASE_URL)
+_config = get_config()
+
+
+def get_proxy_port() -> int:
+    """Default Caddy admin port, read from the built-in config on first use"""
+    return int(_config.get_yaml_value(PROXY_PORT))
+
+
+def get_caddy_url(port: int, endpoint_key: str) -> str:
+    return f"{_config.get_yaml_value(CADDY_BASE_URL).format(port=port)}{_config.get_yaml_value(endpoint_key)}"
+
 
 class CaddyServiceProtocol(Protocol):
-    def check_status(self, port: int = proxy_port) -> tuple[bool, str]: ...
+    def check_status(self, port: int = None) -> tuple[bool, str]: ...
 
-    def load_config(self, config_file: str, port: int = proxy_port) -> tuple[bool, str]: ...
+    def load_config(self, config_file: str, port: int = None) -> tuple[bool, str]: ...
 
-    def stop_proxy(self, port: int = proxy_port) -> tuple[bool, str]: ...
+    def stop_proxy(self, port: int = None) -> tuple[bool, str]: ...
 
 
 class BaseCaddyCommandBuilder:
     @staticmethod
-    def build_status_command(port: int = proxy_port) -> list[str]:
-        return ["curl", "-X", "GET", f"{caddy_base_url.format(port=port)}{caddy_config_endpoint}"]
+    def build_status_command(port: int = None) -> list[str]:
+        return ["curl", "-X", "GET", get_caddy_url(port or get_proxy_port(), CONFIG_ENDPOINT)]
 
     @staticmethod
-    def build_load_command(config_file: str, port: int = proxy_port) -> list[str]:
+    def build_load_command(config_file: str, port: int = None) -> list[str]:
         return [
             "curl",
             "-X",
             "POST",
-            f"{caddy_base_url.format(port=port)}{caddy_load_endpoint}",
+            get_caddy_url(port or get_proxy_port(), LOAD_ENDPOINT),
             "-H",
             "Content-Type: application/json",
             "-d",
@@ -76,8 +81,8 @@ class BaseCaddyCommandBuilder:
         ]
 
     @staticmethod
-    def build_stop_command(port: int = proxy_port) -> list[str]:
-        return ["curl", "-X", "POST", f"{caddy_base_url.format(port=port)}{caddy_stop_endpoint}"]
+    def build_stop_command(port: int = None) -> list[str]:
+        return ["curl", "-X", "POST", get_caddy_url(port or get_proxy_port(), STOP_ENDPOINT)]
 
 
 class BaseFormatter:
@@ -96,11 +101,11 @@ class BaseFormatter:
 
     def format_dry_run(self, config: TConfig, command_builder, dry_run_messages: dict) -> str:
         if hasattr(command_builder, "build_status_command"):
-            cmd = command_builder.build_status_command(getattr(config, "proxy_port", proxy_port))
+            cmd = command_builder.build_status_command(getattr(config, "proxy_port", None))
         elif hasattr(command_builder, "build_load_command"):
-            cmd = command_builder.build_load_command(getattr(config, "config_file", ""), getattr(config, "proxy_port", proxy_port))
+            cmd = command_builder.build_load_command(getattr(config, "config_file", ""), getattr(config, "proxy_port", None))
         elif hasattr(command_builder, "build_stop_command"):
-            cmd = command_builder.build_stop_command(getattr(config, "proxy_port", proxy_port))
+            cmd = command_builder.build_stop_command(getattr(config, "proxy_port", None))
         else:
             cmd = command_builder.build_command(config)
 
@@ -108,7 +113,7 @@ class BaseFormatter:
         output.append(dry_run_messages["mode"])
         output.append(dry_run_messages["command_would_be_executed"])
         output.append(f"{dry_run_messages['command']} {' '.join(cmd)}")
-        output.append(f"{dry_run_messages['port']} {getattr(config, 'proxy_port', proxy_port)}")
+        output.append(f"{dry_run_messages['port']} {getattr(config, 'proxy_port', None) or get_proxy_port()}")
 
         if hasattr(config, "config_file") and getattr(config, "config_file", None):
             output.append(f"{dry_run_messages['config_file']} {getattr(config, 'config_file')}")
@@ -121,12 +126,12 @@ class BaseCaddyService:
     def __init__(self, logger: LoggerProtocol):
         self.logger = logger
 
-    def _get_caddy_url(self, port: int, endpoint: str) -> str:
-        return f"{caddy_base_url.format(port=port)}{endpoint}"
+    def _get_caddy_url(self, port: int, endpoint_key: str) -> str:
+        return get_caddy_url(port or get_proxy_port(), endpoint_key)
 
-    def check_status(self, port: int = proxy_port) -> tuple[bool, str]:
+    def check_status(self, port: int = None) -> tuple[bool, str]:
         try:
-            url = self._get_caddy_url(port, caddy_config_endpoint)
+            url = self._get_caddy_url(port, CONFIG_ENDPOINT)
             self.logger.debug(debug_checking_caddy_status.format(url=url))
             
             response = requests.get(url, timeout=5)
@@ -148,14 +153,14 @@ class BaseCaddyService:
             self.logger.debug(debug_unexpected_error.format(error=str(e)))
             return False, unexpected_error.format(error=str(e))
 
-    def load_config(self, config_file: str, port: int = proxy_port) -> tuple[bool, str]:
+    def load_config(self, config_file: str, port: int = None) -> tuple[bool, str]:
         try:
             self.logger.debug(debug_loading_config_file.format(file=config_file))
             with open(config_file, "r") as f:
                 config_data = json.load(f)
             self.logger.debug(debug_config_parsed)
 
-            url = self._get_caddy_url(port, caddy_load_endpoint)
+            url = self._get_caddy_url(port, LOAD_ENDPOINT)
             self.logger.debug(debug_posting_config.format(url=url))
             
             response = requests.post(url, json=config_data, headers={"Content-Type": "application/json"}, timeout=10)
@@ -189,9 +194,9 @@ class BaseCaddyService:
             self.logger.debug(error_msg)
             return False, error_msg
 
-    def stop_proxy(self, port: int = proxy_port) -> tuple[bool, str]:
+    def stop_proxy(self, port: int = None) -> tuple[bool, str]:
         try:
-            url = self._get_caddy_url(port, caddy_stop_endpoint)
+            url = self._get_caddy_url(port, STOP_ENDPOINT)
             self.logger.debug(debug_stopping_caddy.format(url=url))
             
             response = requests.post(url, timeout=5)
@@ -219,7 +224,7 @@ class BaseCaddyService:
 
 
 class BaseConfig(BaseModel):
-    proxy_port: int = Field(proxy_port, description="Caddy admin port")
+    proxy_port: int = Field(default_factory=get_proxy_port, description="Caddy admin port")
     verbose: bool = Field(False, description="Verbose output")
     output: str = Field("text", description="Output format: text, json")
     dry_run: bool = Field(False, description="Dry run mode")
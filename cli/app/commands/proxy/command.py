@@ -1,9 +1,9 @@
 import typer
 
-from app.utils.config import Config, PROXY_PORT
 from app.utils.logger import Logger
 from app.utils.timeout import TimeoutWrapper
 
+from .base import get_proxy_port
 from .load import Load, LoadConfig
 from .status import Status, StatusConfig
 from .stop import Stop, StopConfig
@@ -14,12 +14,9 @@ proxy_app = typer.Typer(
     help="Manage Nixopus proxy (Caddy) configuration",
 )
 
-config = Config()
-proxy_port = config.get_yaml_value(PROXY_PORT)
-
 @proxy_app.command()
 def load(
-    proxy_port: int = typer.Option(proxy_port, "--proxy-port", "-p", help="Caddy admin port"),
+    proxy_port: int = typer.Option(..., "--proxy-port", "-p", default_factory=get_proxy_port, help="Caddy admin port"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
     output: str = typer.Option("text", "--output", "-o", help="Output format: text, json"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Dry run"),
@@ -57,7 +54,7 @@ def load(
 
 @proxy_app.command()
 def status(
-    proxy_port: int = typer.Option(proxy_port, "--proxy-port", "-p", help="Caddy admin port"),
+    proxy_port: int = typer.Option(..., "--proxy-port", "-p", default_factory=get_proxy_port, help="Caddy admin port"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
     output: str = typer.Option("text", "--output", "-o", help="Output format: text, json"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Dry run"),
@@ -94,7 +91,7 @@ def status(
 
 @proxy_app.command()
 def stop(
-    proxy_port: int = typer.Option(proxy_port, "--proxy-port", "-p", help="Caddy admin port"),
+    proxy_port: int = typer.Option(..., "--proxy-port", "-p", default_factory=get_proxy_port, help="Caddy admin port"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
     output: str = typer.Option("text", "--output", "-o", help="Output format: text, json"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Dry run"),
@@ -3,7 +3,6 @@ from typing import Optional, Protocol
 
 from pydantic import Field, field_validator
 
-from app.utils.config import Config, PROXY_PORT
 from app.utils.protocols import LoggerProtocol
 
 from .base import BaseAction, BaseCaddyCommandBuilder, BaseCaddyService, BaseConfig, BaseFormatter, BaseResult, BaseService
@@ -16,17 +15,14 @@ from .messages import (
     end_dry_run,
 )
 
-config = Config()
-proxy_port = config.get_yaml_value(PROXY_PORT)
-
 
 class CaddyServiceProtocol(Protocol):
-    def load_config(self, config_file: str, port: int = proxy_port) -> tuple[bool, str]: ...
+    def load_config(self, config_file: str, port: int = None) -> tuple[bool, str]: ...
 
 
 class CaddyCommandBuilder(BaseCaddyCommandBuilder):
     @staticmethod
-    def build_load_command(config_file: str, port: int = proxy_port) -> list[str]:
+    def build_load_command(config_file: str, port: int = None) -> list[str]:
         return BaseCaddyCommandBuilder.build_load_command(config_file, port)
 
 
@@ -57,7 +53,7 @@ class CaddyService(BaseCaddyService):
     def __init__(self, logger: LoggerProtocol):
         super().__init__(logger)
 
-    def load_config_file(self, config_file: str, port: int = proxy_port) -> tuple[bool, str]:
+    def load_config_file(self, config_file: str, port: int = None) -> tuple[bool, str]:
         return self.load_config(config_file, port)
 
 
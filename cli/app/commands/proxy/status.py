@@ -1,6 +1,5 @@
 from typing import Protocol
 
-from app.utils.config import Config, PROXY_PORT
 from app.utils.protocols import LoggerProtocol
 
 from .base import BaseAction, BaseCaddyCommandBuilder, BaseCaddyService, BaseConfig, BaseFormatter, BaseResult, BaseService
@@ -12,16 +11,13 @@ from .messages import (
     end_dry_run,
 )
 
-config = Config()
-proxy_port = config.get_yaml_value(PROXY_PORT)
-
 class CaddyServiceProtocol(Protocol):
-    def check_status(self, port: int = proxy_port) -> tuple[bool, str]: ...
+    def check_status(self, port: int = None) -> tuple[bool, str]: ...
 
 
 class CaddyCommandBuilder(BaseCaddyCommandBuilder):
     @staticmethod
-    def build_status_command(port: int = proxy_port) -> list[str]:
+    def build_status_command(port: int = None) -> list[str]:
         return BaseCaddyCommandBuilder.build_status_command(port)
 
 
@@ -51,7 +47,7 @@ class CaddyService(BaseCaddyService):
     def __init__(self, logger: LoggerProtocol):
         super().__init__(logger)
 
-    def get_status(self, port: int = proxy_port) -> tuple[bool, str]:
+    def get_status(self, port: int = None) -> tuple[bool, str]:
         return self.check_status(port)
 
 
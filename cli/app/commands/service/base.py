@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field, field_validator
 from app.utils.logger import Logger
 from app.utils.output_formatter import OutputFormatter
 from app.utils.protocols import LoggerProtocol
+from app.utils.timeout import kill_at_deadline, popen_with_deadline, run_with_deadline
 from .messages import (
     service_action_info, 
     service_action_success, 
@@ -129,17 +130,18 @@ class BaseDockerService:
             self.logger.debug(service_action_info.format(action=self.action, name=name))
             
             if self.action == "up" and not kwargs.get("detach", False):
-                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, universal_newlines=True)
+                process = popen_with_deadline(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, universal_newlines=True)
                 
                 output_lines = []
                 self.logger.debug("Docker container logs:")
                 self.logger.debug("-" * 50)
                 
-                for line in process.stdout:
-                    self.logger.debug(line.rstrip())  # Stream logs through logger
-                    output_lines.append(line.rstrip())
-                
-                return_code = process.wait()
+                with kill_at_deadline(process):
+                    for line in process.stdout:
+                        self.logger.debug(line.rstrip())  # Stream logs through logger
+                        output_lines.append(line.rstrip())
+                    
+                    return_code = process.wait()
                 
                 full_output = '\n'.join(output_lines)
                 
@@ -155,7 +157,7 @@ class BaseDockerService:
                     self.logger.error(service_action_failed.format(action=self.action, error=full_output or f"Process exited with code {return_code}"))
                     return False, full_output or f"Process exited with code {return_code}"
             else:
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+                result = run_with_deadline(cmd, capture_output=True, text=True, check=True)
                 
                 self.logger.debug(docker_command_completed.format(action=self.action))
                 
@@ -1,23 +1,30 @@
 import json
 import typer
+from rich.live import Live
+from rich.progress import BarColumn, DownloadColumn, Progress, SpinnerColumn, TextColumn
+from rich.text import Text
 
-from app.utils.config import Config, DEFAULT_COMPOSE_FILE, NIXOPUS_CONFIG_DIR
+from app.utils.config import get_config, API_PORT, DEFAULT_COMPOSE_FILE, NIXOPUS_CONFIG_DIR, PROXY_PORT
 from app.utils.logger import Logger
 from app.utils.output_formatter import OutputFormatter
 from app.utils.timeout import TimeoutWrapper
 
 from .down import Down, DownConfig
-from .messages import services_started_successfully, services_stopped_successfully, services_status_retrieved, services_restarted_successfully
+from .messages import services_ready, services_started_successfully, services_stopped_successfully, services_status_retrieved, services_restarted_successfully
+from .progress import ComposeProgressDisplay
 from .ps import Ps, PsConfig
 from .restart import Restart, RestartConfig
 from .up import Up, UpConfig
+from .wait import DEFAULT_WAIT_TIMEOUT, Wait, WaitConfig
 
 service_app = typer.Typer(help="Manage Nixopus services")
 
-config = Config()
+config = get_config()
 nixopus_config_dir = config.get_yaml_value(NIXOPUS_CONFIG_DIR)
 compose_file = config.get_yaml_value(DEFAULT_COMPOSE_FILE)
 compose_file_path = nixopus_config_dir + "/" + compose_file
+proxy_port = int(config.get_yaml_value(PROXY_PORT))
+api_port = int(config.get_yaml_value(API_PORT))
 
 
 @service_app.command()
@@ -52,6 +59,11 @@ def up(
                 formatted_output = up_service.format_dry_run(config)
                 logger.info(formatted_output)
                 return
+            elif config.detach and output == "text":
+                with Progress(
+                    SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), DownloadColumn(), transient=True
+                ) as progress:
+                    result = up_service.up(config, on_progress=ComposeProgressDisplay(progress).update)
             else:
                 result = up_service.up(config)
 
@@ -132,6 +144,7 @@ def ps(
     env_file: str = typer.Option(None, "--env-file", "-e", help="Path to the environment file"),
     compose_file: str = typer.Option(compose_file_path, "--compose-file", "-f", help="Path to the compose file"),
     timeout: int = typer.Option(10, "--timeout", "-t", help="Timeout in seconds"),
+    watch: bool = typer.Option(False, "--watch", "-w", help="Keep refreshing on container events until interrupted"),
 ):
     """Show status of Nixopus services"""
     logger = Logger(verbose=verbose)
@@ -142,7 +155,20 @@ def ps(
         )
 
         ps_service = Ps(logger=logger)
-        
+
+        if watch and not config.dry_run:
+            try:
+                if output == "json":
+                    ps_service.watch(config, lambda result: logger.info(ps_service.format_output(result, output)))
+                else:
+                    with Live(auto_refresh=False) as live:
+                        ps_service.watch(
+                            config, lambda result: live.update(Text.from_ansi(ps_service.format_output(result, output)), refresh=True)
+                        )
+            except KeyboardInterrupt:
+                pass
+            return
+
         with TimeoutWrapper(timeout):
             if config.dry_run:
                 formatted_output = ps_service.format_dry_run(config)
@@ -212,3 +238,58 @@ def restart(
     except Exception as e:
         logger.error(str(e))
         raise typer.Exit(1)
+
+
+@service_app.command()
+def wait(
+    name: str = typer.Option("all", "--name", "-n", help="The name of the service to wait for, defaults to all"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    output: str = typer.Option("text", "--output", "-o", help="Output format, text, json"),
+    dry_run: bool = typer.Option(False, "--dry-run", "-d", help="Dry run"),
+    env_file: str = typer.Option(None, "--env-file", "-e", help="Path to the environment file"),
+    compose_file: str = typer.Option(compose_file_path, "--compose-file", "-f", help="Path to the compose file"),
+    proxy_port: int = typer.Option(proxy_port, "--proxy-port", "-p", help="Caddy admin port to wait for, 0 to skip"),
+    api_port: int = typer.Option(api_port, "--api-port", "-a", help="API port to wait for, 0 to skip"),
+    timeout: int = typer.Option(DEFAULT_WAIT_TIMEOUT, "--timeout", "-t", help="Seconds to wait for every check to pass"),
+):
+    """Wait until Nixopus containers are healthy and their endpoints accept connections"""
+    logger = Logger(verbose=verbose)
+
+    try:
+        config = WaitConfig(
+            name=name,
+            env_file=env_file,
+            verbose=verbose,
+            output=output,
+            dry_run=dry_run,
+            compose_file=compose_file,
+            timeout=timeout,
+            proxy_port=proxy_port or None,
+            api_port=api_port or None,
+        )
+
+        wait_service = Wait(logger=logger)
+
+        if config.dry_run:
+            logger.info(wait_service.format_dry_run(config))
+            return
+
+        result = wait_service.wait(config)
+        formatted_output = wait_service.format_output(result, output)
+
+        if output == "json":
+            logger.info(formatted_output)
+        elif result.success:
+            logger.success(services_ready.format(services=result.name))
+            logger.info(formatted_output)
+        else:
+            logger.info(formatted_output)
+            logger.error(result.error)
+        if not result.success:
+            raise typer.Exit(1)
+
+    except typer.Exit:
+        raise
+    except Exception as e:
+        logger.error(str(e))
+        raise typer.Exit(1)
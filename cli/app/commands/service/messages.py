@@ -33,6 +33,23 @@ docker_command_completed = "Docker command completed successfully for {action} a
 docker_command_failed = "Docker command failed with return code {return_code}"
 docker_command_stdout = "Docker command stdout: {output}"
 docker_command_stderr = "Docker command stderr: {output}"
+progress_events_unsupported = "Docker Compose does not support JSON progress, retrying without it"
 docker_unexpected_error = "Unexpected error during {action} action: {error}"
 command_output_label = "Command output: {output}"
-command_error_label = "Command error: {output}"
\ No newline at end of file
+command_error_label = "Command error: {output}"
+services_ready = "Services are ready: {services}"
+services_not_ready = "Services not ready after {timeout}s: {checks}"
+no_containers_found = "No containers found yet"
+waiting_for_containers = "Waiting for {containers}"
+containers_ready = "{count} containers running and healthy"
+container_exited = "Container {name} exited with code {code}"
+port_accepting_connections = "{host}:{port} is accepting connections"
+port_not_accepting_connections = "{host}:{port} is not accepting connections: {error}"
+probe_update = "Readiness check {name} (attempt {attempt}): {detail}"
+dry_run_probe = "Would wait up to {timeout}s for: {name}"
+reading_container_status = "Reading containers of compose project {project} from {socket}"
+docker_api_unavailable = "Docker Engine API not reachable, showing the compose configuration instead: {error}"
+docker_socket_not_found = "Docker socket not found: {path}"
+no_project_containers = "No containers found for compose project {project}"
+container_event_received = "Container event: {action} {name}"
+event_stream_closed = "Docker event stream closed"
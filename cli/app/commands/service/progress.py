@@ -0,0 +1,113 @@
+import json
+import time
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+IMAGE = "image"
+CONTAINER = "container"
+
+IMAGE_DONE_STATES = {"Pulled", "Skipped", "Error"}
+CONTAINER_DONE_STATES = {"Started", "Running", "Healthy", "Exited", "Error"}
+
+# Prefixes compose puts on non-image resource ids; networks and volumes are not tracked
+RESOURCE_PREFIXES = {"Container ": CONTAINER, "Image ": IMAGE, "Network ": None, "Volume ": None}
+
+
+class ServiceProgress(BaseModel):
+    name: str
+    kind: str
+    state: str = ""
+    downloaded: int = 0
+    size: int = 0
+    started_after: float = 0.0
+    duration: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.duration is not None
+
+
+class ComposeProgressParser:
+    """Incrementally parses the event stream of `docker compose --progress json`.
+
+    Image pulls are tracked per service with the bytes downloaded across their layers, containers by
+    their state. Times are in seconds since the parser was created.
+    """
+
+    def __init__(self, on_progress: Optional[Callable[[ServiceProgress], None]] = None):
+        self.on_progress = on_progress or (lambda progress: None)
+        self.started = time.monotonic()
+        self.services: Dict[str, ServiceProgress] = {}
+        self._layers: Dict[str, Dict[str, tuple]] = {}
+
+    def feed(self, line: str) -> Optional[ServiceProgress]:
+        """Parse one line; returns the updated entry, or None when the line is not a tracked event"""
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(event, dict) or not event.get("id"):
+            return None
+
+        state = event.get("text") or event.get("status") or ""
+        parent = event.get("parent_id")
+        if parent:
+            progress = self._entry(parent, IMAGE)
+            self._layers.setdefault(parent, {})[event["id"]] = (event.get("current") or 0, event.get("total") or 0)
+            layers = self._layers[parent].values()
+            progress.downloaded = sum(current for current, _ in layers)
+            progress.size = sum(total for _, total in layers)
+            progress.state = state or progress.state
+        else:
+            name, kind = self._resource(event["id"])
+            if kind is None:
+                return None
+            progress = self._entry(name, kind)
+            progress.state = state
+            done_states = IMAGE_DONE_STATES if kind == IMAGE else CONTAINER_DONE_STATES
+            if state in done_states and progress.duration is None:
+                progress.duration = round(self._elapsed() - progress.started_after, 3)
+
+        self.on_progress(progress)
+        return progress
+
+    def results(self) -> List[ServiceProgress]:
+        return list(self.services.values())
+
+    def _entry(self, name: str, kind: str) -> ServiceProgress:
+        key = f"{kind}:{name}"
+        if key not in self.services:
+            self.services[key] = ServiceProgress(name=name, kind=kind, started_after=round(self._elapsed(), 3))
+        return self.services[key]
+
+    def _elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @staticmethod
+    def _resource(resource_id: str):
+        for prefix, kind in RESOURCE_PREFIXES.items():
+            if resource_id.startswith(prefix):
+                return resource_id[len(prefix):], kind
+        return resource_id, IMAGE
+
+
+class ComposeProgressDisplay:
+    """Shows compose progress as one task per image pull and container in a Rich Progress"""
+
+    def __init__(self, progress):
+        self.progress = progress
+        self._tasks = {}
+
+    def update(self, service: ServiceProgress):
+        key = (service.kind, service.name)
+        if key not in self._tasks:
+            self._tasks[key] = self.progress.add_task(service.name, total=None)
+        label = "Pulling" if service.kind == IMAGE else "Container"
+        description = f"{label} {service.name}: {service.state}"
+        if service.kind == IMAGE and service.size and not service.done:
+            self.progress.update(self._tasks[key], description=description, completed=service.downloaded, total=service.size)
+        elif service.done:
+            self.progress.update(self._tasks[key], description=description, completed=1, total=1)
+        else:
+            self.progress.update(self._tasks[key], description=description)
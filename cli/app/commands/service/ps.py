@@ -1,16 +1,33 @@
 import json
+import os
+import queue
+import re
 import subprocess
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 
+from pydantic import BaseModel, Field
+
+from app.utils.docker_api import COMPOSE_SERVICE_LABEL, DockerAPIError, DockerClient
 from app.utils.protocols import DockerServiceProtocol, LoggerProtocol
+from app.utils.timeout import run_with_deadline
 
 from .base import BaseAction, BaseConfig, BaseDockerCommandBuilder, BaseDockerService, BaseFormatter, BaseResult, BaseService
 from .messages import (
+    container_event_received,
+    docker_api_unavailable,
+    docker_socket_not_found,
     dry_run_command,
     dry_run_command_would_be_executed,
     dry_run_env_file,
     dry_run_mode,
     dry_run_service,
     end_dry_run,
+    event_stream_closed,
+    no_project_containers,
+    reading_container_status,
     service_status_failed,
     services_status_retrieved,
     docker_command_executing,
@@ -24,6 +41,215 @@ from .messages import (
     service_action_unexpected_error,
 )
 
+WATCH_REFRESH_INTERVAL = 2.0
+RUNTIME_HEADERS = ["Service", "Container", "State", "Health", "Uptime", "Restarts", "CPU", "Memory"]
+
+# Docker reports "never" as the zero time of Go
+ZERO_TIME_PREFIX = "0001-01-01"
+DOCKER_TIME = re.compile(r"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:\d{2})$")
+
+
+def compose_project_name(compose_file: str = None, env_file: str = None) -> str:
+    """The project docker compose labels containers with.
+
+    Taken from COMPOSE_PROJECT_NAME in the environment or the env file, then the top-level name
+    of the compose file, and otherwise the compose file's directory name, normalized like compose does.
+    """
+    name = os.environ.get("COMPOSE_PROJECT_NAME")
+    if not name and env_file:
+        name = _read_top_level_value(env_file, "COMPOSE_PROJECT_NAME", "=")
+    if not name and compose_file:
+        name = _read_top_level_value(compose_file, "name", ":")
+    if name:
+        return name
+    directory = os.path.dirname(os.path.abspath(compose_file or "docker-compose.yml"))
+    return re.sub(r"[^a-z0-9_-]", "", os.path.basename(directory).lower())
+
+
+def _read_top_level_value(path: str, key: str, separator: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(key + separator):
+                    return line.split(separator, 1)[1].split("#", 1)[0].strip().strip("\"'") or None
+    except OSError:
+        pass
+    return None
+
+
+def parse_docker_time(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds of an RFC 3339 time as the Engine API returns it, with up to nanosecond precision"""
+    if not value or value.startswith(ZERO_TIME_PREFIX):
+        return None
+    match = DOCKER_TIME.match(value)
+    if not match:
+        return None
+    base, fraction, zone = match.groups()
+    zone = "+00:00" if zone == "Z" else zone
+    return datetime.fromisoformat(f"{base}.{(fraction or '0')[:6].ljust(6, '0')}{zone}").timestamp()
+
+
+def cpu_percent(stats: dict, previous: Optional[dict] = None) -> Optional[float]:
+    """CPU use, where 100 is one full CPU as in `docker stats`.
+
+    Computed from cpu_stats against precpu_stats, or against the cpu_stats of previous, an earlier
+    sample of the same container, when the daemon left precpu_stats empty.
+    """
+    cpu_stats = stats.get("cpu_stats") or {}
+    before = stats.get("precpu_stats") or {}
+    if not before.get("system_cpu_usage") and previous:
+        before = previous.get("cpu_stats") or {}
+    try:
+        cpu_delta = cpu_stats["cpu_usage"]["total_usage"] - before["cpu_usage"]["total_usage"]
+        system_delta = cpu_stats["system_cpu_usage"] - before["system_cpu_usage"]
+    except (KeyError, TypeError):
+        return None
+    if system_delta <= 0:
+        return None
+    cpus = cpu_stats.get("online_cpus") or len(cpu_stats["cpu_usage"].get("percpu_usage") or []) or 1
+    return round(max(cpu_delta, 0) / system_delta * cpus * 100, 1)
+
+
+def memory_usage(stats: dict) -> Tuple[Optional[int], Optional[int]]:
+    """Used and limit bytes; like `docker stats`, page cache the kernel can reclaim is not counted as used"""
+    memory = stats.get("memory_stats") or {}
+    usage = memory.get("usage")
+    if usage is None:
+        return None, None
+    details = memory.get("stats") or {}
+    cache = details.get("inactive_file", details.get("total_inactive_file", 0))
+    return max(usage - cache, 0), memory.get("limit")
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.2f}GiB"
+
+
+class ContainerStatus(BaseModel):
+    id: str
+    name: str
+    service: str = ""
+    image: str = ""
+    state: str = ""
+    health: Optional[str] = None
+    started_at: Optional[str] = None
+    uptime: Optional[int] = Field(None, description="Seconds since the container started, while it runs")
+    restart_count: int = 0
+    oom_killed: bool = False
+    exit_code: Optional[int] = None
+    cpu_percent: Optional[float] = None
+    memory_usage: Optional[int] = None
+    memory_limit: Optional[int] = None
+
+    @classmethod
+    def from_inspect(cls, details: dict, now: float) -> "ContainerStatus":
+        state = details.get("State") or {}
+        config = details.get("Config") or {}
+        running = state.get("Status") == "running"
+        started = parse_docker_time(state.get("StartedAt"))
+        return cls(
+            id=details["Id"],
+            name=(details.get("Name") or "").lstrip("/"),
+            service=(config.get("Labels") or {}).get(COMPOSE_SERVICE_LABEL, ""),
+            image=config.get("Image", ""),
+            state=state.get("Status", ""),
+            health=(state.get("Health") or {}).get("Status"),
+            started_at=state.get("StartedAt") if started else None,
+            uptime=max(int(now - started), 0) if running and started else None,
+            restart_count=details.get("RestartCount", 0),
+            oom_killed=bool(state.get("OOMKilled")),
+            exit_code=None if running else state.get("ExitCode"),
+        )
+
+    def table_row(self) -> Dict[str, str]:
+        state = self.state
+        if self.exit_code is not None and state in ("exited", "dead"):
+            state = f"{state} ({self.exit_code})"
+        if self.oom_killed:
+            state = f"{state}, OOM killed"
+        memory = ""
+        if self.memory_usage is not None:
+            memory = format_bytes(self.memory_usage)
+            if self.memory_limit:
+                memory = f"{memory} / {format_bytes(self.memory_limit)}"
+        return {
+            "Service": self.service,
+            "Container": self.name,
+            "State": state,
+            "Health": self.health or "",
+            "Uptime": format_duration(self.uptime) if self.uptime is not None else "",
+            "Restarts": str(self.restart_count),
+            "CPU": f"{self.cpu_percent:.1f}%" if self.cpu_percent is not None else "",
+            "Memory": memory,
+        }
+
+
+class ContainerStatusReader:
+    """Runtime status of a compose project's containers, read over the client's pooled connection.
+
+    Each running container gets one single-shot stats request. When its answer has no earlier CPU
+    counters to compare with, CPU use comes from the sample of the read before, as in watch mode,
+    and is left blank on a first read rather than waiting to sample again.
+    """
+
+    def __init__(self, client: DockerClient, project: str):
+        self.client = client
+        self.project = project
+        self._samples: Dict[str, dict] = {}
+
+    def _optional(self, call: Callable[[str], dict], container_id: str) -> Optional[dict]:
+        # Containers removed or stopped between two requests are answered with 404 or 409
+        try:
+            return call(container_id)
+        except DockerAPIError as e:
+            if e.status in (404, 409):
+                return None
+            raise
+
+    def _sample(self, container_ids: List[str]) -> Dict[str, dict]:
+        samples = {container_id: self._optional(self.client.stats, container_id) for container_id in container_ids}
+        return {container_id: sample for container_id, sample in samples.items() if sample is not None}
+
+    def read(self, service: str = "all") -> List[ContainerStatus]:
+        """Raises OSError when the daemon cannot be reached and DockerAPIError when it answers with an error"""
+        summaries = self.client.containers(self.project, None if service == "all" else service)
+        now = time.time()
+        statuses = []
+        for summary in summaries:
+            details = self._optional(self.client.inspect, summary["Id"])
+            if details is not None:
+                statuses.append(ContainerStatus.from_inspect(details, now))
+
+        running = [status.id for status in statuses if status.state == "running"]
+        samples = self._sample(running)
+
+        for status in statuses:
+            current = samples.get(status.id)
+            if current is None:
+                continue
+            status.cpu_percent = cpu_percent(current, self._samples.get(status.id))
+            status.memory_usage, status.memory_limit = memory_usage(current)
+        self._samples = samples
+        return sorted(statuses, key=lambda status: (status.service, status.name))
+
 
 class DockerCommandBuilder(BaseDockerCommandBuilder):
     @staticmethod
@@ -39,6 +265,8 @@ class DockerCommandBuilder(BaseDockerCommandBuilder):
 
 class PsFormatter(BaseFormatter):
     def format_output(self, result: "PsResult", output: str) -> str:
+        if result.success and result.project is not None and output != "json":
+            return self.format_containers(result)
         if result.success:
             if output == "json":
                 message = services_status_retrieved.format(services=result.name)
@@ -97,6 +325,16 @@ class PsFormatter(BaseFormatter):
         else:
             return super().format_output(result, output, services_status_retrieved, service_status_failed)
 
+    def format_containers(self, result: "PsResult") -> str:
+        if not result.containers:
+            return no_project_containers.format(project=result.project)
+        return self.output_formatter.create_table(
+            data=[container.table_row() for container in result.containers],
+            title=f"Nixopus Services ({result.project})",
+            headers=RUNTIME_HEADERS,
+            show_header=True,
+        ).strip()
+
     def format_dry_run(self, config: "PsConfig") -> str:
         dry_run_messages = {
             "mode": dry_run_mode,
@@ -119,7 +357,7 @@ class DockerService(BaseDockerService):
         self.logger.debug(docker_command_executing.format(command=' '.join(cmd)))
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            result = run_with_deadline(cmd, capture_output=True, text=True, check=True)
             
             self.logger.debug(docker_command_completed.format(action="ps"))
             
@@ -149,7 +387,8 @@ class DockerService(BaseDockerService):
 
 
 class PsResult(BaseResult):
-    pass
+    project: Optional[str] = Field(None, description="Compose project, set when the status was read from the Docker Engine API")
+    containers: List[ContainerStatus] = Field(default_factory=list)
 
 
 class PsConfig(BaseConfig):
@@ -157,12 +396,23 @@ class PsConfig(BaseConfig):
 
 
 class PsService(BaseService[PsConfig, PsResult]):
-    def __init__(self, config: PsConfig, logger: LoggerProtocol = None, docker_service: DockerServiceProtocol = None):
+    def __init__(
+        self,
+        config: PsConfig,
+        logger: LoggerProtocol = None,
+        docker_service: DockerServiceProtocol = None,
+        docker_client: DockerClient = None,
+    ):
         super().__init__(config, logger, docker_service)
         self.docker_service = docker_service or DockerService(self.logger)
+        self.docker_client = docker_client or DockerClient()
+        self.project = compose_project_name(self.config.compose_file, self.config.env_file)
+        self.reader = ContainerStatusReader(self.docker_client, self.project)
         self.formatter = PsFormatter()
 
-    def _create_result(self, success: bool, error: str = None, docker_output: str = None) -> PsResult:
+    def _create_result(
+        self, success: bool, error: str = None, docker_output: str = None, containers: List[ContainerStatus] = None
+    ) -> PsResult:
         return PsResult(
             name=self.config.name,
             env_file=self.config.env_file,
@@ -171,14 +421,30 @@ class PsService(BaseService[PsConfig, PsResult]):
             success=success,
             error=error,
             docker_output=docker_output,
+            project=self.project if containers is not None else None,
+            containers=containers or [],
         )
 
     def ps(self) -> PsResult:
         return self.execute()
 
+    def read_containers(self) -> PsResult:
+        """Runtime status from the Docker Engine API; raises OSError or DockerAPIError when it cannot be read"""
+        if not self.docker_client.is_available():
+            raise FileNotFoundError(docker_socket_not_found.format(path=self.docker_client.socket_path))
+        self.logger.debug(reading_container_status.format(project=self.project, socket=self.docker_client.socket_path))
+        return self._create_result(True, containers=self.reader.read(self.config.name))
+
     def execute(self) -> PsResult:
         self.logger.debug(f"Checking status of services: {self.config.name}")
 
+        try:
+            return self.read_containers()
+        except (OSError, DockerAPIError) as e:
+            self.logger.debug(docker_api_unavailable.format(error=e))
+        finally:
+            self.docker_client.close()
+
         success, docker_output = self.docker_service.show_services_status(
             self.config.name, self.config.env_file, self.config.compose_file
         )
@@ -186,6 +452,51 @@ class PsService(BaseService[PsConfig, PsResult]):
         error = None if success else docker_output
         return self._create_result(success, error, docker_output)
 
+    def watch(self, on_refresh: Callable[[PsResult], None], interval: float = WATCH_REFRESH_INTERVAL) -> None:
+        """Call on_refresh with the runtime status now, after every container event of the project and every interval seconds.
+
+        Events are followed on their own connection in a background thread; a burst of them, as
+        compose up produces, leads to one refresh. Runs until interrupted or the event stream ends,
+        which raises ConnectionError.
+        """
+        events: "queue.Queue" = queue.Queue()
+
+        def follow():
+            try:
+                for event in self.docker_client.events(self.project):
+                    events.put(event)
+                events.put(ConnectionError(event_stream_closed))
+            except Exception as e:
+                events.put(e)
+
+        try:
+            # Subscribing before the first read means no event between the two is missed
+            threading.Thread(target=follow, daemon=True).start()
+            on_refresh(self.read_containers())
+            while True:
+                try:
+                    item = events.get(timeout=interval)
+                except queue.Empty:
+                    on_refresh(self.read_containers())
+                    continue
+                burst = []
+                while not isinstance(item, Exception):
+                    actor = item.get("Actor") or {}
+                    name = (actor.get("Attributes") or {}).get("name", actor.get("ID", ""))
+                    self.logger.debug(container_event_received.format(action=item.get("Action", ""), name=name))
+                    burst.append(item)
+                    try:
+                        item = events.get_nowait()
+                    except queue.Empty:
+                        item = None
+                        break
+                if burst:
+                    on_refresh(self.read_containers())
+                if isinstance(item, Exception):
+                    raise item
+        finally:
+            self.docker_client.close()
+
     def ps_and_format(self) -> str:
         return self.execute_and_format()
 
@@ -209,6 +520,9 @@ class Ps(BaseAction[PsConfig, PsResult]):
         service = PsService(config, logger=self.logger)
         return service.execute()
 
+    def watch(self, config: PsConfig, on_refresh: Callable[[PsResult], None]) -> None:
+        PsService(config, logger=self.logger).watch(on_refresh)
+
     def format_output(self, result: PsResult, output: str) -> str:
         return self.formatter.format_output(result, output)
     
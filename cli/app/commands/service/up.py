@@ -1,8 +1,10 @@
-from typing import Protocol
+import subprocess
+from typing import Callable, List, Optional, Protocol
 
 from pydantic import Field
 
 from app.utils.protocols import LoggerProtocol
+from app.utils.timeout import kill_at_deadline, popen_with_deadline
 
 from .base import BaseAction, BaseConfig, BaseDockerCommandBuilder, BaseDockerService, BaseFormatter, BaseResult, BaseService
 from .messages import (
@@ -11,16 +13,28 @@ from .messages import (
     dry_run_detach_mode,
     dry_run_env_file,
     dry_run_mode,
+    docker_command_completed,
+    docker_command_executing,
+    docker_command_failed,
     dry_run_service,
     end_dry_run,
+    progress_events_unsupported,
+    service_action_failed,
+    service_action_unexpected_error,
     service_start_failed,
     services_started_successfully,
 )
+from .progress import ComposeProgressParser, ServiceProgress
 
 
 class DockerServiceProtocol(Protocol):
     def start_services(
-        self, name: str = "all", detach: bool = True, env_file: str = None, compose_file: str = None
+        self,
+        name: str = "all",
+        detach: bool = True,
+        env_file: str = None,
+        compose_file: str = None,
+        progress_parser: ComposeProgressParser = None,
     ) -> tuple[bool, str]: ...
 
 
@@ -52,13 +66,54 @@ class DockerService(BaseDockerService):
         super().__init__(logger, "up")
 
     def start_services(
-        self, name: str = "all", detach: bool = False, env_file: str = None, compose_file: str = None
+        self,
+        name: str = "all",
+        detach: bool = False,
+        env_file: str = None,
+        compose_file: str = None,
+        progress_parser: ComposeProgressParser = None,
     ) -> tuple[bool, str]:
+        if detach and progress_parser is not None:
+            return self._start_with_progress(name, env_file, compose_file, progress_parser)
         return self.execute_services(name, env_file, compose_file, detach=detach)
 
+    def _start_with_progress(
+        self, name: str, env_file: str, compose_file: str, progress_parser: ComposeProgressParser
+    ) -> tuple[bool, str]:
+        """Run a detached `up`, feeding compose's JSON progress events to the parser as they arrive"""
+        cmd = DockerCommandBuilder.build_up_command(name, True, env_file, compose_file)
+        cmd[2:2] = ["--progress", "json"]
+        self.logger.debug(docker_command_executing.format(command=" ".join(cmd)))
+
+        try:
+            process = popen_with_deadline(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+            output_lines = []
+            with kill_at_deadline(process):
+                for line in process.stdout:
+                    if progress_parser.feed(line) is None and line.strip():
+                        output_lines.append(line.rstrip())
+                return_code = process.wait()
+        except Exception as e:
+            self.logger.error(service_action_unexpected_error.format(action=self.action, error=e))
+            return False, str(e)
+
+        output = "\n".join(output_lines)
+        if return_code == 0:
+            self.logger.debug(docker_command_completed.format(action=self.action))
+            return True, output
+        if not progress_parser.services and "progress" in output:
+            # Compose releases without JSON progress reject the flag before doing anything
+            self.logger.debug(progress_events_unsupported)
+            return self.execute_services(name, env_file, compose_file, detach=True)
+        self.logger.debug(docker_command_failed.format(return_code=return_code))
+        error = output or f"Process exited with code {return_code}"
+        self.logger.error(service_action_failed.format(action=self.action, error=error))
+        return False, error
+
 
 class UpResult(BaseResult):
     detach: bool
+    services: List[ServiceProgress] = Field(default_factory=list, description="Per-service pull and start progress")
 
 
 class UpConfig(BaseConfig):
@@ -66,12 +121,21 @@ class UpConfig(BaseConfig):
 
 
 class UpService(BaseService[UpConfig, UpResult]):
-    def __init__(self, config: UpConfig, logger: LoggerProtocol = None, docker_service: DockerServiceProtocol = None):
+    def __init__(
+        self,
+        config: UpConfig,
+        logger: LoggerProtocol = None,
+        docker_service: DockerServiceProtocol = None,
+        on_progress: Optional[Callable[[ServiceProgress], None]] = None,
+    ):
         super().__init__(config, logger, docker_service)
         self.docker_service = docker_service or DockerService(self.logger)
         self.formatter = UpFormatter()
+        self.on_progress = on_progress
 
-    def _create_result(self, success: bool, error: str = None, docker_output: str = None) -> UpResult:
+    def _create_result(
+        self, success: bool, error: str = None, docker_output: str = None, services: List[ServiceProgress] = None
+    ) -> UpResult:
         return UpResult(
             name=self.config.name,
             detach=self.config.detach,
@@ -81,6 +145,7 @@ class UpService(BaseService[UpConfig, UpResult]):
             success=success,
             error=error,
             docker_output=docker_output,
+            services=services or [],
         )
 
     def up(self) -> UpResult:
@@ -89,12 +154,18 @@ class UpService(BaseService[UpConfig, UpResult]):
     def execute(self) -> UpResult:
         self.logger.debug(f"Starting services: {self.config.name}")
 
+        if not self.config.detach:
+            success, docker_output = self.docker_service.start_services(
+                self.config.name, self.config.detach, self.config.env_file, self.config.compose_file
+            )
+            return self._create_result(success, None if success else docker_output, docker_output)
+
+        parser = ComposeProgressParser(self.on_progress)
         success, docker_output = self.docker_service.start_services(
-            self.config.name, self.config.detach, self.config.env_file, self.config.compose_file
+            self.config.name, self.config.detach, self.config.env_file, self.config.compose_file, progress_parser=parser
         )
-        
         error = None if success else docker_output
-        return self._create_result(success, error, docker_output)
+        return self._create_result(success, error, docker_output, parser.results())
 
     def up_and_format(self) -> str:
         return self.execute_and_format()
@@ -112,11 +183,11 @@ class Up(BaseAction[UpConfig, UpResult]):
         super().__init__(logger)
         self.formatter = UpFormatter()
 
-    def up(self, config: UpConfig) -> UpResult:
-        return self.execute(config)
+    def up(self, config: UpConfig, on_progress: Optional[Callable[[ServiceProgress], None]] = None) -> UpResult:
+        return self.execute(config, on_progress)
 
-    def execute(self, config: UpConfig) -> UpResult:
-        service = UpService(config, logger=self.logger)
+    def execute(self, config: UpConfig, on_progress: Optional[Callable[[ServiceProgress], None]] = None) -> UpResult:
+        service = UpService(config, logger=self.logger, on_progress=on_progress)
         return service.execute()
 
     def format_output(self, result: UpResult, output: str) -> str:
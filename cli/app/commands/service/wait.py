@@ -0,0 +1,297 @@
+import json
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from app.utils.logger import Logger
+from app.utils.protocols import LoggerProtocol
+from app.utils.timeout import remaining_time, run_with_deadline, submit_with_deadline
+
+from .base import BaseAction, BaseConfig, BaseFormatter, BaseResult, BaseService
+from .messages import (
+    containers_ready,
+    container_exited,
+    docker_command_executing,
+    dry_run_command,
+    dry_run_command_would_be_executed,
+    dry_run_mode,
+    dry_run_probe,
+    dry_run_service,
+    end_dry_run,
+    no_containers_found,
+    port_accepting_connections,
+    port_not_accepting_connections,
+    probe_update,
+    services_not_ready,
+    services_ready,
+    waiting_for_containers,
+)
+
+DEFAULT_WAIT_TIMEOUT = 120
+INITIAL_POLL_DELAY = 0.25
+MAX_POLL_DELAY = 5.0
+
+# Container states that will not turn into running without someone starting the container again
+TERMINAL_STATES = {"exited", "dead"}
+
+
+class ProbeFailed(Exception):
+    """Raised by a probe check when its target can no longer become ready"""
+
+
+class Probe:
+    """A named readiness check; check() returns (ready, detail)"""
+
+    def __init__(self, name: str, check: Callable[[], Tuple[bool, str]]):
+        self.name = name
+        self.check = check
+
+
+class ProbeResult(BaseModel):
+    name: str
+    ready: bool = False
+    failed: bool = False
+    detail: str = ""
+    attempts: int = 0
+    elapsed: float = 0.0
+
+
+def wait_for(
+    probes: List[Probe],
+    timeout: float,
+    initial_delay: float = INITIAL_POLL_DELAY,
+    max_delay: float = MAX_POLL_DELAY,
+    on_update: Optional[Callable[[ProbeResult], None]] = None,
+) -> List[ProbeResult]:
+    """Poll every probe concurrently, each with exponential backoff, until it is ready or the shared deadline passes.
+
+    The deadline is the sooner of timeout and the caller's current deadline.
+    """
+    on_update = on_update or (lambda result: None)
+    started = time.monotonic()
+    deadline = started + remaining_time(timeout)
+
+    def poll(probe: Probe) -> ProbeResult:
+        result = ProbeResult(name=probe.name)
+        delay = initial_delay
+        while True:
+            result.attempts += 1
+            try:
+                result.ready, result.detail = probe.check()
+            except ProbeFailed as e:
+                result.failed, result.detail = True, str(e)
+            except Exception as e:
+                result.ready, result.detail = False, str(e)
+            result.elapsed = round(time.monotonic() - started, 3)
+            on_update(result)
+            remaining = deadline - time.monotonic()
+            if result.ready or result.failed or remaining <= 0:
+                return result
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+    if not probes:
+        return []
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        futures = [submit_with_deadline(executor, poll, probe) for probe in probes]
+        return [future.result() for future in futures]
+
+
+def parse_compose_ps(output: str) -> List[dict]:
+    """Containers from `docker compose ps --format json`, which prints a JSON array or one object per line"""
+    output = output.strip()
+    if not output:
+        return []
+    if output.startswith("["):
+        return json.loads(output)
+    return [json.loads(line) for line in output.splitlines() if line.strip()]
+
+
+class ComposeHealthProbe:
+    """Ready when every container of the project runs and those with a healthcheck report healthy"""
+
+    def __init__(self, name: str = "all", env_file: str = None, compose_file: str = None, logger: LoggerProtocol = None):
+        self.service_name = name
+        self.env_file = env_file
+        self.compose_file = compose_file
+        self.logger = logger
+
+    def build_command(self) -> list[str]:
+        cmd = ["docker", "compose"]
+        if self.compose_file:
+            cmd.extend(["-f", self.compose_file])
+        if self.env_file:
+            cmd.extend(["--env-file", self.env_file])
+        cmd.extend(["ps", "--all", "--format", "json"])
+        if self.service_name != "all":
+            cmd.append(self.service_name)
+        return cmd
+
+    def __call__(self) -> Tuple[bool, str]:
+        cmd = self.build_command()
+        if self.logger:
+            self.logger.debug(docker_command_executing.format(command=" ".join(cmd)))
+        result = run_with_deadline(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            return False, result.stderr.strip() or result.stdout.strip()
+        containers = parse_compose_ps(result.stdout)
+        if not containers:
+            return False, no_containers_found
+
+        waiting = []
+        for container in containers:
+            name = container.get("Service") or container.get("Name", "")
+            state = (container.get("State") or "").lower()
+            health = (container.get("Health") or "").lower()
+            if state in TERMINAL_STATES:
+                exit_code = container.get("ExitCode", 0)
+                if exit_code:
+                    raise ProbeFailed(container_exited.format(name=name, code=exit_code))
+                continue
+            if state != "running":
+                waiting.append(f"{name} ({state or 'created'})")
+            elif health and health != "healthy":
+                waiting.append(f"{name} ({health})")
+
+        if waiting:
+            return False, waiting_for_containers.format(containers=", ".join(waiting))
+        return True, containers_ready.format(count=len(containers))
+
+
+class PortProbe:
+    """Ready once something accepts TCP connections on host:port"""
+
+    def __init__(self, port: int, host: str = "127.0.0.1", connect_timeout: float = 1.0):
+        self.port = port
+        self.host = host
+        self.connect_timeout = connect_timeout
+
+    def __call__(self) -> Tuple[bool, str]:
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.connect_timeout):
+                return True, port_accepting_connections.format(host=self.host, port=self.port)
+        except OSError as e:
+            return False, port_not_accepting_connections.format(host=self.host, port=self.port, error=e)
+
+
+class WaitFormatter(BaseFormatter):
+    def format_output(self, result: "WaitResult", output: str) -> str:
+        if output == "json":
+            if result.success:
+                message = services_ready.format(services=result.name)
+                output_message = self.output_formatter.create_success_message(message, result.model_dump())
+            else:
+                output_message = self.output_formatter.create_error_message(result.error, result.model_dump())
+            return self.output_formatter.format_output(output_message, output)
+
+        rows = [
+            {
+                "Check": probe.name,
+                "Status": "ready" if probe.ready else ("failed" if probe.failed else "not ready"),
+                "Attempts": str(probe.attempts),
+                "Elapsed": f"{probe.elapsed:.1f}s",
+                "Detail": probe.detail,
+            }
+            for probe in result.probes
+        ]
+        return self.output_formatter.create_table(
+            data=rows, title="Service Readiness", headers=["Check", "Status", "Attempts", "Elapsed", "Detail"], show_header=True
+        ).strip()
+
+    def format_dry_run(self, config: "WaitConfig") -> str:
+        probes = build_probes(config, Logger(verbose=config.verbose))
+        output = [dry_run_mode, dry_run_command_would_be_executed]
+        output.append(f"{dry_run_command} {' '.join(probes[0].check.build_command())}")
+        output.append(f"{dry_run_service} {config.name}")
+        for probe in probes:
+            output.append(dry_run_probe.format(name=probe.name, timeout=config.timeout))
+        output.append(end_dry_run)
+        return "\n".join(output)
+
+
+class WaitResult(BaseResult):
+    probes: List[ProbeResult] = Field(default_factory=list)
+
+
+class WaitConfig(BaseConfig):
+    timeout: int = Field(DEFAULT_WAIT_TIMEOUT, gt=0, description="Overall deadline in seconds")
+    proxy_port: Optional[int] = Field(None, description="Caddy admin port to wait for, None to skip")
+    api_port: Optional[int] = Field(None, description="API port to wait for, None to skip")
+
+
+def build_probes(config: WaitConfig, logger: LoggerProtocol) -> List[Probe]:
+    """Container health always; the Caddy admin API and the API port when their ports are set"""
+    probes = [Probe("containers", ComposeHealthProbe(config.name, config.env_file, config.compose_file, logger))]
+    if config.proxy_port:
+        # requests is only loaded when the Caddy admin API is actually polled, keeping `service --help` light
+        from app.commands.proxy.base import BaseCaddyService
+
+        caddy = BaseCaddyService(logger)
+        probes.append(Probe(f"caddy admin :{config.proxy_port}", lambda: caddy.check_status(config.proxy_port)))
+    if config.api_port:
+        probes.append(Probe(f"api :{config.api_port}", PortProbe(config.api_port)))
+    return probes
+
+
+class WaitService(BaseService[WaitConfig, WaitResult]):
+    def __init__(self, config: WaitConfig, logger: LoggerProtocol = None, probes: List[Probe] = None):
+        super().__init__(config, logger)
+        self.probes = probes if probes is not None else build_probes(config, self.logger)
+        self.formatter = WaitFormatter()
+
+    def _create_result(self, success: bool, error: str = None, probes: List[ProbeResult] = None) -> WaitResult:
+        return WaitResult(
+            name=self.config.name,
+            env_file=self.config.env_file,
+            verbose=self.config.verbose,
+            output=self.config.output,
+            success=success,
+            error=error,
+            probes=probes or [],
+        )
+
+    def wait(self, on_update: Optional[Callable[[ProbeResult], None]] = None) -> WaitResult:
+        return self.execute(on_update)
+
+    def execute(self, on_update: Optional[Callable[[ProbeResult], None]] = None) -> WaitResult:
+        def update(result: ProbeResult):
+            self.logger.debug(probe_update.format(name=result.name, attempt=result.attempts, detail=result.detail))
+            if on_update:
+                on_update(result)
+
+        results = wait_for(self.probes, self.config.timeout, on_update=update)
+        pending = [result for result in results if not result.ready]
+        if pending:
+            error = services_not_ready.format(
+                timeout=self.config.timeout, checks="; ".join(f"{result.name}: {result.detail}" for result in pending)
+            )
+            return self._create_result(False, error, results)
+        return self._create_result(True, None, results)
+
+    def execute_and_format(self) -> str:
+        if self.config.dry_run:
+            return self.formatter.format_dry_run(self.config)
+        result = self.execute()
+        return self.formatter.format_output(result, self.config.output)
+
+
+class Wait(BaseAction[WaitConfig, WaitResult]):
+    def __init__(self, logger: LoggerProtocol = None):
+        super().__init__(logger)
+        self.formatter = WaitFormatter()
+
+    def wait(self, config: WaitConfig, on_update: Optional[Callable[[ProbeResult], None]] = None) -> WaitResult:
+        return self.execute(config, on_update)
+
+    def execute(self, config: WaitConfig, on_update: Optional[Callable[[ProbeResult], None]] = None) -> WaitResult:
+        service = WaitService(config, logger=self.logger)
+        return service.execute(on_update)
+
+    def format_output(self, result: WaitResult, output: str) -> str:
+        return self.formatter.format_output(result, output)
+
+    def format_dry_run(self, config: WaitConfig) -> str:
+        return self.formatter.format_dry_run(config)
@@ -2,7 +2,7 @@ import subprocess
 
 import typer
 
-from app.utils.config import Config
+from app.utils.config import get_config
 from app.utils.logger import Logger
 
 from .messages import development_only_error, running_command
@@ -10,7 +10,7 @@ from .messages import development_only_error, running_command
 
 class TestCommand:
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.logger = Logger()
 
     def run(self, target: str = typer.Argument(None, help="Test target (e.g., version)")):
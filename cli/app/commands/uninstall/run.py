@@ -5,7 +5,7 @@ import subprocess
 from pathlib import Path
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from app.utils.protocols import LoggerProtocol
-from app.utils.config import Config, NIXOPUS_CONFIG_DIR, SSH_FILE_PATH, DEFAULT_COMPOSE_FILE
+from app.utils.config import get_config, NIXOPUS_CONFIG_DIR, SSH_FILE_PATH, DEFAULT_COMPOSE_FILE
 from app.utils.timeout import TimeoutWrapper
 from app.commands.service.down import Down, DownConfig
 from .messages import (
@@ -20,10 +20,7 @@ from .messages import (
     config_dir_not_exist_skip, removed_config_dir, skipped_removal_config_dir
 )
 
-_config = Config()
-_config_dir = _config.get_yaml_value(NIXOPUS_CONFIG_DIR)
-_compose_file = _config.get_yaml_value(DEFAULT_COMPOSE_FILE)
-_ssh_key_path = _config_dir + "/" + _config.get_yaml_value(SSH_FILE_PATH)
+_config = get_config()
 
 class Uninstall:
     def __init__(self, logger: LoggerProtocol = None, verbose: bool = False, timeout: int = 300, dry_run: bool = False, force: bool = False):
@@ -34,6 +31,9 @@ class Uninstall:
         self.force = force
         self.progress = None
         self.main_task = None
+        self._config_dir = _config.get_yaml_value(NIXOPUS_CONFIG_DIR)
+        self._compose_file = _config.get_yaml_value(DEFAULT_COMPOSE_FILE)
+        self._ssh_key_path = self._config_dir + "/" + _config.get_yaml_value(SSH_FILE_PATH)
 
     def run(self):
         steps = [
@@ -86,7 +86,7 @@ class Uninstall:
             self.logger.error(f"{uninstall_failed}{context_msg}")
 
     def _stop_services(self):
-        compose_file_path = os.path.join(_config_dir, _compose_file)
+        compose_file_path = os.path.join(self._config_dir, self._compose_file)
         
         if not os.path.exists(compose_file_path):
             self.logger.debug(compose_file_not_found_skip.format(compose_file_path=compose_file_path))
@@ -114,7 +114,7 @@ class Uninstall:
             raise Exception(f"{services_stop_failed}: {operation_timed_out}")
 
     def _remove_ssh_keys(self):
-        ssh_key_path = Path(_ssh_key_path)
+        ssh_key_path = Path(self._ssh_key_path)
         public_key_path = ssh_key_path.with_suffix('.pub')
         
         if not public_key_path.exists():
@@ -156,7 +156,7 @@ class Uninstall:
             raise Exception(f"{ssh_keys_removal_failed}: {str(e)}")
 
     def _remove_config_directory(self):
-        config_dir_path = Path(_config_dir)
+        config_dir_path = Path(self._config_dir)
         
         if not config_dir_path.exists():
             self.logger.debug(config_dir_not_exist_skip.format(config_dir_path=config_dir_path))
@@ -2,8 +2,6 @@ import typer
 
 from app.utils.message import application_version_help
 
-from .version import VersionCommand
-
 version_app = typer.Typer(help=application_version_help, invoke_without_command=True)
 
 
@@ -11,12 +9,16 @@ version_app = typer.Typer(help=application_version_help, invoke_without_command=
 def version_callback(ctx: typer.Context):
     """Show version information (default)"""
     if ctx.invoked_subcommand is None:
+        from .version import VersionCommand
+
         version_command = VersionCommand()
         version_command.run()
 
 
 def main_version_callback(value: bool):
     if value:
+        from .version import VersionCommand
+
         version_command = VersionCommand()
         version_command.run()
         raise typer.Exit()
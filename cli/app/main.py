@@ -1,31 +1,49 @@
-import os
-import time
 import typer
 
 from importlib.metadata import version as get_version
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-
-from app.commands.clone.command import clone_app
-from app.commands.conf.command import conf_app
-from app.commands.install.command import install_app
-from app.commands.preflight.command import preflight_app
-from app.commands.proxy.command import proxy_app
-from app.commands.service.command import service_app
-from app.commands.test.command import test_app
-from app.commands.uninstall.command import uninstall_app
-from app.commands.version.command import main_version_callback, version_app
-from app.commands.conflict.command import conflict_app
-from app.commands.version.version import VersionCommand
-from app.utils.message import application_add_completion, application_description, application_name, application_version_help
-from app.utils.config import Config
 
+from app.commands.version.command import main_version_callback
+from app.utils.lazy_group import lazy_group
+from app.utils.message import application_add_completion, application_description, application_name, application_version_help
+from app.utils.config import get_config
+
+# Subcommand modules are imported only when the command is resolved, keeping startup cheap
+SUBCOMMANDS = {
+    "preflight": "app.commands.preflight.command:preflight_app",
+    "clone": "app.commands.clone.command:clone_app",
+    "conflict": "app.commands.conflict.command:conflict_app",
+    "conf": "app.commands.conf.command:conf_app",
+    "service": "app.commands.service.command:service_app",
+    "proxy": "app.commands.proxy.command:proxy_app",
+    "install": "app.commands.install.command:install_app",
+    "uninstall": "app.commands.uninstall.command:uninstall_app",
+    "version": "app.commands.version.command:version_app",
+    "daemon": "app.commands.daemon.command:daemon_app",
+}
+
+# Short help for the top-level listing, so `nixopus --help` does not import every subcommand
+SUBCOMMAND_HELP = {
+    "preflight": "Preflight checks for system compatibility",
+    "clone": "Clone a repository",
+    "conflict": "Check for tool version conflicts",
+    "conf": "Manage configuration",
+    "service": "Manage Nixopus services",
+    "proxy": "Manage Nixopus proxy (Caddy) configuration",
+    "install": "Install Nixopus",
+    "uninstall": "Uninstall Nixopus",
+    "version": application_version_help,
+    "daemon": "Run a resident daemon that serves CLI commands without interpreter startup",
+}
+
+config = get_config()
+if config.is_development():
+    SUBCOMMANDS["test"] = "app.commands.test.command:test_app"
 
 app = typer.Typer(
     name=application_name,
     help=application_description,
     add_completion=application_add_completion,
+    cls=lazy_group(SUBCOMMANDS, SUBCOMMAND_HELP),
 )
 
 
@@ -41,6 +59,10 @@ def main(
     ),
 ):
     if ctx.invoked_subcommand is None:
+        from rich.console import Console
+        from rich.panel import Panel
+        from rich.text import Text
+
         console = Console()
 
         ascii_art = r"""
@@ -104,19 +126,5 @@ def main(
         console.print(help_text)
 
 
-app.add_typer(preflight_app, name="preflight")
-app.add_typer(clone_app, name="clone")
-app.add_typer(conflict_app, name="conflict")
-app.add_typer(conf_app, name="conf")
-app.add_typer(service_app, name="service")
-app.add_typer(proxy_app, name="proxy")
-app.add_typer(install_app, name="install")
-app.add_typer(uninstall_app, name="uninstall")
-app.add_typer(version_app, name="version")
-
-config = Config()
-if config.is_development():
-    app.add_typer(test_app, name="test")
-
 if __name__ == "__main__":
     app()
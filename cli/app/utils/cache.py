@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+
+CACHE_DIR_ENV = "NIXOPUS_CACHE_DIR"
+
+
+def get_cache_dir() -> str:
+    """Per-user cache directory, overridable through NIXOPUS_CACHE_DIR"""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "nixopus")
+
+
+def cache_key(*parts: Any) -> str:
+    return hashlib.sha1("\0".join(str(part) for part in parts).encode()).hexdigest()[:16]
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable digest of the inputs a cached result depends on"""
+    encoded = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def file_digest(path: str) -> Optional[str]:
+    """sha256 of a file's contents, or None when it cannot be read"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def get_cache_path(name: str) -> str:
+    return os.path.join(get_cache_dir(), f"{name}.json")
+
+
+def read_json_file(path: str, max_age: Optional[float] = None) -> Optional[Any]:
+    """Return the JSON payload of a file, or None when it is missing, unreadable or older than max_age seconds"""
+    try:
+        with open(path, "r") as f:
+            if max_age is not None and time.time() - os.fstat(f.fileno()).st_mtime > max_age:
+                return None
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_file(path: str, payload: Any) -> bool:
+    """Atomically write a JSON payload; failures are not fatal to callers"""
+    temp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, dir=os.path.dirname(path), suffix=".tmp") as f:
+            temp_path = f.name
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+        return True
+    except (OSError, TypeError, ValueError):
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+        return False
+
+
+def read_json_cache(name: str, max_age: Optional[float] = None) -> Optional[Any]:
+    """Return the cached payload, or None when it is missing, unreadable or older than max_age seconds"""
+    return read_json_file(get_cache_path(name), max_age)
+
+
+def write_json_cache(name: str, payload: Any) -> bool:
+    return write_json_file(get_cache_path(name), payload)
@@ -1,15 +1,21 @@
+import json
 import os
 import sys
-import yaml
 import re
+from app.utils.cache import cache_key, read_json_cache, write_json_cache
 from app.utils.message import MISSING_CONFIG_KEY_MESSAGE
 
+COMPILED_CONFIG_VERSION = 1
+
+# Parsed YAML shared by every Config instance in the process, keyed by path
+_parsed_configs = {}
+
 
 class Config:
     def __init__(self, default_env="PRODUCTION"):
         self.default_env = default_env
         self._yaml_config = None
-        self._cache = {}
+        self._index = None
 
         # Check if running as PyInstaller bundle
         if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
@@ -27,14 +33,22 @@ class Config:
 
     def load_yaml_config(self):
         if self._yaml_config is None:
-            with open(self._yaml_path, "r") as f:
-                self._yaml_config = yaml.safe_load(f)
+            self._yaml_config = load_compiled_yaml(self._yaml_path)
         return self._yaml_config
 
+    def _get_index(self, path: str):
+        """Flat index of the built-in config, rebuilt when an env var used by the looked-up path changes"""
+        index = self._index
+        if index is None or not _is_current(index, path):
+            index = self._index = build_config_index(self.load_yaml_config())
+        return index
+
     def get_yaml_value(self, path: str):
+        index = self._get_index(path)
+        if path in index["values"]:
+            return index["values"][path]
         config = self.load_yaml_config()
-        keys = path.split(".")
-        for key in keys:
+        for key in path.split("."):
             if isinstance(config, dict) and key in config:
                 config = config[key]
             else:
@@ -44,6 +58,9 @@ class Config:
         return config
 
     def get_service_env_values(self, service_env_path: str):
+        expanded = self._get_index(service_env_path)["expanded"].get(service_env_path)
+        if expanded is not None:
+            return dict(expanded)
         config = self.get_yaml_value(service_env_path)
         return {key: expand_env_placeholders(value) for key, value in config.items()}
 
@@ -55,6 +72,8 @@ class Config:
         if not os.path.exists(config_file):
             raise FileNotFoundError(f"Config file not found: {config_file}")
 
+        import yaml
+
         with open(config_file, "r") as f:
             user_config = yaml.safe_load(f)
 
@@ -85,44 +104,164 @@ class Config:
         return nested
 
     def get_config_value(self, key: str, user_config: dict, defaults: dict):
-        """Get config value from user config with fallback to defaults and caching."""
-        if key in self._cache:
-            return self._cache[key]
-
-        # Key mappings for user config lookup
-        key_mappings = {
-            "proxy_port": "services.caddy.env.PROXY_PORT",
-            "repo_url": "clone.repo",
-            "branch_name": "clone.branch",
-            "source_path": "clone.source-path",
-            "config_dir": "nixopus-config-dir",
-            "api_env_file_path": "services.api.env.API_ENV_FILE",
-            "view_env_file_path": "services.view.env.VIEW_ENV_FILE",
-            "compose_file": "compose-file-path",
-            "required_ports": "ports",
-        }
-
-        config_path = key_mappings.get(key, key)
+        """Get config value from user config with fallback to defaults."""
+        config_path = USER_CONFIG_KEYS.get(key, key)
         user_value = user_config.get(config_path)
         value = user_value if user_value is not None else defaults.get(key)
 
         if value is None and key not in ["ssh_passphrase"]:
             raise ValueError(f"Configuration key '{key}' has no default value")
 
-        self._cache[key] = value
         return value
 
 
+# Short option names resolved against dotted paths in a flattened user config
+USER_CONFIG_KEYS = {
+    "proxy_port": "services.caddy.env.PROXY_PORT",
+    "repo_url": "clone.repo",
+    "branch_name": "clone.branch",
+    "source_path": "clone.source-path",
+    "sparse_paths": "clone.sparse-paths",
+    "config_dir": "nixopus-config-dir",
+    "api_env_file_path": "services.api.env.API_ENV_FILE",
+    "view_env_file_path": "services.view.env.VIEW_ENV_FILE",
+    "compose_file": "compose-file-path",
+    "required_ports": "ports",
+    "public_ip": "public-ip",
+}
+
+
+_shared_config = None
+
+
+def get_config() -> Config:
+    """Process-wide Config instance for read-only lookups of the built-in config"""
+    global _shared_config
+    if _shared_config is None:
+        _shared_config = Config()
+    return _shared_config
+
+
+def _source_signature(path: str) -> list:
+    # A frozen bundle re-extracts its data files on every run, so the binary itself identifies the config
+    source = sys.executable if getattr(sys, "frozen", False) else os.path.abspath(path)
+    stat = os.stat(source)
+    return [source, stat.st_mtime_ns, stat.st_size]
+
+
+def parse_yaml_file(path: str):
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _survives_json(data) -> bool:
+    # Non-string keys and date values come back as strings, so such a config is not cached on disk
+    try:
+        return json.loads(json.dumps(data)) == data
+    except (TypeError, ValueError):
+        return False
+
+
+def load_compiled_yaml(path: str):
+    """Load a YAML file through the in-process and on-disk compiled caches.
+
+    The on-disk entry is keyed by path, mtime and size so an unchanged file is never re-parsed.
+    Files whose parsed data would not survive the JSON round trip are only cached in process.
+    """
+    try:
+        signature = _source_signature(path)
+    except OSError:
+        return parse_yaml_file(path)
+
+    cached = _parsed_configs.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    cache_name = f"config-{cache_key(signature[0], os.path.basename(path))}"
+    compiled = read_json_cache(cache_name)
+    if (
+        isinstance(compiled, dict)
+        and compiled.get("version") == COMPILED_CONFIG_VERSION
+        and compiled.get("signature") == signature
+    ):
+        data = compiled.get("data")
+    else:
+        data = parse_yaml_file(path)
+        if not isinstance(data, dict):
+            return data
+        if _survives_json(data):
+            write_json_cache(cache_name, {"version": COMPILED_CONFIG_VERSION, "signature": signature, "data": data})
+
+    _parsed_configs[path] = (signature, data)
+    return data
+
+
+_ENV_PLACEHOLDER_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(:-([^}]*))?}")
+
+
 def expand_env_placeholders(value: str) -> str:
     # Expand environment placeholders in the form ${ENV_VAR:-default}
-    pattern = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(:-([^}]*))?}")
-
     def replacer(match):
         var_name = match.group(1)
         default = match.group(3) if match.group(2) else ""
         return os.environ.get(var_name, default)
 
-    return pattern.sub(replacer, value)
+    return _ENV_PLACEHOLDER_PATTERN.sub(replacer, value)
+
+
+def _is_current(index: dict, path: str) -> bool:
+    env = index["env"]
+    return all(os.environ.get(name) == env[name] for name in index["env_vars"].get(path, ()))
+
+
+def build_config_index(config_data: dict) -> dict:
+    """Resolve every dotted path of a config mapping up front.
+
+    String leaves are expanded against the current environment, and mappings whose values are
+    all strings also get an expanded copy for get_service_env_values. Each path records the env
+    vars its placeholders read, so a lookup only has to re-check those to know the index is current.
+    """
+    values = {}
+    expanded = {}
+    env_vars = {}
+
+    def placeholders(value: str) -> set:
+        return {match.group(1) for match in _ENV_PLACEHOLDER_PATTERN.finditer(value)}
+
+    def walk(node, prefix):
+        used = set()
+        for key, value in node.items():
+            # Keys that are not plain strings cannot be addressed by a dotted path
+            if not isinstance(key, str) or "." in key:
+                continue
+            path = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, dict):
+                values[path] = value
+                names = walk(value, path)
+                if value and all(isinstance(v, str) for v in value.values()):
+                    expanded[path] = {k: expand_env_placeholders(v) for k, v in value.items()}
+                    names |= set().union(*(placeholders(v) for v in value.values()))
+            elif isinstance(value, str):
+                names = placeholders(value)
+                values[path] = expand_env_placeholders(value) if names else value
+            else:
+                values[path] = value
+                continue
+            if names:
+                env_vars[path] = tuple(sorted(names))
+                used |= names
+        return used
+
+    used = walk(config_data, "") if isinstance(config_data, dict) else set()
+    return {
+        "values": values,
+        "expanded": expanded,
+        "env_vars": env_vars,
+        "env": {name: os.environ.get(name) for name in used},
+    }
 
 
 VIEW_ENV_FILE = "services.view.env.VIEW_ENV_FILE"
@@ -130,14 +269,27 @@ API_ENV_FILE = "services.api.env.API_ENV_FILE"
 DEFAULT_REPO = "clone.repo"
 DEFAULT_BRANCH = "clone.branch"
 DEFAULT_PATH = "clone.source-path"
+SPARSE_PATHS = "clone.sparse-paths"
+MIRROR_DIR = "clone.mirror-dir"
 DEFAULT_COMPOSE_FILE = "compose-file-path"
 NIXOPUS_CONFIG_DIR = "nixopus-config-dir"
+PUBLIC_IP = "public-ip"
 PROXY_PORT = "services.caddy.env.PROXY_PORT"
 CADDY_BASE_URL = "services.caddy.env.BASE_URL"
 CONFIG_ENDPOINT = "services.caddy.env.CONFIG_ENDPOINT"
 LOAD_ENDPOINT = "services.caddy.env.LOAD_ENDPOINT"
 STOP_ENDPOINT = "services.caddy.env.STOP_ENDPOINT"
 DEPS = "deps"
+PACKAGE_INDEX_MAX_AGE = "package-index-max-age"
+IMAGE_PULL_JOBS = "image-pull-jobs"
+HOST_FACTS_MAX_AGE = "host-facts-max-age"
+MIN_CPUS = "capacity.min-cpus"
+MIN_MEMORY_MB = "capacity.min-memory-mb"
+MIN_DISK_MB = "capacity.min-disk-mb"
+MIN_INODES = "capacity.min-inodes"
+CPU_WORKERS = "workers.cpu"
+SUBPROCESS_WORKERS = "workers.subprocess"
+NETWORK_WORKERS = "workers.network"
 PORTS = "ports"
 API_SERVICE = "services.api"
 VIEW_SERVICE = "services.view"
@@ -0,0 +1,152 @@
+"""Minimal Docker Engine API client over the daemon's unix socket.
+
+Queries share one keep-alive HTTP connection instead of spawning the docker CLI for every call;
+the events stream, which holds its connection open, gets a second one. Only the standard library
+is used so the commands that read container state stay light to import.
+"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import quote, urlencode
+
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+DOCKER_API_TIMEOUT = 5
+COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
+COMPOSE_SERVICE_LABEL = "com.docker.compose.service"
+
+
+class DockerAPIError(Exception):
+    """Raised when the daemon answers a request with an error status"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def get_docker_socket_path() -> Optional[str]:
+    """Unix socket of the daemon the docker CLI would talk to, None when DOCKER_HOST is not a unix socket"""
+    host = os.environ.get("DOCKER_HOST", "")
+    if not host:
+        return DEFAULT_DOCKER_SOCKET
+    if host.startswith("unix://"):
+        return host[len("unix://"):]
+    return None
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: Optional[float] = DOCKER_API_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def _error_message(body: bytes, status: int) -> str:
+    try:
+        return json.loads(body).get("message") or f"HTTP {status}"
+    except (ValueError, AttributeError):
+        return body.decode(errors="replace").strip() or f"HTTP {status}"
+
+
+def _filters(**filters: List[str]) -> str:
+    return json.dumps({key: values for key, values in filters.items() if values})
+
+
+class DockerClient:
+    """Read-only Docker Engine API client; safe to share between threads"""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = DOCKER_API_TIMEOUT):
+        self.socket_path = socket_path or get_docker_socket_path()
+        self.timeout = timeout
+        self._connection: Optional[UnixHTTPConnection] = None
+        self._events_connection: Optional[UnixHTTPConnection] = None
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return bool(self.socket_path) and os.path.exists(self.socket_path)
+
+    def get(self, path: str, params: Optional[Dict[str, str]] = None) -> Any:
+        """GET path on the pooled connection and decode the JSON answer"""
+        url = f"{path}?{urlencode(params)}" if params else path
+        with self._lock:
+            for attempt in range(2):
+                if self._connection is None:
+                    self._connection = UnixHTTPConnection(self.socket_path, self.timeout)
+                try:
+                    self._connection.request("GET", url)
+                    response = self._connection.getresponse()
+                    body = response.read()
+                    break
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                    # The daemon may drop an idle keep-alive connection; reconnect once
+                    self._connection.close()
+                    self._connection = None
+                    if attempt:
+                        raise
+        if response.status >= 400:
+            raise DockerAPIError(_error_message(body, response.status), response.status)
+        return json.loads(body) if body else None
+
+    def containers(self, project: Optional[str] = None, service: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Containers in any state, optionally only those of a compose project and service"""
+        labels = []
+        if project:
+            labels.append(f"{COMPOSE_PROJECT_LABEL}={project}")
+        if service:
+            labels.append(f"{COMPOSE_SERVICE_LABEL}={service}")
+        return self.get("/containers/json", {"all": "1", "filters": _filters(label=labels)})
+
+    def inspect(self, container_id: str) -> Dict[str, Any]:
+        return self.get(f"/containers/{quote(container_id)}/json")
+
+    def stats(self, container_id: str) -> Dict[str, Any]:
+        """One stats sample; one-shot skips the second sample the daemon would otherwise wait a second for"""
+        return self.get(f"/containers/{quote(container_id)}/stats", {"stream": "false", "one-shot": "true"})
+
+    def events(self, project: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Container events as they happen, until the stream is closed by close() or the daemon"""
+        labels = [f"{COMPOSE_PROJECT_LABEL}={project}"] if project else []
+        connection = UnixHTTPConnection(self.socket_path, timeout=None)
+        self._events_connection = connection
+        try:
+            connection.request("GET", f"/events?{urlencode({'filters': _filters(type=['container'], label=labels)})}")
+            response = connection.getresponse()
+            if response.status >= 400:
+                raise DockerAPIError(_error_message(response.read(), response.status), response.status)
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+        connection, self._events_connection = self._events_connection, None
+        if connection is not None and connection.sock is not None:
+            # shutdown wakes a thread blocked reading the stream, close alone does not
+            try:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
+
+    def __enter__(self) -> "DockerClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,180 @@
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+from app.utils.config import CPU_WORKERS, NETWORK_WORKERS, SUBPROCESS_WORKERS, get_config
+from app.utils.timeout import current_deadline, submit_with_deadline
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+CPU = "cpu"
+SUBPROCESS = "subprocess"
+NETWORK = "network"
+
+WORKER_LIMIT_KEYS = {CPU: CPU_WORKERS, SUBPROCESS: SUBPROCESS_WORKERS, NETWORK: NETWORK_WORKERS}
+DEFAULT_WORKER_LIMITS = {CPU: 0, SUBPROCESS: 8, NETWORK: 32}
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_limits: Dict[str, int] = {}
+_executors_lock = threading.Lock()
+_worker = threading.local()
+
+
+def worker_limit(kind: str) -> int:
+    """Threads of the shared pool for kind, from the workers.* config; 0 means one per CPU"""
+    try:
+        limit = int(get_config().get_yaml_value(WORKER_LIMIT_KEYS[kind]))
+    except (KeyError, TypeError, ValueError):
+        limit = DEFAULT_WORKER_LIMITS[kind]
+    return limit if limit > 0 else os.cpu_count() or 1
+
+
+def get_executor(kind: str = CPU) -> ThreadPoolExecutor:
+    """Process-wide pool for one kind of work, created on first use"""
+    with _executors_lock:
+        if kind not in _executors:
+            _limits[kind] = worker_limit(kind)
+            _executors[kind] = ThreadPoolExecutor(max_workers=_limits[kind], thread_name_prefix=f"nixopus-{kind}")
+        return _executors[kind]
+
+
+def in_worker() -> bool:
+    """Whether the current thread is running a task of one of the shared pools"""
+    return getattr(_worker, "active", False)
+
+
+def _run_task(func: Callable[[T], R], item: T) -> R:
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.check()
+    outer = in_worker()
+    _worker.active = True
+    try:
+        return func(item)
+    finally:
+        _worker.active = outer
+
+
+def _handle(item: T, future: Future, error_handler: Optional[Callable[[T, Exception], R]]) -> R:
+    try:
+        return future.result()
+    except Exception as e:
+        if error_handler is None:
+            raise
+        return error_handler(item, e)
+
+
+def _inline(func: Callable[[T], R], item: T) -> Future:
+    future = Future()
+    try:
+        future.set_result(_run_task(func, item))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def map_items(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    kind: str = CPU,
+    max_workers: Optional[int] = None,
+    ordered: bool = False,
+    error_handler: Optional[Callable[[T, Exception], R]] = None,
+) -> Iterator[R]:
+    """Run func over items on the shared pool for kind, yielding results as they complete.
+
+    At most max_workers items are in flight at once, on top of the pool's own limit. With ordered,
+    results are yielded in input order instead of completion order. An exception is passed to
+    error_handler when one is given; otherwise it is raised from the iterator and the items that
+    have not started yet are cancelled. Closing the iterator early cancels them too. Calls made
+    from inside a pool task run inline in that thread, so nested fan-outs cannot oversubscribe the
+    pools or deadlock waiting on themselves. Tasks run in a copy of the caller's context and so
+    share its deadline.
+    """
+    if in_worker():
+        for item in items:
+            yield _handle(item, _inline(func, item), error_handler)
+        return
+
+    executor = get_executor(kind)
+    limit = max(1, max_workers or _limits[kind])
+    pending = enumerate(items)
+    in_flight: Dict[Future, tuple] = {}
+    finished: Dict[int, R] = {}
+    next_index = 0
+
+    def fill():
+        for index, item in pending:
+            in_flight[submit_with_deadline(executor, _run_task, func, item)] = (index, item)
+            if len(in_flight) >= limit:
+                return
+
+    try:
+        fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item = in_flight.pop(future)
+                result = _handle(item, future, error_handler)
+                if ordered:
+                    finished[index] = result
+                else:
+                    yield result
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+            fill()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def process_items(func: Callable[[T], R], items: Iterable[T], **kwargs) -> list:
+    """map_items collected into a list"""
+    return list(map_items(func, items, **kwargs))
+
+
+async def amap_items(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    kind: str = CPU,
+    max_workers: Optional[int] = None,
+    ordered: bool = False,
+    error_handler: Optional[Callable[[T, Exception], R]] = None,
+) -> AsyncIterator[R]:
+    """map_items for coroutines: the same pools and limits, awaited without blocking the event loop"""
+    import asyncio
+
+    executor = get_executor(kind)
+    limit = max(1, max_workers or _limits[kind])
+    pending = enumerate(items)
+    in_flight: Dict["asyncio.Future", tuple] = {}
+    finished: Dict[int, R] = {}
+    next_index = 0
+
+    def fill():
+        for index, item in pending:
+            in_flight[asyncio.wrap_future(submit_with_deadline(executor, _run_task, func, item))] = (index, item)
+            if len(in_flight) >= limit:
+                return
+
+    try:
+        fill()
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index, item = in_flight.pop(future)
+                result = _handle(item, future, error_handler)
+                if ordered:
+                    finished[index] = result
+                else:
+                    yield result
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+            fill()
+    finally:
+        for future in in_flight:
+            future.cancel()
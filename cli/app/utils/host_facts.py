@@ -0,0 +1,259 @@
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from app.utils.cache import read_json_cache, write_json_cache
+from app.utils.config import HOST_FACTS_MAX_AGE, NIXOPUS_CONFIG_DIR, get_config
+from app.utils.executor import SUBPROCESS, process_items
+from app.utils.lib import HostInformation
+from app.utils.path_index import get_path_index
+from app.utils.timeout import TimeoutWrapper, run_with_deadline
+
+HOST_FACTS_CACHE = "host-facts"
+HOST_FACTS_CACHE_VERSION = 1
+DEFAULT_HOST_FACTS_MAX_AGE = 300
+HOST_FACTS_TIMEOUT = 10
+DOCKER_PROBE_TIMEOUT = 5
+DEFAULT_DOCKER_DATA_ROOT = "/var/lib/docker"
+
+# cgroup v1 reports "no limit" as a very large number rather than "max"
+CGROUP_UNLIMITED = 1 << 60
+
+
+class DiskFacts(BaseModel):
+    path: str
+    measured_path: str = Field(..., description="Closest existing directory to path, which statvfs was called on")
+    free_bytes: int
+    free_inodes: Optional[int] = Field(None, description="None on filesystems without a fixed inode table")
+
+
+class DockerFacts(BaseModel):
+    reachable: bool = False
+    version: Optional[str] = None
+    data_root: Optional[str] = None
+    error: Optional[str] = None
+
+
+class HostFacts(BaseModel):
+    os_name: str
+    distribution: Optional[str] = None
+    distribution_version: Optional[str] = None
+    package_manager: Optional[str] = None
+    cpu_count: int
+    memory_total: Optional[int] = None
+    memory_available: Optional[int] = None
+    cgroup_cpu_limit: Optional[float] = None
+    cgroup_memory_limit: Optional[int] = None
+    config_dir: str
+    disks: List[DiskFacts] = Field(default_factory=list)
+    docker: DockerFacts = Field(default_factory=DockerFacts)
+    collected_at: float
+
+    @property
+    def effective_cpus(self) -> float:
+        """CPUs this process may use, after any cgroup quota"""
+        if self.cgroup_cpu_limit is None:
+            return float(self.cpu_count)
+        return min(float(self.cpu_count), self.cgroup_cpu_limit)
+
+    @property
+    def effective_memory(self) -> Optional[int]:
+        """Memory in bytes this process may use, after any cgroup limit"""
+        limits = [value for value in (self.memory_total, self.cgroup_memory_limit) if value is not None]
+        return min(limits) if limits else None
+
+    def disk(self, path: str) -> Optional[DiskFacts]:
+        return next((disk for disk in self.disks if disk.path == path), None)
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def probe_os_release(path: str = "/etc/os-release") -> Dict[str, Optional[str]]:
+    values = {}
+    for line in (_read(path) or "").splitlines():
+        key, separator, value = line.partition("=")
+        if separator:
+            values[key.strip()] = value.strip().strip("\"'")
+    return {"distribution": values.get("ID"), "distribution_version": values.get("VERSION_ID")}
+
+
+def probe_package_manager() -> Dict[str, Optional[str]]:
+    try:
+        return {"package_manager": HostInformation.get_package_manager()}
+    except RuntimeError:
+        return {"package_manager": None}
+
+
+def probe_cpu() -> Dict[str, int]:
+    if hasattr(os, "sched_getaffinity"):
+        return {"cpu_count": len(os.sched_getaffinity(0))}
+    return {"cpu_count": os.cpu_count() or 1}
+
+
+def probe_memory(meminfo_path: str = "/proc/meminfo") -> Dict[str, Optional[int]]:
+    values = {}
+    for line in (_read(meminfo_path) or "").splitlines():
+        key, _, value = line.partition(":")
+        parts = value.split()
+        if parts and parts[0].isdigit():
+            values[key] = int(parts[0]) * 1024
+    total = values.get("MemTotal")
+    if total is None:
+        try:
+            total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        except (ValueError, OSError, AttributeError):
+            total = None
+    return {"memory_total": total, "memory_available": values.get("MemAvailable")}
+
+
+def probe_cgroup(root: str = "/sys/fs/cgroup") -> Dict[str, Optional[float]]:
+    """CPU quota (in CPUs) and memory limit of this process's cgroup, v2 first and then v1"""
+    cpu_limit = memory_limit = None
+    cpu_max = _read(os.path.join(root, "cpu.max"))
+    if cpu_max is not None:
+        quota, _, period = cpu_max.strip().partition(" ")
+        if quota != "max" and period:
+            cpu_limit = int(quota) / int(period)
+    else:
+        quota = _read(os.path.join(root, "cpu", "cpu.cfs_quota_us"))
+        period = _read(os.path.join(root, "cpu", "cpu.cfs_period_us"))
+        if quota and period and int(quota) > 0:
+            cpu_limit = int(quota) / int(period)
+
+    memory_max = _read(os.path.join(root, "memory.max"))
+    if memory_max is None:
+        memory_max = _read(os.path.join(root, "memory", "memory.limit_in_bytes"))
+    if memory_max is not None and memory_max.strip().isdigit() and int(memory_max) < CGROUP_UNLIMITED:
+        memory_limit = int(memory_max)
+    return {"cgroup_cpu_limit": cpu_limit, "cgroup_memory_limit": memory_limit}
+
+
+def probe_docker() -> Dict[str, DockerFacts]:
+    if not get_path_index().has("docker"):
+        return {"docker": DockerFacts(error="docker is not installed")}
+    try:
+        result = run_with_deadline(
+            ["docker", "info", "--format", "{{.ServerVersion}}|{{.DockerRootDir}}"],
+            capture_output=True,
+            text=True,
+            timeout=DOCKER_PROBE_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired:
+        return {"docker": DockerFacts(error="docker daemon did not answer")}
+    if result.returncode != 0:
+        lines = (result.stderr or "").strip().splitlines()
+        return {"docker": DockerFacts(error=lines[-1] if lines else "docker daemon is not reachable")}
+    version, _, data_root = result.stdout.strip().partition("|")
+    return {"docker": DockerFacts(reachable=True, version=version or None, data_root=data_root or None)}
+
+
+def probe_disk(path: str) -> Optional[DiskFacts]:
+    measured = os.path.abspath(path)
+    while not os.path.exists(measured) and os.path.dirname(measured) != measured:
+        measured = os.path.dirname(measured)
+    try:
+        st = os.statvfs(measured)
+    except OSError:
+        return None
+    return DiskFacts(
+        path=path,
+        measured_path=measured,
+        free_bytes=st.f_bavail * st.f_frsize,
+        free_inodes=st.f_favail if st.f_files else None,
+    )
+
+
+HOST_PROBES: List[Tuple[str, Callable[[], Dict]]] = [
+    ("os_release", probe_os_release),
+    ("package_manager", probe_package_manager),
+    ("cpu", probe_cpu),
+    ("memory", probe_memory),
+    ("cgroup", probe_cgroup),
+    ("docker", probe_docker),
+]
+
+
+def collect_host_facts(config_dir: str, timeout: int = HOST_FACTS_TIMEOUT) -> HostFacts:
+    """Run every probe at once on the subprocess pool, all of them bounded by one deadline.
+
+    A probe that fails leaves its facts unset instead of failing the collection. The Docker data
+    root is only known once the daemon answered, so its disk is measured after the other probes.
+    """
+    values = {"os_name": HostInformation.get_os_name(), "config_dir": config_dir, "cpu_count": os.cpu_count() or 1}
+
+    def run_probe(probe: Tuple[str, Callable[[], Dict]]) -> Dict:
+        return probe[1]()
+
+    with TimeoutWrapper(timeout):
+        for result in process_items(run_probe, HOST_PROBES, kind=SUBPROCESS, error_handler=lambda probe, e: {}):
+            values.update(result)
+
+    docker = values.get("docker") or DockerFacts()
+    disk_paths = dict.fromkeys([config_dir, docker.data_root or DEFAULT_DOCKER_DATA_ROOT])
+    values["disks"] = [disk for disk in map(probe_disk, disk_paths) if disk is not None]
+    return HostFacts(collected_at=time.time(), **values)
+
+
+def get_host_facts_max_age() -> int:
+    try:
+        return int(get_config().get_yaml_value(HOST_FACTS_MAX_AGE))
+    except (KeyError, TypeError, ValueError):
+        return DEFAULT_HOST_FACTS_MAX_AGE
+
+
+def default_config_dir() -> str:
+    return os.path.abspath(os.path.expanduser(get_config().get_yaml_value(NIXOPUS_CONFIG_DIR)))
+
+
+_facts: Dict[str, HostFacts] = {}
+_facts_lock = threading.Lock()
+
+
+def get_host_facts(config_dir: Optional[str] = None, refresh: bool = False, max_age: Optional[int] = None) -> HostFacts:
+    """Facts about this host, collected at most once per max_age seconds and shared across commands.
+
+    Facts are kept in memory for the process and on disk for max_age seconds (host-facts-max-age,
+    300 by default), so preflight, install and deps read the same answers without probing again.
+    """
+    config_dir = config_dir or default_config_dir()
+    max_age = get_host_facts_max_age() if max_age is None else max_age
+    with _facts_lock:
+        facts = None if refresh else _facts.get(config_dir)
+        if facts is None and not refresh:
+            facts = _load_cached_facts(config_dir, max_age)
+        if facts is None:
+            facts = collect_host_facts(config_dir)
+            if max_age > 0:
+                write_json_cache(HOST_FACTS_CACHE, {"version": HOST_FACTS_CACHE_VERSION, "facts": facts.model_dump()})
+        _facts[config_dir] = facts
+        return facts
+
+
+def _load_cached_facts(config_dir: str, max_age: int) -> Optional[HostFacts]:
+    if max_age <= 0:
+        return None
+    cached = read_json_cache(HOST_FACTS_CACHE, max_age=max_age)
+    if not isinstance(cached, dict) or cached.get("version") != HOST_FACTS_CACHE_VERSION:
+        return None
+    try:
+        facts = HostFacts.model_validate(cached.get("facts"))
+    except ValueError:
+        return None
+    return facts if facts.config_dir == config_dir else None
+
+
+def invalidate_host_facts() -> None:
+    """Drop the in-memory facts and the cached copy, for example after installing packages"""
+    with _facts_lock:
+        _facts.clear()
+        write_json_cache(HOST_FACTS_CACHE, None)
@@ -0,0 +1,50 @@
+import importlib
+from typing import Dict, List, Optional
+
+import click
+import typer
+from typer.core import TyperGroup
+
+
+class LazyTyperGroup(TyperGroup):
+    """Typer group that imports subcommand modules only when they are resolved"""
+
+    lazy_subcommands: Dict[str, str] = {}
+    lazy_help: Dict[str, str] = {}
+    _listing_help = False
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        # The command listing only needs short help, which is served without importing anything
+        self._listing_help = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._listing_help = False
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        commands = super().list_commands(ctx)
+        return commands + [name for name in self.lazy_subcommands if name not in commands]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            if self._listing_help and cmd_name in self.lazy_help:
+                return click.Command(cmd_name, help=self.lazy_help[cmd_name])
+            self.commands[cmd_name] = self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        module_path, attr_name = self.lazy_subcommands[cmd_name].split(":")
+        typer_app = getattr(importlib.import_module(module_path), attr_name)
+        command = typer.main.get_command(typer_app)
+        command.name = cmd_name
+        return command
+
+
+def lazy_group(subcommands: Dict[str, str], help_texts: Optional[Dict[str, str]] = None) -> type:
+    """Build a LazyTyperGroup subclass bound to a name -> "module:attribute" mapping.
+
+    help_texts gives the short help shown in the group's command listing; commands without an
+    entry are imported to read it.
+    """
+    attrs = {"lazy_subcommands": dict(subcommands), "lazy_help": dict(help_texts or {})}
+    return type("LazyTyperGroup", (LazyTyperGroup,), attrs)
@@ -1,16 +1,25 @@
+import ipaddress
 import os
 import platform
 import shutil
+import socket
 import stat
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 from enum import Enum
-from typing import Callable, List, Optional, Tuple, TypeVar
+from typing import List, Optional, Tuple
 import requests
 
+from app.utils.cache import read_json_cache, write_json_cache
 from app.utils.message import FAILED_TO_GET_PUBLIC_IP_MESSAGE, FAILED_TO_REMOVE_DIRECTORY_MESSAGE, REMOVED_DIRECTORY_MESSAGE
+from app.utils.path_index import get_path_index
 
-T = TypeVar("T")
-R = TypeVar("R")
+PUBLIC_IP_ENV = "NIXOPUS_PUBLIC_IP"
+PUBLIC_IP_CACHE = "public-ip"
+PUBLIC_IP_CACHE_TTL = 3600
+
+# Host facts resolved once per process; guarded because install steps run on worker threads
+_host_facts = {}
+_host_facts_lock = threading.Lock()
 
 
 class SupportedOS(str, Enum):
@@ -78,45 +87,87 @@ class HostInformation:
 
     @staticmethod
     def command_exists(command):
-        return shutil.which(command) is not None
+        return get_path_index().has(command)
     
     @staticmethod
-    def get_public_ip():
+    def get_public_ip(override: Optional[str] = None, max_age: int = PUBLIC_IP_CACHE_TTL) -> str:
+        """Public address of this host, looked up at most once per run.
+
+        An explicit override or NIXOPUS_PUBLIC_IP wins. A successful lookup is cached on disk for
+        max_age seconds; when the lookup service is unreachable a local interface address is used.
+        """
+        override = override or os.environ.get(PUBLIC_IP_ENV)
+        if override:
+            return override.strip()
+
+        with _host_facts_lock:
+            if "public_ip" not in _host_facts:
+                _host_facts["public_ip"] = HostInformation._resolve_public_ip(max_age)
+            return _host_facts["public_ip"]
+
+    @staticmethod
+    def _resolve_public_ip(max_age: int) -> str:
+        cached = read_json_cache(PUBLIC_IP_CACHE, max_age=max_age)
+        if isinstance(cached, dict) and cached.get("ip"):
+            return cached["ip"]
         try:
             response = requests.get('https://api.ipify.org', timeout=10)
             response.raise_for_status()  # fail on non-2xx
-            return response.text.strip()
+            ip = response.text.strip()
         except requests.RequestException:
-            raise Exception(FAILED_TO_GET_PUBLIC_IP_MESSAGE)
+            # Offline hosts still get a usable address; it is not persisted so the next run retries
+            local_ips = HostInformation.get_local_ips()
+            if not local_ips:
+                raise Exception(FAILED_TO_GET_PUBLIC_IP_MESSAGE)
+            return local_ips[0]
+        write_json_cache(PUBLIC_IP_CACHE, {"ip": ip})
+        return ip
 
+    @staticmethod
+    def get_local_ips() -> List[str]:
+        """Non-loopback IPv4 addresses of this host, the one on the default route first"""
+        candidates = []
+        try:
+            # connect() on a UDP socket only selects the outgoing interface, nothing is sent
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+                probe.connect(("192.0.2.1", 80))
+                candidates.append(probe.getsockname()[0])
+        except OSError:
+            pass
+        try:
+            candidates.extend(socket.gethostbyname_ex(socket.gethostname())[2])
+        except OSError:
+            pass
+        candidates.extend(HostInformation._interface_addresses())
+
+        addresses = []
+        for candidate in candidates:
+            try:
+                address = ipaddress.ip_address(candidate)
+            except ValueError:
+                continue
+            if not (address.is_loopback or address.is_unspecified or address.is_link_local) and candidate not in addresses:
+                addresses.append(candidate)
+        return addresses
 
-class ParallelProcessor:
     @staticmethod
-    def process_items(
-        items: List[T],
-        processor_func: Callable[[T], R],
-        max_workers: int = 50,
-        error_handler: Callable[[T, Exception], R] = None,
-    ) -> List[R]:
-        if not items:
+    def _interface_addresses() -> List[str]:
+        try:
+            import fcntl
+            import struct
+            interfaces = socket.if_nameindex()
+        except (ImportError, OSError):
             return []
-
-        results = []
-        max_workers = min(len(items), max_workers)
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(processor_func, item): item for item in items}
-
-            for future in as_completed(futures):
+        siocgifaddr = 0x8915
+        addresses = []
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for _, name in interfaces:
                 try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    item = futures[future]
-                    if error_handler:
-                        error_result = error_handler(item, e)
-                        results.append(error_result)
-        return results
+                    request = struct.pack("256s", name.encode()[:15])
+                    addresses.append(socket.inet_ntoa(fcntl.ioctl(sock.fileno(), siocgifaddr, request)[20:24]))
+                except OSError:
+                    continue
+        return addresses
 
 
 class DirectoryManager:
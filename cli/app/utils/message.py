@@ -15,4 +15,7 @@ HIGHLIGHT_MESSAGE = "{message}"
 REMOVED_DIRECTORY_MESSAGE = "Removed existing directory: {path}"
 FAILED_TO_REMOVE_DIRECTORY_MESSAGE = "Failed to remove directory: {path}"
 MISSING_CONFIG_KEY_MESSAGE = "Missing config key: {path} (failed at '{key}')"
-FAILED_TO_GET_PUBLIC_IP_MESSAGE = "Failed to get public IP"
\ No newline at end of file
+FAILED_TO_GET_PUBLIC_IP_MESSAGE = "Failed to get public IP"
+UNKNOWN_STEP_DEPENDENCY_MESSAGE = "Step '{step}' depends on unknown step '{dependency}'"
+STEP_DEPENDENCY_CYCLE_MESSAGE = "Step dependencies form a cycle at '{step}'"
+STEP_TIMEOUT_MESSAGE = "{step} timed out after {timeout} seconds"
@@ -0,0 +1,72 @@
+import os
+import threading
+from typing import Dict, List, Optional
+
+
+class PathIndex:
+    """Executables on PATH, found by listing every PATH directory once.
+
+    Lookups follow PATH order like shutil.which, but only stat the candidates of the name asked
+    for, so checking many commands costs one directory listing per PATH entry in total. The index
+    is rebuilt when PATH changes; call invalidate() after installing packages so new binaries show up.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._names: Optional[Dict[str, List[str]]] = None
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._built_for: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _search_path(self) -> str:
+        return self.path if self.path is not None else os.environ.get("PATH", os.defpath)
+
+    def _build(self, search_path: str) -> Dict[str, List[str]]:
+        names: Dict[str, List[str]] = {}
+        for directory in dict.fromkeys(search_path.split(os.pathsep)):
+            try:
+                entries = os.listdir(directory or os.curdir)
+            except OSError:
+                continue
+            for name in entries:
+                names.setdefault(name, []).append(os.path.join(directory, name))
+        return names
+
+    def _index(self) -> Dict[str, List[str]]:
+        search_path = self._search_path()
+        if self._names is None or self._built_for != search_path:
+            self._names = self._build(search_path)
+            self._resolved = {}
+            self._built_for = search_path
+        return self._names
+
+    @staticmethod
+    def _is_executable(path: str) -> bool:
+        return os.access(path, os.X_OK) and not os.path.isdir(path)
+
+    def which(self, command: str) -> Optional[str]:
+        """Full path of command as shutil.which would find it, or None"""
+        if os.path.dirname(command):
+            return command if self._is_executable(command) else None
+        with self._lock:
+            names = self._index()
+            if command not in self._resolved:
+                self._resolved[command] = next((p for p in names.get(command, []) if self._is_executable(p)), None)
+            return self._resolved[command]
+
+    def has(self, command: str) -> bool:
+        return self.which(command) is not None
+
+    def invalidate(self) -> None:
+        """Forget the listing, for example after packages were installed"""
+        with self._lock:
+            self._names = None
+            self._resolved = {}
+
+
+_path_index = PathIndex()
+
+
+def get_path_index() -> PathIndex:
+    """Process-wide PATH index shared by preflight, install and conflict checks"""
+    return _path_index
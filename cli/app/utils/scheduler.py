@@ -0,0 +1,133 @@
+import contextvars
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.utils.message import STEP_DEPENDENCY_CYCLE_MESSAGE, STEP_TIMEOUT_MESSAGE, UNKNOWN_STEP_DEPENDENCY_MESSAGE
+from app.utils.timeout import TimeoutWrapper
+
+STEP_RUNNING = "running"
+STEP_DONE = "done"
+STEP_FAILED = "failed"
+STEP_SKIPPED = "skipped"
+
+
+class Step:
+    """A named unit of work that may start once every step it depends on has finished"""
+
+    def __init__(self, name: str, description: str, func: Callable[[], None], depends_on: Iterable[str] = (), timeout: int = 0):
+        self.name = name
+        self.description = description
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+
+
+class StepScheduler:
+    """Runs a dependency graph of steps with bounded concurrency.
+
+    Steps run on worker threads as soon as their dependencies are done. After the first failure no
+    new step is started, steps still waiting are reported as skipped, and the first error is raised
+    once the steps already running have finished. A step that exceeds its timeout counts as failed
+    and is not waited for; it runs under a TimeoutWrapper, so the processes it started are killed too.
+    """
+
+    def __init__(self, steps: List[Step], max_workers: int = 4, on_event: Optional[Callable[[Step, str], None]] = None):
+        self.steps = {step.name: step for step in steps}
+        self.max_workers = max(1, max_workers)
+        self.on_event = on_event or (lambda step, status: None)
+        self.validate()
+
+    def validate(self):
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise ValueError(UNKNOWN_STEP_DEPENDENCY_MESSAGE.format(step=step.name, dependency=dependency))
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(STEP_DEPENDENCY_CYCLE_MESSAGE.format(step=name))
+            visiting.add(name)
+            for dependency in self.steps[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.steps:
+            visit(name)
+
+    def run(self) -> None:
+        pending = list(self.steps)
+        done = set()
+        deadlines: Dict[str, Optional[float]] = {}
+        results: "queue.Queue[tuple]" = queue.Queue()
+        error: Optional[BaseException] = None
+
+        while pending or deadlines:
+            if error is None:
+                for name in [name for name in pending if set(self.steps[name].depends_on) <= done]:
+                    if len(deadlines) >= self.max_workers:
+                        break
+                    pending.remove(name)
+                    deadlines[name] = self._start(self.steps[name], results)
+            elif pending:
+                for name in pending:
+                    self.on_event(self.steps[name], STEP_SKIPPED)
+                pending = []
+
+            if not deadlines:
+                break
+
+            try:
+                name, step_error = results.get(timeout=self._wait_time(deadlines))
+            except queue.Empty:
+                name, step_error = self._expired(deadlines)
+                if name is None:
+                    continue
+            if name not in deadlines:
+                # A step that already timed out finished late; it was reported when it expired
+                continue
+            del deadlines[name]
+
+            step = self.steps[name]
+            if step_error is None:
+                done.add(name)
+                self.on_event(step, STEP_DONE)
+            else:
+                self.on_event(step, STEP_FAILED)
+                error = error or step_error
+
+        if error is not None:
+            raise error
+
+    def _start(self, step: Step, results: "queue.Queue[tuple]") -> Optional[float]:
+        def target():
+            try:
+                with TimeoutWrapper(step.timeout):
+                    step.func()
+            except BaseException as e:
+                results.put((step.name, e))
+            else:
+                results.put((step.name, None))
+
+        self.on_event(step, STEP_RUNNING)
+        # Threads start with an empty context; copy ours so steps inherit the caller's deadline
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(target,), name=f"step-{step.name}", daemon=True).start()
+        return time.monotonic() + step.timeout if step.timeout > 0 else None
+
+    @staticmethod
+    def _wait_time(deadlines: Dict[str, Optional[float]]) -> Optional[float]:
+        upcoming = [deadline for deadline in deadlines.values() if deadline is not None]
+        return max(0.0, min(upcoming) - time.monotonic()) if upcoming else None
+
+    def _expired(self, deadlines: Dict[str, Optional[float]]):
+        now = time.monotonic()
+        for name, deadline in deadlines.items():
+            if deadline is not None and deadline <= now:
+                return name, TimeoutError(STEP_TIMEOUT_MESSAGE.format(step=self.steps[name].description, timeout=self.steps[name].timeout))
+        return None, None
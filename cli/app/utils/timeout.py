@@ -1,24 +1,167 @@
+import contextvars
+import os
 import signal
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
 from app.commands.install.messages import timeout_error
 
+_current_deadline: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar("deadline", default=None)
+
+
+class Deadline:
+    """A point on the monotonic clock by which work must finish, and the timeout it was created from"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """Raise TimeoutError once the deadline has passed; for loops that do not spawn processes"""
+        if self.expired:
+            raise TimeoutError(timeout_error.format(timeout=self.timeout))
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def remaining_time(timeout: Optional[float] = None) -> Optional[float]:
+    """The smaller of timeout and what is left of the current deadline, None when neither applies"""
+    deadline = current_deadline()
+    if deadline is None:
+        return timeout
+    return deadline.remaining() if timeout is None else min(timeout, deadline.remaining())
+
 
 class TimeoutWrapper:
-    """Context manager for timeout operations"""
-    
+    """Context manager that bounds the enclosed work by a deadline.
+
+    The deadline is carried in a context variable, so nested wrappers get the minimum of the
+    remaining budgets and it works on any thread. Processes started through the *_with_deadline
+    helpers below are killed with their whole process group when it passes, and thread pools pass
+    it on to their tasks via submit_with_deadline. Pure Python code is not interrupted: if the
+    deadline passed by the time the block exits, TimeoutError is raised then.
+    """
+
     def __init__(self, timeout: int):
         self.timeout = timeout
-        self.original_handler = None
-    
+        self.deadline: Optional[Deadline] = None
+        self._token = None
+
     def __enter__(self):
         if self.timeout > 0:
-            def timeout_handler(signum, frame):
-                raise TimeoutError(timeout_error.format(timeout=self.timeout))
-            
-            self.original_handler = signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(self.timeout)
+            deadline = Deadline(self.timeout)
+            outer = current_deadline()
+            self.deadline = outer if outer is not None and outer.expires_at <= deadline.expires_at else deadline
+            self._token = _current_deadline.set(self.deadline)
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.timeout > 0:
-            signal.alarm(0)
-            signal.signal(signal.SIGALRM, self.original_handler) 
+        if self._token is None:
+            return False
+        _current_deadline.reset(self._token)
+        self._token = None
+        if self.deadline.expired and (exc_type is None or issubclass(exc_type, Exception)) and exc_type is not TimeoutError:
+            raise TimeoutError(timeout_error.format(timeout=self.deadline.timeout)) from exc_val
+        return False
+
+
+def kill_process_group(process: subprocess.Popen) -> None:
+    """Kill process and, when it leads its own process group, everything it started"""
+    try:
+        if os.getpgid(process.pid) == process.pid:
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def popen_with_deadline(cmd, **kwargs) -> subprocess.Popen:
+    """subprocess.Popen that puts the child in its own process group while a deadline is active"""
+    if current_deadline() is not None:
+        kwargs.setdefault("start_new_session", True)
+    return subprocess.Popen(cmd, **kwargs)
+
+
+@contextmanager
+def kill_at_deadline(process: subprocess.Popen):
+    """Kill the process group of process when the current deadline passes or the block is left by an exception"""
+    remaining = remaining_time()
+    if remaining is None:
+        yield process
+        return
+    timer = threading.Timer(remaining, kill_process_group, (process,))
+    timer.daemon = True
+    timer.start()
+    try:
+        yield process
+    except BaseException:
+        kill_process_group(process)
+        raise
+    finally:
+        timer.cancel()
+
+
+def run_with_deadline(cmd, timeout: Optional[float] = None, **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run bounded by the current deadline, killing the whole process group when it times out.
+
+    Outside a deadline this is plain subprocess.run. Raises subprocess.TimeoutExpired, like
+    subprocess.run, when the time runs out.
+    """
+    if current_deadline() is None:
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return subprocess.run(cmd, **kwargs)
+    timeout = remaining_time(timeout)
+    if timeout <= 0:
+        raise subprocess.TimeoutExpired(cmd, 0)
+
+    check = kwargs.pop("check", False)
+    input = kwargs.pop("input", None)
+    if kwargs.pop("capture_output", False):
+        kwargs["stdout"] = kwargs["stderr"] = subprocess.PIPE
+    if input is not None:
+        kwargs["stdin"] = subprocess.PIPE
+    kwargs.setdefault("start_new_session", True)
+
+    with subprocess.Popen(cmd, **kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(input, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_group(process)
+            stdout, stderr = process.communicate()
+            raise subprocess.TimeoutExpired(cmd, timeout, output=stdout, stderr=stderr)
+        except BaseException:
+            kill_process_group(process)
+            process.wait()
+            raise
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, cmd, output=stdout, stderr=stderr)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+def check_call_with_deadline(cmd, timeout: Optional[float] = None, **kwargs) -> int:
+    """subprocess.check_call bounded by the current deadline, see run_with_deadline"""
+    if current_deadline() is None:
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return subprocess.check_call(cmd, **kwargs)
+    run_with_deadline(cmd, timeout=timeout, check=True, **kwargs)
+    return 0
+
+
+def submit_with_deadline(executor, fn, *args, **kwargs):
+    """executor.submit that runs fn in a copy of the caller's context, so the task inherits its deadline"""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
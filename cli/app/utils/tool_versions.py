@@ -0,0 +1,80 @@
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from app.utils.cache import cache_key, get_cache_path, read_json_cache, write_json_cache
+from app.utils.path_index import get_path_index
+
+TOOL_VERSIONS_CACHE = "tool-versions"
+TOOL_VERSIONS_CACHE_VERSION = 1
+
+
+def binary_signature(executable: str) -> Optional[List]:
+    """Resolved path, inode, mtime and size of an executable on PATH, or None when it is not found"""
+    path = get_path_index().which(executable)
+    if path is None:
+        return None
+    path = os.path.realpath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [path, st.st_ino, st.st_mtime_ns, st.st_size]
+
+
+class ToolVersionCache:
+    """Output of version commands, kept on disk and reused while the binary they run is unchanged.
+
+    Entries are keyed by the command and invalidated when the executable it resolves to on PATH is
+    replaced, so an upgrade is picked up on the next run while an unchanged toolchain costs a stat
+    per tool instead of a subprocess.
+    """
+
+    def __init__(self, name: str = TOOL_VERSIONS_CACHE):
+        self.name = name
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._path: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        path = get_cache_path(self.name)
+        if self._entries is None or self._path != path:
+            self._path = path
+            cached = read_json_cache(self.name)
+            if isinstance(cached, dict) and cached.get("version") == TOOL_VERSIONS_CACHE_VERSION:
+                self._entries = dict(cached.get("entries", {}))
+            else:
+                self._entries = {}
+        return self._entries
+
+    def get(self, command: Sequence[str]) -> Optional[str]:
+        signature = binary_signature(command[0])
+        if signature is None:
+            return None
+        with self._lock:
+            entry = self._load().get(cache_key(*command))
+        if entry is None or entry.get("signature") != signature:
+            return None
+        return entry.get("output")
+
+    def put(self, command: Sequence[str], output: str) -> None:
+        signature = binary_signature(command[0])
+        if signature is None:
+            return
+        with self._lock:
+            entries = self._load()
+            entries[cache_key(*command)] = {"command": list(command), "signature": signature, "output": output}
+            write_json_cache(self.name, {"version": TOOL_VERSIONS_CACHE_VERSION, "entries": entries})
+
+
+_tool_version_cache: Optional[ToolVersionCache] = None
+_tool_version_cache_lock = threading.Lock()
+
+
+def get_tool_version_cache() -> ToolVersionCache:
+    """Process-wide tool version cache shared by conflict, preflight and install checks"""
+    global _tool_version_cache
+    with _tool_version_cache_lock:
+        if _tool_version_cache is None:
+            _tool_version_cache = ToolVersionCache()
+        return _tool_version_cache
@@ -84,6 +84,8 @@ a = Analysis(
     hiddenimports=[
         'app.commands.clone.command',
         'app.commands.conf.command',
+        'app.commands.conflict.command',
+        'app.commands.daemon.command',
         'app.commands.install.command',
         'app.commands.preflight.command',
         'app.commands.proxy.command',
@@ -91,6 +93,7 @@ a = Analysis(
         'app.commands.test.command',
         'app.commands.uninstall.command',
         'app.commands.version.command',
+        'app.main',
     ],
     hookspath=[],
     hooksconfig={},
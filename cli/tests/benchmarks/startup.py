@@ -0,0 +1,217 @@
+"""Cold-start benchmarks for the nixopus CLI.
+
+Each command is started in a fresh interpreter to record wall time, and once more with
+``-X importtime`` to record which modules it loads and what they cost. When a PyInstaller
+build from build.sh is present, the frozen binary is timed as well. Results are compared
+against budgets.json so that new eager imports show up as budget violations.
+
+Run from the cli directory:
+
+    python -m tests.benchmarks.startup --runs 5 --output startup-report.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+CLI_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "budgets.json")
+
+# Subcommands are benchmarked through --help so they load and dispatch without touching the host
+COMMANDS = {
+    "help": ["--help"],
+    "version": ["version"],
+    "preflight": ["preflight", "--help"],
+    "conf-list": ["conf", "list", "--help"],
+    "proxy-status": ["proxy", "status", "--help"],
+    "service-ps": ["service", "ps", "--help"],
+}
+
+WATCHED_MODULES = ("rich", "pydantic", "requests", "yaml")
+
+
+def default_binary_path() -> str:
+    """Location of the onedir bundle produced by build.sh for this host"""
+    os_name = platform.system().lower()
+    arch = {"x86_64": "amd64", "aarch64": "arm64", "arm64": "arm64"}.get(platform.machine(), platform.machine())
+    return os.path.join(CLI_DIR, "dist", f"nixopus_{os_name}_{arch}", "nixopus")
+
+
+def python_command(argv: List[str], importtime: bool = False) -> List[str]:
+    flags = ["-X", "importtime"] if importtime else []
+    return [sys.executable, *flags, "-m", "app.main", *argv]
+
+
+def run_once(command: List[str], env: Dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run(command, cwd=CLI_DIR, env=env, capture_output=True, text=True, timeout=60)
+
+
+def time_command(command: List[str], env: Dict[str, str], runs: int) -> Dict[str, float]:
+    """Wall time in milliseconds over several runs, after one untimed run to warm the page cache"""
+    run_once(command, env)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run_once(command, env)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "min": round(min(samples), 1),
+        "median": round(statistics.median(samples), 1),
+        "max": round(max(samples), 1),
+    }
+
+
+def parse_importtime(output: str) -> Dict[str, Dict[str, float]]:
+    """Parse ``-X importtime`` stderr into module -> {self_ms, cumulative_ms, depth}"""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        if stripped in modules:
+            continue
+        modules[stripped] = {
+            "self_ms": int(fields[0]) / 1000,
+            "cumulative_ms": int(fields[1]) / 1000,
+            "depth": (len(name) - len(stripped) - 1) // 2,
+        }
+    return modules
+
+
+def summarize_imports(modules: Dict[str, Dict[str, float]], top: int = 10) -> Dict:
+    total = sum(entry["cumulative_ms"] for entry in modules.values() if entry["depth"] == 0)
+    slowest = sorted(modules.items(), key=lambda item: item[1]["cumulative_ms"], reverse=True)[:top]
+    return {
+        "import_ms": round(total, 1),
+        "module_count": len(modules),
+        "watched": {name: round(modules[name]["cumulative_ms"], 1) if name in modules else None for name in WATCHED_MODULES},
+        "loaded": sorted(modules),
+        "slowest": [[name, round(entry["cumulative_ms"], 1)] for name, entry in slowest],
+    }
+
+
+def benchmark_command(name: str, argv: List[str], env: Dict[str, str], runs: int, binary: Optional[str] = None) -> Dict:
+    result = {"argv": argv, "wall_ms": time_command(python_command(argv), env, runs)}
+    imports = run_once(python_command(argv, importtime=True), env)
+    result.update(summarize_imports(parse_importtime(imports.stderr)))
+    result["exit_code"] = imports.returncode
+    if binary:
+        frozen = {"wall_ms": time_command([binary, *argv], env, runs)}
+        # The bootloader only honours this when the bundle was not built with an isolated interpreter
+        frozen_imports = parse_importtime(run_once([binary, *argv], {**env, "PYTHONPROFILEIMPORTTIME": "1"}).stderr)
+        frozen["import_ms"] = summarize_imports(frozen_imports)["import_ms"] if frozen_imports else None
+        result["frozen"] = frozen
+    return result
+
+
+def load_budgets(path: str = BUDGETS_FILE) -> Dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def command_budget(budgets: Dict, name: str) -> Dict:
+    return {**budgets.get("defaults", {}), **budgets.get("commands", {}).get(name, {})}
+
+
+def check_budgets(report: Dict, budgets: Dict, timings: bool = True) -> List[str]:
+    """Return a message for every command that exceeds its budget.
+
+    Forbidden imports are always checked; wall and import time only when timings is set,
+    since they depend on the machine running the benchmark.
+    """
+    violations = []
+    for name, result in report["commands"].items():
+        budget = command_budget(budgets, name)
+        for module in budget.get("forbidden_imports", []):
+            if module in result.get("loaded", []):
+                violations.append(f"{name}: imports {module} at startup")
+        if not timings:
+            continue
+        if "wall_ms" in budget and result["wall_ms"]["median"] > budget["wall_ms"]:
+            violations.append(f"{name}: median wall time {result['wall_ms']['median']}ms exceeds {budget['wall_ms']}ms")
+        if "import_ms" in budget and result["import_ms"] > budget["import_ms"]:
+            violations.append(f"{name}: import time {result['import_ms']}ms exceeds {budget['import_ms']}ms")
+        frozen = result.get("frozen")
+        if frozen and "frozen_wall_ms" in budget and frozen["wall_ms"]["median"] > budget["frozen_wall_ms"]:
+            violations.append(
+                f"{name}: frozen median wall time {frozen['wall_ms']['median']}ms exceeds {budget['frozen_wall_ms']}ms"
+            )
+    return violations
+
+
+def benchmark_env(cache_dir: str) -> Dict[str, str]:
+    # A private cache dir keeps runs comparable between machines and users
+    return {**os.environ, "NIXOPUS_CACHE_DIR": cache_dir, "COLUMNS": "120"}
+
+
+def warm_caches(env: Dict[str, str]) -> None:
+    """Fill the compiled config cache so commands are measured as on a user's second start"""
+    run_once([sys.executable, "-c", "from app.utils.config import get_config; get_config().load_yaml_config()"], env)
+
+
+def run_benchmarks(names: List[str], runs: int, binary: Optional[str] = None) -> Dict:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = benchmark_env(cache_dir)
+        warm_caches(env)
+        commands = {name: benchmark_command(name, COMMANDS[name], env, runs, binary) for name in names}
+    return {
+        "python": platform.python_version(),
+        "platform": f"{platform.system().lower()}-{platform.machine()}",
+        "runs": runs,
+        "binary": binary,
+        "commands": commands,
+    }
+
+
+def print_summary(report: Dict) -> None:
+    print(f"{'command':<14}{'median ms':>11}{'import ms':>11}{'frozen ms':>11}  watched imports")
+    for name, result in report["commands"].items():
+        frozen = result.get("frozen")
+        frozen_ms = f"{frozen['wall_ms']['median']:.1f}" if frozen else "-"
+        watched = ", ".join(f"{module} {ms}" for module, ms in result["watched"].items() if ms is not None)
+        print(f"{name:<14}{result['wall_ms']['median']:>11.1f}{result['import_ms']:>11.1f}{frozen_ms:>11}  {watched}")
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark nixopus CLI startup")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per command")
+    parser.add_argument("--command", action="append", choices=sorted(COMMANDS), help="Limit to these commands")
+    parser.add_argument("--binary", help="PyInstaller binary to time (default: build.sh output if present)")
+    parser.add_argument("--no-binary", action="store_true", help="Skip the frozen binary")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--budgets", default=BUDGETS_FILE, help="Budgets file to compare against")
+    options = parser.parse_args(args)
+
+    binary = None
+    if not options.no_binary:
+        binary = options.binary or default_binary_path()
+        if not os.access(binary, os.X_OK):
+            if options.binary:
+                parser.error(f"binary not found: {binary}")
+            binary = None
+
+    report = run_benchmarks(options.command or list(COMMANDS), options.runs, binary)
+    report["violations"] = check_budgets(report, load_budgets(options.budgets))
+
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print_summary(report)
+    for violation in report["violations"]:
+        print(f"BUDGET EXCEEDED: {violation}", file=sys.stderr)
+    return 1 if report["violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
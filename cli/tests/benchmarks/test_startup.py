@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from tests.benchmarks.startup import (
+    COMMANDS,
+    benchmark_env,
+    check_budgets,
+    command_budget,
+    load_budgets,
+    parse_importtime,
+    python_command,
+    run_benchmarks,
+    run_once,
+    summarize_imports,
+    warm_caches,
+)
+
+IMPORTTIME_SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:      1000 |       1000 |     rich.text
+import time:      2000 |       3000 |   rich
+import time:       500 |       3500 | typer
+"""
+
+
+class TestParseImporttime(unittest.TestCase):
+    def test_parses_modules_and_depth(self):
+        modules = parse_importtime(IMPORTTIME_SAMPLE)
+        self.assertEqual(set(modules), {"_io", "io", "rich.text", "rich", "typer"})
+        self.assertEqual(modules["typer"], {"self_ms": 0.5, "cumulative_ms": 3.5, "depth": 0})
+        self.assertEqual(modules["rich"]["depth"], 1)
+        self.assertEqual(modules["rich.text"]["depth"], 2)
+
+    def test_summary_totals_top_level_imports(self):
+        summary = summarize_imports(parse_importtime(IMPORTTIME_SAMPLE), top=2)
+        self.assertEqual(summary["import_ms"], 3.9)
+        self.assertEqual(summary["watched"]["rich"], 3.0)
+        self.assertIsNone(summary["watched"]["yaml"])
+        self.assertEqual(summary["slowest"], [["typer", 3.5], ["rich", 3.0]])
+
+    def test_ignores_unrelated_output(self):
+        self.assertEqual(parse_importtime("Usage: nixopus\nimport time: bad | line\n"), {})
+
+
+class TestCheckBudgets(unittest.TestCase):
+    def setUp(self):
+        self.budgets = {
+            "defaults": {"wall_ms": 100, "import_ms": 50, "frozen_wall_ms": 200},
+            "commands": {"version": {"forbidden_imports": ["yaml"]}},
+        }
+        self.result = {
+            "wall_ms": {"min": 80, "median": 90, "max": 120},
+            "import_ms": 40,
+            "loaded": ["typer"],
+            "frozen": {"wall_ms": {"min": 150, "median": 160, "max": 170}},
+        }
+
+    def test_within_budget(self):
+        self.assertEqual(check_budgets({"commands": {"version": self.result}}, self.budgets), [])
+
+    def test_reports_every_exceeded_budget(self):
+        self.result.update(
+            wall_ms={"min": 100, "median": 150, "max": 200},
+            import_ms=60,
+            loaded=["typer", "yaml"],
+            frozen={"wall_ms": {"min": 250, "median": 260, "max": 270}},
+        )
+        violations = check_budgets({"commands": {"version": self.result}}, self.budgets)
+        self.assertEqual(len(violations), 4)
+        self.assertIn("version: imports yaml at startup", violations)
+
+    def test_timings_optional(self):
+        self.result.update(wall_ms={"min": 100, "median": 150, "max": 200}, loaded=["yaml"])
+        violations = check_budgets({"commands": {"version": self.result}}, self.budgets, timings=False)
+        self.assertEqual(violations, ["version: imports yaml at startup"])
+
+    def test_command_budget_overrides_defaults(self):
+        budget = command_budget(self.budgets, "version")
+        self.assertEqual(budget["wall_ms"], 100)
+        self.assertEqual(budget["forbidden_imports"], ["yaml"])
+
+
+class TestStartupImports(unittest.TestCase):
+    """Fails when a command starts importing a module its budget forbids"""
+
+    def test_budgets_cover_every_command(self):
+        self.assertEqual(set(load_budgets()["commands"]), set(COMMANDS))
+
+    def test_no_forbidden_imports(self):
+        budgets = load_budgets()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = benchmark_env(cache_dir)
+            warm_caches(env)
+            for name, argv in COMMANDS.items():
+                with self.subTest(command=name):
+                    completed = run_once(python_command(argv, importtime=True), env)
+                    self.assertEqual(completed.returncode, 0, completed.stdout)
+                    loaded = parse_importtime(completed.stderr)
+                    forbidden = [m for m in command_budget(budgets, name).get("forbidden_imports", []) if m in loaded]
+                    self.assertEqual(forbidden, [])
+
+
+@unittest.skipUnless(os.environ.get("NIXOPUS_BENCHMARK"), "set NIXOPUS_BENCHMARK=1 to check startup time budgets")
+class TestStartupTimeBudgets(unittest.TestCase):
+    def test_within_time_budgets(self):
+        report = run_benchmarks(list(COMMANDS), runs=3)
+        self.assertEqual(check_budgets(report, load_budgets()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,7 @@ from app.commands.clone.clone import (
     CloneService,
     GitClone,
     GitCommandBuilder,
+    get_mirror_path,
 )
 from app.commands.clone.messages import (
     successfully_cloned,
@@ -38,6 +39,34 @@ class TestGitCommandBuilder:
         cmd = GitCommandBuilder.build_clone_command("https://github.com/user/repo", "/path/to/clone", "")
         assert cmd == ["git", "clone", "https://github.com/user/repo", "/path/to/clone"]
 
+    def test_build_clone_command_sparse(self):
+        cmd = GitCommandBuilder.build_clone_command(
+            "https://github.com/user/repo", "/path/to/clone", "main", sparse_paths=["helpers"]
+        )
+        assert "--filter=blob:none" in cmd
+        assert "--sparse" in cmd
+        assert cmd[-2:] == ["https://github.com/user/repo", "/path/to/clone"]
+
+    def test_build_sparse_checkout_command(self):
+        cmd = GitCommandBuilder.build_sparse_checkout_command("/path/to/clone", ["helpers", "api/migrations"])
+        assert cmd == ["git", "-C", "/path/to/clone", "sparse-checkout", "set", "helpers", "api/migrations"]
+
+    def test_build_clone_command_from_mirror(self):
+        cmd = GitCommandBuilder.build_clone_command(
+            "https://github.com/user/repo", "/path/to/clone", "main", source="file:///cache/repo.git"
+        )
+        assert cmd[-2:] == ["file:///cache/repo.git", "/path/to/clone"]
+
+    def test_build_update_commands(self):
+        commands = GitCommandBuilder.build_update_commands("/path/to/clone", "main")
+        assert commands[0] == ["git", "-C", "/path/to/clone", "fetch", "--depth=1", "origin", "main"]
+        assert commands[1] == ["git", "-C", "/path/to/clone", "reset", "--hard", "FETCH_HEAD"]
+        assert commands[2] == ["git", "-C", "/path/to/clone", "sparse-checkout", "disable"]
+
+    def test_build_update_commands_sparse(self):
+        commands = GitCommandBuilder.build_update_commands("/path/to/clone", "main", ["helpers", "api/migrations"])
+        assert commands[2] == ["git", "-C", "/path/to/clone", "sparse-checkout", "set", "helpers", "api/migrations"]
+
 
 class TestCloneFormatter:
     def setup_method(self):
@@ -175,6 +204,111 @@ class TestGitClone:
         assert success is False
         assert error == "Unexpected error"
 
+    @patch("subprocess.run")
+    def test_clone_repository_sparse(self, mock_run):
+        mock_run.return_value = Mock(returncode=0)
+
+        success, error = self.git_clone.clone_repository(
+            "https://github.com/user/repo", "/path/to/clone", "main", sparse_paths=["helpers"]
+        )
+
+        assert success is True
+        commands = [call[0][0] for call in mock_run.call_args_list]
+        assert commands[0][:2] == ["git", "clone"]
+        assert commands[1] == ["git", "-C", "/path/to/clone", "sparse-checkout", "set", "helpers"]
+
+    @patch("subprocess.run")
+    def test_update_repository(self, mock_run):
+        mock_run.return_value = Mock(returncode=0, stdout="https://github.com/user/repo\n")
+
+        success, error = self.git_clone.update_repository("https://github.com/user/repo", "/path/to/clone", "main")
+
+        assert success is True
+        assert error is None
+        commands = [call[0][0] for call in mock_run.call_args_list]
+        assert commands[1:] == GitCommandBuilder.build_update_commands("/path/to/clone", "main")
+
+    @patch("subprocess.run")
+    def test_update_repository_different_origin(self, mock_run):
+        mock_run.return_value = Mock(returncode=0, stdout="https://github.com/other/repo\n")
+
+        success, error = self.git_clone.update_repository("https://github.com/user/repo", "/path/to/clone", "main")
+
+        assert success is False
+        assert "https://github.com/other/repo" in error
+        mock_run.assert_called_once()
+
+
+    @patch("subprocess.run")
+    def test_clone_repository_from_mirror_keeps_remote_origin(self, mock_run):
+        mock_run.return_value = Mock(returncode=0)
+
+        success, error = self.git_clone.clone_repository(
+            "https://github.com/user/repo", "/path/to/clone", "main", mirror_path="/cache/repo.git"
+        )
+
+        assert success is True
+        commands = [call[0][0] for call in mock_run.call_args_list]
+        assert "file:///cache/repo.git" in commands[0]
+        assert commands[-1] == ["git", "-C", "/path/to/clone", "remote", "set-url", "origin", "https://github.com/user/repo"]
+
+    @patch("subprocess.run")
+    @patch("os.path.isdir", return_value=True)
+    def test_sync_mirror_fetches_existing_mirror(self, mock_isdir, mock_run):
+        success, error = self.git_clone.sync_mirror("https://github.com/user/repo", "/cache/repo.git")
+
+        assert success is True
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0] == GitCommandBuilder.build_mirror_fetch_command("/cache/repo.git")
+
+    @patch("shutil.rmtree")
+    @patch("subprocess.run")
+    def test_sync_mirror_removes_partial_mirror_on_failure(self, mock_run, mock_rmtree, tmp_path):
+        mock_run.side_effect = subprocess.CalledProcessError(128, "git clone", stderr="network unreachable")
+        mirror_path = str(tmp_path / "mirrors" / "repo.git")
+
+        success, error = self.git_clone.sync_mirror("https://github.com/user/repo", mirror_path)
+
+        assert success is False
+        assert error == "network unreachable"
+        mock_rmtree.assert_called_once_with(mirror_path, ignore_errors=True)
+
+    def test_update_repository_applies_new_sparse_paths(self, tmp_path):
+        source = tmp_path / "source"
+        for directory in ("helpers", "api", "view"):
+            (source / directory).mkdir(parents=True)
+            (source / directory / "README").write_text(directory)
+
+        def git(*args, cwd=source):
+            subprocess.run(["git", "-C", str(cwd), "-c", "user.name=t", "-c", "user.email=t@t", *args], check=True, capture_output=True)
+
+        git("init", "-b", "main")
+        git("config", "uploadpack.allowFilter", "true")
+        git("add", ".")
+        git("commit", "-m", "initial")
+        repo, path = f"file://{source}", tmp_path / "checkout"
+
+        assert self.git_clone.clone_repository(repo, str(path), "main", sparse_paths=["helpers"]) == (True, None)
+        assert (path / "helpers").exists() and not (path / "api").exists()
+
+        assert self.git_clone.update_repository(repo, str(path), "main", sparse_paths=["api"]) == (True, None)
+        assert (path / "api" / "README").read_text() == "api"
+        assert not (path / "helpers").exists()
+
+        assert self.git_clone.update_repository(repo, str(path), "main") == (True, None)
+        assert {"helpers", "api", "view"} <= {entry.name for entry in path.iterdir()}
+
+
+class TestGetMirrorPath:
+    def test_mirror_path_is_per_repository(self):
+        first = get_mirror_path("https://github.com/user/repo", "/cache")
+        assert first.startswith("/cache/") and first.endswith(".git")
+        assert first != get_mirror_path("https://github.com/user/other", "/cache")
+
+    def test_mirror_path_defaults_to_cache_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("NIXOPUS_CACHE_DIR", str(tmp_path))
+        assert get_mirror_path("https://github.com/user/repo").startswith(str(tmp_path / "git-mirrors"))
+
 
 class TestCloneConfig:
     def test_valid_config(self):
@@ -352,6 +486,79 @@ class TestCloneService:
         assert result.success is True
         self.cloner.clone_repository.assert_called_once_with(self.config.repo, self.config.path, self.config.branch)
 
+    def test_clone_sparse(self):
+        self.config.sparse_paths = ["helpers"]
+        self.cloner.clone_repository.return_value = (True, None)
+
+        self.service.clone()
+
+        self.cloner.clone_repository.assert_called_once_with(
+            self.config.repo, self.config.path, self.config.branch, sparse_paths=["helpers"]
+        )
+
+    @patch("app.commands.clone.clone.is_git_checkout", return_value=True)
+    def test_clone_force_updates_existing_checkout(self, mock_checkout):
+        self.config.force = True
+        self.cloner.update_repository.return_value = (True, None)
+        self.service.dir_manager.remove_directory = Mock()
+
+        result = self.service.clone()
+
+        assert result.success is True
+        self.cloner.update_repository.assert_called_once_with(
+            self.config.repo, self.config.path, self.config.branch, sparse_paths=None
+        )
+        self.cloner.clone_repository.assert_not_called()
+        self.service.dir_manager.remove_directory.assert_not_called()
+
+    @patch("os.path.exists", return_value=True)
+    @patch("app.commands.clone.clone.is_git_checkout", return_value=True)
+    def test_clone_force_falls_back_to_fresh_clone(self, mock_checkout, mock_exists):
+        self.config.force = True
+        self.cloner.update_repository.return_value = (False, "fetch failed")
+        self.cloner.clone_repository.return_value = (True, None)
+        self.service.dir_manager.remove_directory = Mock(return_value=True)
+
+        result = self.service.clone()
+
+        assert result.success is True
+        self.service.dir_manager.remove_directory.assert_called_once_with(self.config.path, self.logger)
+        self.cloner.clone_repository.assert_called_once()
+
+    def test_clone_mirror_only(self):
+        self.config.mirror_only = True
+        self.cloner.sync_mirror.return_value = (True, None)
+
+        result = self.service.clone()
+
+        assert result.success is True
+        assert result.mirror == get_mirror_path(self.config.repo)
+        self.cloner.clone_repository.assert_not_called()
+
+    @patch("os.path.isdir", return_value=True)
+    def test_clone_uses_existing_mirror(self, mock_isdir):
+        self.cloner.sync_mirror.return_value = (False, "network unreachable")
+        self.cloner.clone_repository.return_value = (True, None)
+
+        result = self.service.clone()
+
+        assert result.success is True
+        assert result.mirror == get_mirror_path(self.config.repo)
+        self.cloner.clone_repository.assert_called_once_with(
+            self.config.repo, self.config.path, self.config.branch, sparse_paths=None, mirror_path=result.mirror
+        )
+
+    @patch("os.path.isdir", return_value=True)
+    def test_clone_falls_back_to_remote_when_mirror_clone_fails(self, mock_isdir):
+        self.cloner.sync_mirror.return_value = (True, None)
+        self.cloner.clone_repository.side_effect = [(False, "corrupt mirror"), (True, None)]
+
+        result = self.service.clone()
+
+        assert result.success is True
+        assert result.mirror is None
+        self.cloner.clone_repository.assert_called_with(self.config.repo, self.config.path, self.config.branch)
+
     def test_clone_failure(self):
         self.cloner.clone_repository.return_value = (False, "Test error")
 
@@ -155,5 +155,72 @@ class TestVersionChecker(unittest.TestCase):
             mock_run.assert_called_with(["ssh", "-V"], capture_output=True, text=True, timeout=5)
 
 
+class TestVersionProbeReuse(unittest.TestCase):
+    """Version commands are run once per checker and not at all while the binary is unchanged"""
+
+    def setUp(self):
+        self.logger = Logger(verbose=False)
+        self.deps_config = {
+            "python3": {"version-command": ["python3", "--version"]},
+            "python3-venv": {"version-command": ["python3", "--version"]},
+        }
+
+    def version_result(self, stdout="Python 3.11.7"):
+        result = Mock()
+        result.returncode = 0
+        result.stdout = stdout
+        return result
+
+    @patch("subprocess.run")
+    def test_identical_commands_are_probed_once(self, mock_run):
+        mock_run.return_value = self.version_result()
+        checker = ToolVersionChecker(self.logger, self.deps_config, timeout=5)
+
+        results = [checker.check_tool_version(tool, ">=3.8") for tool in ("python3", "python3-venv")]
+
+        self.assertEqual([r.current for r in results], ["3.11.7", "3.11.7"])
+        mock_run.assert_called_once()
+
+    @patch("subprocess.run")
+    def test_unchanged_binary_reuses_cached_output(self, mock_run):
+        mock_run.return_value = self.version_result()
+        ToolVersionChecker(self.logger, self.deps_config, timeout=5).get_tool_version("python3")
+
+        version = ToolVersionChecker(self.logger, self.deps_config, timeout=5).get_tool_version("python3")
+
+        self.assertEqual(version, "3.11.7")
+        mock_run.assert_called_once()
+
+    @patch("subprocess.run")
+    def test_no_cache_probes_again(self, mock_run):
+        mock_run.return_value = self.version_result()
+        ToolVersionChecker(self.logger, self.deps_config, timeout=5).get_tool_version("python3")
+
+        ToolVersionChecker(self.logger, self.deps_config, timeout=5, use_cache=False).get_tool_version("python3")
+
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("subprocess.run")
+    def test_replaced_binary_is_probed_again(self, mock_run):
+        mock_run.side_effect = [self.version_result("Python 3.11.7"), self.version_result("Python 3.12.1")]
+        ToolVersionChecker(self.logger, self.deps_config, timeout=5).get_tool_version("python3")
+
+        with patch("app.utils.tool_versions.binary_signature", return_value=["/usr/bin/python3", 1, 2, 3]):
+            version = ToolVersionChecker(self.logger, self.deps_config, timeout=5).get_tool_version("python3")
+
+        self.assertEqual(version, "3.12.1")
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("subprocess.run")
+    def test_failures_are_not_cached(self, mock_run):
+        failed = Mock(returncode=1, stdout="")
+        mock_run.side_effect = [failed, failed, self.version_result()]
+        ToolVersionChecker(self.logger, self.deps_config, timeout=5).get_tool_version("python3")
+
+        version = ToolVersionChecker(self.logger, self.deps_config, timeout=5).get_tool_version("python3")
+
+        self.assertEqual(version, "3.11.7")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,213 @@
+import os
+import shutil
+import signal
+import socket
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import click
+from pydantic import ValidationError
+
+from app.commands.daemon.client import (
+    SOCKET_PATH_ENV,
+    check_socket_dir,
+    encode_message,
+    get_socket_path,
+    read_message,
+    run_command,
+    send_control,
+    socket_dirs,
+)
+from app.commands.daemon.daemon import DaemonConfig, DaemonServer, DaemonService
+
+
+@click.command()
+@click.argument("action")
+def fake_cli(action):
+    if action == "sleep":
+        time.sleep(10)
+    click.echo(f"{os.getcwd()}|{os.environ.get('NIXOPUS_DAEMON_TEST')}")
+    click.echo("to stderr", err=True)
+    sys.exit(3)
+
+
+class TestClientHelpers(unittest.TestCase):
+    def test_socket_path_override(self):
+        with patch.dict(os.environ, {SOCKET_PATH_ENV: "/tmp/custom.sock"}):
+            self.assertEqual(get_socket_path(), "/tmp/custom.sock")
+
+    def test_socket_path_runtime_dir(self):
+        with patch.dict(os.environ, {SOCKET_PATH_ENV: "", "XDG_RUNTIME_DIR": "/run/user/1000"}):
+            self.assertEqual(get_socket_path(), "/run/user/1000/nixopus/daemon.sock")
+
+    def test_message_roundtrip(self):
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall(encode_message({"argv": ["conf", "list"]}))
+            self.assertEqual(read_message(right), {"argv": ["conf", "list"]})
+
+    def test_read_message_closed(self):
+        left, right = socket.socketpair()
+        left.close()
+        with right:
+            with self.assertRaises(ConnectionError):
+                read_message(right)
+
+    def test_socket_dirs_below_tmp_are_checked_up_to_tmp(self):
+        with patch.dict(os.environ, {SOCKET_PATH_ENV: "", "XDG_RUNTIME_DIR": ""}):
+            socket_path = get_socket_path()
+
+        self.assertEqual(socket_dirs(socket_path), [f"/tmp/nixopus-{os.getuid()}", f"/tmp/nixopus-{os.getuid()}/nixopus"])
+        self.assertEqual(socket_dirs("/run/user/1000/nixopus/daemon.sock"), ["/run/user/1000/nixopus"])
+
+    def test_socket_dir_open_to_others_is_refused(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, temp_dir)
+        os.chmod(temp_dir, 0o755)
+
+        with self.assertRaises(PermissionError):
+            check_socket_dir(os.path.join(temp_dir, "daemon.sock"))
+
+    def test_parent_below_tmp_open_to_others_is_refused(self):
+        temp_dir = tempfile.mkdtemp(dir="/tmp")
+        os.mkdir(os.path.join(temp_dir, "nixopus"), 0o700)
+        self.addCleanup(shutil.rmtree, temp_dir)
+        os.chmod(temp_dir, 0o755)
+
+        with self.assertRaises(PermissionError):
+            check_socket_dir(os.path.join(temp_dir, "nixopus", "daemon.sock"))
+
+    def test_missing_socket_dirs_are_created_private(self):
+        temp_dir = tempfile.mkdtemp(dir="/tmp")
+        self.addCleanup(shutil.rmtree, temp_dir)
+        socket_path = os.path.join(temp_dir, "nixopus-0", "nixopus", "daemon.sock")
+
+        check_socket_dir(socket_path, create=True)
+
+        for directory in (os.path.join(temp_dir, "nixopus-0"), os.path.dirname(socket_path)):
+            self.assertEqual(stat.S_IMODE(os.stat(directory).st_mode), 0o700)
+
+    def test_run_command_without_daemon(self):
+        with self.assertRaises(OSError):
+            run_command(["version"], os.path.join(tempfile.mkdtemp(), "missing.sock"))
+
+
+class TestDaemonConfig(unittest.TestCase):
+    def test_default_socket_path(self):
+        with patch.dict(os.environ, {SOCKET_PATH_ENV: "/tmp/nixopus-test.sock"}):
+            self.assertEqual(DaemonConfig().socket_path, "/tmp/nixopus-test.sock")
+
+    def test_empty_socket_path(self):
+        with self.assertRaises(ValidationError):
+            DaemonConfig(socket_path="  ")
+
+
+class TestDaemonService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.temp_dir, "run", "daemon.sock")
+        self.config = DaemonConfig(socket_path=self.socket_path)
+        self.service = DaemonService(self.config, logger=Mock())
+        self.service._prepare_socket()
+        self.reaped = False
+        self.pid = os.fork()
+        if self.pid == 0:
+            try:
+                self.service.serve(DaemonServer(self.socket_path, fake_cli))
+            finally:
+                os._exit(0)
+        deadline = time.monotonic() + 10
+        while not os.path.exists(self.socket_path) and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+    def tearDown(self):
+        if not self.reaped:
+            os.kill(self.pid, signal.SIGKILL)
+            os.waitpid(self.pid, 0)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, argv):
+        out_r, out_w = os.pipe()
+        err_r, err_w = os.pipe()
+        with open(os.devnull) as stdin:
+            exit_code = run_command(argv, self.socket_path, fds=(stdin.fileno(), out_w, err_w))
+        os.close(out_w)
+        os.close(err_w)
+        with os.fdopen(out_r) as out, os.fdopen(err_r) as err:
+            return exit_code, out.read(), err.read()
+
+    def test_status(self):
+        result = self.service.status()
+        self.assertTrue(result.running)
+        self.assertEqual(result.pid, self.pid)
+
+    def test_runs_command_with_client_stdio_cwd_and_env(self):
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        try:
+            with patch.dict(os.environ, {"NIXOPUS_DAEMON_TEST": "from-client"}):
+                exit_code, out, err = self._run(["echo"])
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(exit_code, 3)
+        self.assertEqual(out, f"{os.path.realpath(self.temp_dir)}|from-client\n")
+        self.assertEqual(err, "to stderr\n")
+
+    def test_usage_error_exit_code(self):
+        exit_code, _, err = self._run([])
+        self.assertEqual(exit_code, 2)
+        self.assertIn("Missing argument", err)
+
+    def test_forwards_signals(self):
+        with open(os.devnull, "w") as devnull:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.socket_path)
+            with sock:
+                fd = devnull.fileno()
+                socket.send_fds(sock, [encode_message({"argv": ["sleep"], "cwd": "/", "env": {}})], [fd, fd, fd])
+                time.sleep(0.3)
+                started = time.monotonic()
+                sock.sendall(encode_message({"signal": signal.SIGINT}))
+                sock.settimeout(5)
+                # click reports an interrupted command as "Aborted!" with exit code 1
+                self.assertEqual(read_message(sock), {"exit_code": 1})
+                self.assertLess(time.monotonic() - started, 5)
+
+    def test_stop(self):
+        result = self.service.stop()
+        self.assertIsNone(result.error)
+        self.assertFalse(result.running)
+        os.waitpid(self.pid, 0)
+        self.reaped = True
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertFalse(self.service.status().running)
+
+    def test_start_refuses_when_running(self):
+        with self.assertRaises(RuntimeError):
+            self.service._prepare_socket()
+
+    def test_client_refuses_a_daemon_of_another_user(self):
+        with patch("app.commands.daemon.client.peer_uid", return_value=os.getuid() + 4242):
+            with patch("socket.send_fds") as mock_send_fds:
+                with self.assertRaises(PermissionError):
+                    run_command(["echo"], self.socket_path)
+
+        mock_send_fds.assert_not_called()
+
+    def test_start_refuses_a_socket_dir_open_to_others(self):
+        os.chmod(os.path.dirname(self.socket_path), 0o755)
+
+        with self.assertRaises(RuntimeError):
+            DaemonService(self.config, logger=Mock())._prepare_socket()
+
+    def test_send_control_unknown_socket(self):
+        with self.assertRaises(OSError):
+            send_control("ping", os.path.join(self.temp_dir, "other.sock"))
+
+
+if __name__ == "__main__":
+    unittest.main()
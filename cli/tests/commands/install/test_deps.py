@@ -0,0 +1,233 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from app.commands.install.deps import (
+    PackageManagerBackend,
+    get_package_manager_backend,
+    install_all_deps,
+    install_packages,
+    run_install_command,
+    update_system_packages,
+)
+
+
+def make_dep(name, package=None, command=None, install_command=""):
+    return {
+        "name": name,
+        "package": package or name,
+        "command": command if command is not None else name,
+        "install_command": install_command,
+    }
+
+
+class TestPackageManagerBackend(unittest.TestCase):
+    def test_install_command_batches_packages(self):
+        backend = get_package_manager_backend("apt")
+        self.assertEqual(backend.install_command(["git", "curl"]), ["sudo", "apt-get", "install", "-y", "git", "curl"])
+
+    def test_unsupported_package_manager(self):
+        with self.assertRaises(Exception) as context:
+            get_package_manager_backend("zypper")
+        self.assertIn("zypper", str(context.exception))
+
+    def test_update_only_refreshes_metadata(self):
+        self.assertEqual(get_package_manager_backend("dnf").update_command(), ["sudo", "dnf", "makecache"])
+        self.assertEqual(get_package_manager_backend("yum").update_command(), ["sudo", "yum", "makecache"])
+
+
+class TestPackageIndexFreshness(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = os.path.join(self.temp_dir, "lists")
+        os.mkdir(self.index)
+        self.backend = PackageManagerBackend("apt", ["install"], ["refresh"], [os.path.join(self.temp_dir, "missing"), self.index])
+        self.logger = Mock()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def age_index(self, seconds):
+        old = time.time() - seconds
+        os.utime(self.index, (old, old))
+
+    def test_index_age(self):
+        self.age_index(100)
+        self.assertAlmostEqual(self.backend.index_age(), 100, delta=5)
+        self.assertIsNone(PackageManagerBackend("apt", [], [], ["/nonexistent"]).index_age())
+
+    @patch("subprocess.check_call")
+    def test_fresh_index_is_not_refreshed(self, mock_check_call):
+        self.age_index(100)
+        with patch.dict("app.commands.install.deps.PACKAGE_MANAGER_BACKENDS", {"apt": self.backend}):
+            self.assertFalse(update_system_packages("apt", self.logger, max_age=3600))
+        mock_check_call.assert_not_called()
+
+    @patch("subprocess.check_call")
+    def test_stale_index_is_refreshed(self, mock_check_call):
+        self.age_index(7200)
+        with patch.dict("app.commands.install.deps.PACKAGE_MANAGER_BACKENDS", {"apt": self.backend}):
+            self.assertTrue(update_system_packages("apt", self.logger, max_age=3600))
+        mock_check_call.assert_called_once_with(["refresh"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def test_index_is_judged_by_its_files(self):
+        backend = PackageManagerBackend(
+            "apt", [], [], [os.path.join(self.index, "*_Packages")], index_files=os.path.join(self.index, "*_Packages")
+        )
+        packages = os.path.join(self.index, "deb.debian.org_debian_dists_bookworm_main_binary-amd64_Packages")
+        open(packages, "w").close()
+        old = time.time() - 100
+        os.utime(packages, (old, old))
+
+        self.assertAlmostEqual(backend.index_age(), 100, delta=5)
+
+    @patch("subprocess.check_call")
+    def test_emptied_index_is_refreshed(self, mock_check_call):
+        # `rm -rf /var/lib/apt/lists/*` leaves a just-modified, empty lists directory
+        backend = PackageManagerBackend(
+            "apt", ["install"], ["refresh"], [self.index], index_files=os.path.join(self.index, "*_Packages")
+        )
+
+        with patch.dict("app.commands.install.deps.PACKAGE_MANAGER_BACKENDS", {"apt": backend}):
+            self.assertTrue(update_system_packages("apt", self.logger, max_age=3600))
+        mock_check_call.assert_called_once()
+
+
+class TestInstallPackages(unittest.TestCase):
+    def setUp(self):
+        self.logger = Mock()
+
+    @patch("subprocess.check_call")
+    def test_single_transaction(self, mock_check_call):
+        deps = [make_dep("git"), make_dep("curl"), make_dep("openssh-client")]
+
+        result = install_packages(deps, "dnf", self.logger)
+
+        self.assertEqual(result, {"git": True, "curl": True, "openssh-client": True})
+        mock_check_call.assert_called_once()
+        self.assertEqual(
+            mock_check_call.call_args[0][0], ["sudo", "dnf", "install", "-y", "git", "curl", "openssh-client"]
+        )
+
+    @patch("subprocess.check_call")
+    def test_failed_batch_is_retried_per_package(self, mock_check_call):
+        def check_call(cmd, **kwargs):
+            if "broken" in cmd:
+                raise subprocess.CalledProcessError(100, cmd)
+            return 0
+
+        mock_check_call.side_effect = check_call
+        deps = [make_dep("git"), make_dep("broken")]
+
+        result = install_packages(deps, "apt", self.logger, index_refreshed=True)
+
+        self.assertEqual(result, {"git": True, "broken": False})
+        self.assertEqual(mock_check_call.call_count, 3)
+
+    @patch("subprocess.check_call")
+    def test_failed_batch_is_retried_after_an_index_refresh(self, mock_check_call):
+        refreshed = []
+
+        def check_call(cmd, **kwargs):
+            if cmd == ["sudo", "apt-get", "update"]:
+                refreshed.append(cmd)
+            elif not refreshed:
+                raise subprocess.CalledProcessError(100, cmd)
+            return 0
+
+        mock_check_call.side_effect = check_call
+
+        result = install_packages([make_dep("git"), make_dep("curl")], "apt", self.logger)
+
+        self.assertEqual(result, {"git": True, "curl": True})
+        self.assertEqual(
+            [call[0][0] for call in mock_check_call.call_args_list],
+            [
+                ["sudo", "apt-get", "install", "-y", "git", "curl"],
+                ["sudo", "apt-get", "update"],
+                ["sudo", "apt-get", "install", "-y", "git", "curl"],
+            ],
+        )
+
+    @patch("subprocess.check_call")
+    def test_nothing_to_install(self, mock_check_call):
+        self.assertEqual(install_packages([], "apt", self.logger), {})
+        mock_check_call.assert_not_called()
+
+    @patch("subprocess.check_call")
+    def test_dry_run(self, mock_check_call):
+        result = install_packages([make_dep("git")], "apk", self.logger, dry_run=True)
+
+        self.assertEqual(result, {"git": True})
+        mock_check_call.assert_not_called()
+        self.logger.info.assert_any_call("[DRY RUN] Would run: sudo apk add git")
+
+    @patch("subprocess.check_call", side_effect=subprocess.CalledProcessError(1, "sh"))
+    def test_install_command_failure(self, mock_check_call):
+        dep = make_dep("docker.io", command="docker", install_command="sh get-docker.sh")
+        self.assertFalse(run_install_command(dep, self.logger))
+        mock_check_call.assert_called_once_with("sh get-docker.sh", shell=True)
+
+
+class TestInstallAllDeps(unittest.TestCase):
+    @patch("app.commands.install.deps.update_system_packages")
+    @patch("app.commands.install.deps.invalidate_host_facts")
+    @patch("app.commands.install.deps.get_host_facts", return_value=Mock(os_name="linux", package_manager="apt"))
+    @patch("app.commands.install.deps.get_deps_from_config")
+    @patch("subprocess.check_call")
+    @patch("app.utils.path_index.PathIndex.which")
+    def test_scripts_run_separately_from_batch(self, mock_which, mock_check_call, mock_deps, mock_facts, mock_invalidate, mock_update):
+        mock_deps.return_value = [
+            make_dep("git"),
+            make_dep("curl"),
+            make_dep("docker.io", command="docker", install_command="sh get-docker.sh"),
+            make_dep("python3"),
+        ]
+        available = {"python3"}
+        mock_which.side_effect = lambda command: f"/usr/bin/{command}" if command in available else None
+
+        def check_call(cmd, **kwargs):
+            available.update(["git", "curl"] if isinstance(cmd, list) else ["docker"])
+            return 0
+
+        mock_check_call.side_effect = check_call
+
+        result = json.loads(install_all_deps(output="json"))
+
+        calls = [call[0][0] for call in mock_check_call.call_args_list]
+        self.assertEqual(calls, [["sudo", "apt-get", "install", "-y", "git", "curl"], "sh get-docker.sh"])
+        self.assertEqual(
+            sorted(result["installed"], key=lambda item: item["dependency"]),
+            [
+                {"dependency": "curl", "installed": True},
+                {"dependency": "docker.io", "installed": True},
+                {"dependency": "git", "installed": True},
+            ],
+        )
+        self.assertEqual(result["failed"], [])
+        mock_update.assert_called_once()
+        mock_invalidate.assert_called_once()
+
+    @patch("app.commands.install.deps.update_system_packages")
+    @patch("app.commands.install.deps.invalidate_host_facts")
+    @patch("app.commands.install.deps.get_host_facts", return_value=Mock(os_name="linux", package_manager="apt"))
+    @patch("app.commands.install.deps.get_deps_from_config")
+    @patch("subprocess.check_call")
+    @patch("app.utils.path_index.PathIndex.which", return_value="/usr/bin/tool")
+    def test_nothing_missing_skips_index_refresh(self, mock_which, mock_check_call, mock_deps, mock_facts, mock_invalidate, mock_update):
+        mock_deps.return_value = [make_dep("git"), make_dep("curl")]
+
+        result = json.loads(install_all_deps(output="json"))
+
+        self.assertEqual(result["installed"], [])
+        mock_update.assert_not_called()
+        mock_check_call.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
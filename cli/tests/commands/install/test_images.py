@@ -0,0 +1,74 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from app.commands.install.images import get_images_from_config, pull_images
+from app.commands.install.run import Install
+
+
+class TestImages(unittest.TestCase):
+    def setUp(self):
+        self.logger = Mock()
+
+    def test_images_from_config(self):
+        images = get_images_from_config()
+        self.assertIn("redis:7-alpine", images)
+        self.assertEqual(len(images), len(set(images)))
+
+    @patch("subprocess.run")
+    def test_pull_images(self, mock_run):
+        mock_run.side_effect = lambda cmd, **kwargs: Mock(returncode=0 if cmd[-1] != "bad" else 1, stderr="denied")
+
+        result = pull_images(["redis", "bad"], self.logger)
+
+        self.assertEqual(result, {"redis": True, "bad": False})
+        self.logger.warning.assert_called_once()
+        pulled = sorted(call[0][0][-1] for call in mock_run.call_args_list)
+        self.assertEqual(pulled, ["bad", "redis"])
+
+    @patch("subprocess.run")
+    def test_pull_images_respects_parallelism(self, mock_run):
+        running, peak = [], []
+        lock = threading.Lock()
+
+        def run(cmd, **kwargs):
+            with lock:
+                running.append(cmd)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(cmd)
+            return Mock(returncode=0)
+
+        mock_run.side_effect = run
+
+        pull_images([f"image-{i}" for i in range(6)], self.logger, max_workers=2)
+
+        self.assertLessEqual(max(peak), 2)
+
+    @patch("subprocess.run")
+    def test_pull_images_dry_run(self, mock_run):
+        self.assertEqual(pull_images(["redis"], self.logger, dry_run=True), {"redis": True})
+        mock_run.assert_not_called()
+
+
+class TestPullSummary(unittest.TestCase):
+    def test_overlap_counts_time_other_steps_were_running(self):
+        install = Install(logger=Mock())
+        install._pull_results = {"api": True, "redis": True, "db": False}
+        install._step_times = {
+            "pull_images": [10.0, 40.0],
+            "clone": [5.0, 20.0],
+            "ssh": [15.0, 25.0],
+            "env_files": [30.0, 35.0],
+            "services": [41.0, 50.0],
+        }
+
+        summary = install._pull_summary()
+
+        self.assertEqual(summary, "Pulled 2/3 images in 30s (20s overlapped with other steps)")
+
+
+if __name__ == "__main__":
+    unittest.main()
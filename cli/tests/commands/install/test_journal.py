@@ -0,0 +1,125 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from app.commands.install.journal import JOURNAL_FILE, InstallJournal
+from app.commands.install.run import Install, get_source_revision
+from app.utils.cache import file_digest, fingerprint
+
+
+class TestInstallJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_fingerprint(self):
+        self.assertEqual(fingerprint("repo", {"b": 1, "a": 2}), fingerprint("repo", {"a": 2, "b": 1}))
+        self.assertNotEqual(fingerprint("repo", "main"), fingerprint("repo", "dev"))
+
+    def test_file_digest(self):
+        path = os.path.join(self.temp_dir, "file")
+        self.assertIsNone(file_digest(path))
+        with open(path, "w") as f:
+            f.write("content")
+        digest = file_digest(path)
+        with open(path, "w") as f:
+            f.write("changed")
+        self.assertNotEqual(file_digest(path), digest)
+
+    def test_source_revision_follows_commits_on_the_same_branch(self):
+        def git(*args):
+            subprocess.run(["git", "-C", self.temp_dir, "-c", "user.name=t", "-c", "user.email=t@t", *args], check=True, capture_output=True)
+
+        self.assertIsNone(get_source_revision(self.temp_dir))
+        git("init", "-q")
+        git("commit", "-q", "--allow-empty", "-m", "first")
+        first = get_source_revision(self.temp_dir)
+        git("commit", "-q", "--allow-empty", "-m", "second")
+
+        self.assertIsNotNone(first)
+        self.assertNotEqual(get_source_revision(self.temp_dir), first)
+
+    def test_record_persists(self):
+        InstallJournal(self.temp_dir).record("clone", "abc")
+
+        journal = InstallJournal(self.temp_dir)
+        self.assertTrue(journal.is_done("clone", "abc"))
+        self.assertFalse(journal.is_done("clone", "def"))
+        self.assertFalse(journal.is_done("ssh", "abc"))
+
+    def test_reset(self):
+        journal = InstallJournal(self.temp_dir)
+        journal.record("clone", "abc")
+        journal.reset()
+
+        self.assertFalse(journal.is_done("clone", "abc"))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, JOURNAL_FILE)))
+        journal.reset()
+
+    def test_corrupt_journal_is_ignored(self):
+        with open(os.path.join(self.temp_dir, JOURNAL_FILE), "w") as f:
+            f.write("{")
+        self.assertFalse(InstallJournal(self.temp_dir).is_done("clone", "abc"))
+
+
+class TestInstallResume(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.fingerprints = {"clone": "clone-v1", "env_files": "env-v1"}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_install(self, resume):
+        install = Install(logger=Mock(), resume=resume)
+        install._journal = InstallJournal(self.temp_dir)
+        install._step_fingerprint = lambda name: self.fingerprints[name]
+        return install
+
+    def test_completed_step_is_skipped_on_resume(self):
+        clone = Mock()
+        self.make_install(resume=False)._journaled("clone", clone, [])()
+
+        self.make_install(resume=True)._journaled("clone", clone, [])()
+        clone.assert_called_once()
+
+    def test_changed_inputs_rerun_step(self):
+        clone = Mock()
+        self.make_install(resume=False)._journaled("clone", clone, [])()
+
+        self.fingerprints["clone"] = "clone-v2"
+        self.make_install(resume=True)._journaled("clone", clone, [])()
+        self.assertEqual(clone.call_count, 2)
+
+    def test_step_reruns_when_dependency_ran(self):
+        clone, env_files = Mock(), Mock()
+        first = self.make_install(resume=False)
+        first._journaled("clone", clone, [])()
+        first._journaled("env_files", env_files, ["clone"])()
+
+        self.fingerprints["clone"] = "clone-v2"
+        second = self.make_install(resume=True)
+        second._journaled("clone", clone, [])()
+        second._journaled("env_files", env_files, ["clone"])()
+        self.assertEqual(env_files.call_count, 2)
+
+    def test_without_resume_steps_always_run(self):
+        clone = Mock()
+        self.make_install(resume=False)._journaled("clone", clone, [])()
+        self.make_install(resume=False)._journaled("clone", clone, [])()
+        self.assertEqual(clone.call_count, 2)
+
+    def test_failed_step_is_not_recorded(self):
+        clone = Mock(side_effect=RuntimeError("network"))
+        with self.assertRaises(RuntimeError):
+            self.make_install(resume=False)._journaled("clone", clone, [])()
+        self.assertFalse(InstallJournal(self.temp_dir).is_done("clone", "clone-v1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from app.commands.install.run import Install, get_defaults
+
+
+class TestInstallHostFacts(unittest.TestCase):
+    def setUp(self):
+        get_defaults.cache_clear()
+
+    def tearDown(self):
+        get_defaults.cache_clear()
+
+    @patch("app.commands.install.run.get_host_facts")
+    def test_config_lookups_do_not_collect_host_facts(self, mock_facts):
+        install = Install(logger=Mock(), dry_run=True)
+
+        install._get_config("required_ports")
+        install._get_config("config_dir")
+
+        mock_facts.assert_not_called()
+
+    @patch("app.commands.install.run.install_all_deps")
+    @patch("app.commands.install.run.get_host_facts")
+    def test_deps_use_the_facts_of_the_install_config_dir(self, mock_facts, mock_install_all_deps):
+        install = Install(logger=Mock())
+        install._user_config = {"nixopus-config-dir": "/srv/nixopus"}
+
+        install._install_dependencies()
+
+        mock_facts.assert_called_once_with("/srv/nixopus")
+        self.assertIs(mock_install_all_deps.call_args.kwargs["facts"], mock_facts.return_value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,23 @@
 import os
+import shutil
+import subprocess
 import tempfile
 import unittest
 from unittest.mock import MagicMock, Mock, patch
 
-from app.commands.install.ssh import SSH, SSHCommandBuilder, SSHConfig, SSHKeyManager
+from app.commands.install.ssh import (
+    DEFAULT_SSH_KEY_PATH,
+    LEGACY_SSH_KEY_PATH,
+    SSH,
+    AuthorizedKeysIndex,
+    SSHCommandBuilder,
+    SSHConfig,
+    SSHKeyManager,
+    default_key_path,
+    key_fingerprint,
+    parse_public_key,
+    private_key_public_blob,
+)
 
 
 class TestSSHKeyGeneration(unittest.TestCase):
@@ -241,3 +255,127 @@ class TestSSHKeyGeneration(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+@unittest.skipUnless(shutil.which("ssh-keygen"), "ssh-keygen is not installed")
+class TestSSHKeyReuse(unittest.TestCase):
+    def setUp(self):
+        self.mock_logger = Mock()
+        self.temp_dir = tempfile.mkdtemp()
+        self.key_path = os.path.join(self.temp_dir, "id_ed25519")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def keygen(self, path, *args):
+        subprocess.run(["ssh-keygen", "-q", "-N", "", "-f", path, *args], check=True, capture_output=True)
+        with open(path + ".pub") as f:
+            return f.read()
+
+    def test_fingerprint_matches_ssh_keygen(self):
+        public_key = self.keygen(self.key_path, "-t", "ed25519")
+        expected = subprocess.run(["ssh-keygen", "-l", "-f", self.key_path + ".pub"], capture_output=True, text=True).stdout
+
+        algorithm, blob = parse_public_key(public_key)
+
+        self.assertEqual(algorithm, "ssh-ed25519")
+        self.assertEqual(expected.split()[1], key_fingerprint(blob))
+        self.assertEqual(private_key_public_blob(self.key_path), blob)
+
+    def test_parse_public_key_with_options_and_garbage(self):
+        public_key = self.keygen(self.key_path, "-t", "ed25519")
+        _, blob = parse_public_key(public_key)
+
+        self.assertEqual(parse_public_key('no-pty,command="/bin/true" ' + public_key)[1], blob)
+        self.assertIsNone(parse_public_key("ssh-ed25519 not-base64!"))
+        self.assertIsNone(parse_public_key("# comment"))
+
+    def test_inspect_existing_key(self):
+        self.keygen(self.key_path, "-t", "rsa", "-b", "2048")
+
+        existing = SSHKeyManager(self.mock_logger).inspect_existing_key(self.key_path)
+
+        self.assertEqual(existing.key_type, "rsa")
+        self.assertEqual(existing.bits, 2048)
+        self.assertTrue(existing.matches("rsa", 2048))
+        self.assertFalse(existing.matches("rsa", 4096))
+        self.assertFalse(existing.matches("ed25519", 256))
+
+    def test_inspect_detects_mismatched_pair(self):
+        self.keygen(self.key_path, "-t", "ed25519")
+        other = self.keygen(os.path.join(self.temp_dir, "other"), "-t", "ed25519")
+        with open(self.key_path + ".pub", "w") as f:
+            f.write(other)
+
+        self.assertIsNone(SSHKeyManager(self.mock_logger).inspect_existing_key(self.key_path))
+
+    def test_inspect_pem_key_uses_ssh_keygen(self):
+        self.keygen(self.key_path, "-t", "rsa", "-b", "2048", "-m", "PEM")
+
+        self.assertIsNone(private_key_public_blob(self.key_path))
+        self.assertEqual(SSHKeyManager(self.mock_logger).inspect_existing_key(self.key_path).bits, 2048)
+
+    def test_existing_key_is_reused(self):
+        self.keygen(self.key_path, "-t", "ed25519")
+
+        with patch("app.commands.install.ssh.SSHKeyManager.generate_ssh_key") as generate:
+            result = SSH(self.mock_logger).generate(SSHConfig(path=self.key_path))
+
+        generate.assert_not_called()
+        self.assertTrue(result.success)
+        self.assertTrue(result.reused)
+        self.assertTrue(result.fingerprint.startswith("SHA256:"))
+
+    def test_force_regenerates_key_of_other_type(self):
+        self.keygen(self.key_path, "-t", "rsa", "-b", "2048")
+        old_public_key = open(self.key_path + ".pub").read()
+
+        result = SSH(self.mock_logger).generate(SSHConfig(path=self.key_path, key_type="ed25519", force=True))
+
+        self.assertTrue(result.success)
+        self.assertFalse(result.reused)
+        self.assertNotEqual(open(self.key_path + ".pub").read(), old_public_key)
+        self.assertEqual(parse_public_key(open(self.key_path + ".pub").read())[0], "ssh-ed25519")
+
+    def test_authorized_keys_index_is_idempotent(self):
+        public_key = self.keygen(self.key_path, "-t", "ed25519")
+        authorized_keys = os.path.join(self.temp_dir, "authorized_keys")
+        with open(authorized_keys, "w") as f:
+            f.write('no-pty ' + public_key.strip().rsplit(" ", 1)[0] + " old-comment")
+
+        index = AuthorizedKeysIndex(authorized_keys)
+
+        self.assertFalse(index.add(public_key))
+        other = self.keygen(os.path.join(self.temp_dir, "other"), "-t", "ed25519")
+        self.assertTrue(index.add(other))
+        self.assertFalse(index.add(other))
+        with open(authorized_keys) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[1], other.strip())
+
+    def test_authorized_keys_index_sees_external_changes(self):
+        public_key = self.keygen(self.key_path, "-t", "ed25519")
+        authorized_keys = os.path.join(self.temp_dir, "authorized_keys")
+        index = AuthorizedKeysIndex(authorized_keys)
+        self.assertTrue(index.add(public_key))
+
+        with open(authorized_keys, "w") as f:
+            f.write("")
+
+        self.assertTrue(index.add(public_key))
+
+    def test_authorized_keys_index_rejects_invalid_key(self):
+        with self.assertRaises(ValueError):
+            AuthorizedKeysIndex(os.path.join(self.temp_dir, "authorized_keys")).add("not a key")
+
+    def test_default_path_keeps_a_key_generated_at_the_legacy_path(self):
+        os.makedirs(os.path.join(self.temp_dir, ".ssh"))
+        with patch.dict(os.environ, {"HOME": self.temp_dir}):
+            self.assertEqual(default_key_path(), DEFAULT_SSH_KEY_PATH)
+
+            self.keygen(os.path.expanduser(LEGACY_SSH_KEY_PATH), "-t", "rsa", "-b", "2048")
+            self.assertEqual(default_key_path(), LEGACY_SSH_KEY_PATH)
+
+            self.keygen(os.path.expanduser(DEFAULT_SSH_KEY_PATH), "-t", "ed25519")
+            self.assertEqual(default_key_path(), DEFAULT_SSH_KEY_PATH)
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from app.commands.preflight.capacity import MB, CapacityRequirements, check_capacity
+from app.commands.preflight.run import PreflightRunner
+from app.utils.host_facts import DiskFacts, HostFacts
+
+
+def make_facts(**overrides):
+    values = {
+        "os_name": "linux",
+        "cpu_count": 4,
+        "memory_total": 8192 * MB,
+        "config_dir": "/etc/nixopus",
+        "disks": [DiskFacts(path="/etc/nixopus", measured_path="/etc", free_bytes=50000 * MB, free_inodes=1000000)],
+        "collected_at": 0,
+    }
+    values.update(overrides)
+    return HostFacts(**values)
+
+
+class TestCheckCapacity(unittest.TestCase):
+    def setUp(self):
+        self.requirements = CapacityRequirements(min_cpus=2, min_memory_mb=2048, min_disk_mb=10240, min_inodes=100000)
+
+    def test_sufficient_host(self):
+        self.assertEqual(check_capacity(make_facts(), self.requirements), [])
+
+    def test_cgroup_limits_count(self):
+        facts = make_facts(cgroup_cpu_limit=0.5, cgroup_memory_limit=512 * MB)
+
+        shortfalls = check_capacity(facts, self.requirements)
+
+        self.assertEqual(shortfalls, ["0.5 CPUs available, 2 required", "512 MB memory available, 2048 MB required"])
+
+    def test_disk_and_inodes(self):
+        disk = DiskFacts(path="/var/lib/docker", measured_path="/var/lib", free_bytes=1024 * MB, free_inodes=10)
+
+        shortfalls = check_capacity(make_facts(disks=[disk]), self.requirements)
+
+        self.assertEqual(
+            shortfalls,
+            ["1024 MB free at /var/lib/docker, 10240 MB required", "10 free inodes at /var/lib/docker, 100000 required"],
+        )
+
+    def test_unknown_facts_are_not_held_against_the_host(self):
+        disk = DiskFacts(path="/etc/nixopus", measured_path="/etc", free_bytes=50000 * MB, free_inodes=None)
+
+        self.assertEqual(check_capacity(make_facts(memory_total=None, disks=[disk]), self.requirements), [])
+
+    def test_two_gigabyte_host_passes_the_defaults(self):
+        # MemTotal of a 2 GB VPS, after the kernel's reservations
+        facts = make_facts(memory_total=1953 * MB)
+
+        self.assertEqual(check_capacity(facts, CapacityRequirements.from_config()), [])
+
+    def test_requirements_from_config(self):
+        requirements = CapacityRequirements.from_config()
+
+        self.assertEqual((requirements.min_memory_mb, requirements.min_disk_mb), (1800, 10240))
+
+
+class TestPreflightRunnerCapacity(unittest.TestCase):
+    def test_raises_with_every_shortfall(self):
+        requirements = CapacityRequirements(min_cpus=8, min_memory_mb=16384)
+
+        with self.assertRaises(Exception) as context:
+            PreflightRunner(logger=Mock()).check_capacity(make_facts(), requirements)
+
+        self.assertIn("below the capacity", str(context.exception))
+        self.assertIn("4 CPUs available, 8 required", str(context.exception))
+        self.assertIn("8192 MB memory available, 16384 MB required", str(context.exception))
+
+    def test_returns_facts_when_sufficient(self):
+        facts = make_facts()
+
+        self.assertIs(PreflightRunner(logger=Mock()).check_capacity(facts, CapacityRequirements()), facts)
+
+
+@patch("app.commands.preflight.run.get_host_facts")
+class TestPreflightRunnerHostFacts(unittest.TestCase):
+    def test_facts_come_from_the_host_facts_cache(self, mock_facts):
+        mock_facts.return_value = make_facts()
+
+        PreflightRunner(logger=Mock()).check_capacity(requirements=CapacityRequirements(), config_dir="/etc/nixopus")
+
+        mock_facts.assert_called_once_with("/etc/nixopus", refresh=False)
+
+    def test_no_cache_collects_fresh_facts(self, mock_facts):
+        mock_facts.return_value = make_facts()
+
+        PreflightRunner(logger=Mock(), use_cache=False).check_capacity(requirements=CapacityRequirements(), config_dir="/etc/nixopus")
+
+        mock_facts.assert_called_once_with("/etc/nixopus", refresh=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
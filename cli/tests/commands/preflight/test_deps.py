@@ -53,7 +53,7 @@ class TestDependencyChecker(unittest.TestCase):
         self.mock_logger = MockLogger()
         self.checker = DependencyChecker(logger=self.mock_logger)
 
-    @patch("shutil.which")
+    @patch("app.utils.path_index.PathIndex.which")
     def test_check_dependency_available(self, mock_which):
         mock_which.return_value = "/usr/bin/docker"
 
@@ -64,7 +64,7 @@ class TestDependencyChecker(unittest.TestCase):
         self.assertEqual(len(self.mock_logger.debug_calls), 1)
         self.assertIn("docker", self.mock_logger.debug_calls[0])
 
-    @patch("shutil.which")
+    @patch("app.utils.path_index.PathIndex.which")
     def test_check_dependency_not_available(self, mock_which):
         mock_which.return_value = None
 
@@ -73,7 +73,7 @@ class TestDependencyChecker(unittest.TestCase):
         self.assertFalse(result)
         mock_which.assert_called_once_with("nonexistent")
 
-    @patch("shutil.which")
+    @patch("app.utils.path_index.PathIndex.which")
     def test_check_dependency_timeout(self, mock_which):
         mock_which.side_effect = subprocess.TimeoutExpired("command", 5)
 
@@ -83,7 +83,7 @@ class TestDependencyChecker(unittest.TestCase):
         self.assertEqual(len(self.mock_logger.error_calls), 1)
         self.assertIn("slow_command", self.mock_logger.error_calls[0])
 
-    @patch("shutil.which")
+    @patch("app.utils.path_index.PathIndex.which")
     def test_check_dependency_exception(self, mock_which):
         mock_which.side_effect = Exception("Test exception")
 
@@ -283,15 +283,15 @@ class TestDepsService(unittest.TestCase):
         self.assertFalse(result.is_available)
         self.assertEqual(result.error, "Test error")
 
-    @patch("app.commands.preflight.deps.ParallelProcessor")
-    def test_check_dependencies(self, mock_parallel_processor):
+    @patch("app.commands.preflight.deps.process_items")
+    def test_check_dependencies(self, mock_process_items):
         mock_results = [self.service._create_result("docker", True), self.service._create_result("kubectl", False)]
-        mock_parallel_processor.process_items.return_value = mock_results
+        mock_process_items.return_value = mock_results
 
         results = self.service.check_dependencies()
 
         self.assertEqual(len(results), 2)
-        mock_parallel_processor.process_items.assert_called_once()
+        mock_process_items.assert_called_once()
 
     def test_check_and_format(self):
         mock_results = [self.service._create_result("docker", True), self.service._create_result("kubectl", False)]
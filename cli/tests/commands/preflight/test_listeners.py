@@ -0,0 +1,134 @@
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from app.commands.preflight.listeners import ListenerSnapshot, parse_proc_net
+from app.commands.preflight.port import PortConfig, PortService
+from app.commands.preflight.run import PreflightRunner
+
+HEADER = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+
+TCP = HEADER + (
+    "   0: 00000000:0050 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1001 1 0 100 0 0 10 0\n"
+    "   1: 0100007F:1F90 00000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 1002 1 0 100 0 0 10 0\n"
+    "   2: 0100007F:A1B2 0100007F:0050 01 00000000:00000000 00:00000000 00000000  1000        0 1003 1 0 20 4 30 10 -1\n"
+)
+TCP6 = HEADER + (
+    "   0: 00000000000000000000000001000000:01BB 00000000000000000000000000000000:0000 0A "
+    "00000000:00000000 00:00000000 00000000     0        0 2001 1 0 100 0 0 10 0\n"
+)
+UDP = HEADER + (
+    "  10: 00000000:0035 00000000:0000 07 00000000:00000000 00:00000000 00000000     0        0 3001 2 0 0\n"
+    "  11: 0100007F:D431 08080808:0035 01 00000000:00000000 00:00000000 00000000  1000        0 3002 2 0 0\n"
+)
+
+
+class TestParseProcNet(unittest.TestCase):
+    def test_listening_tcp_sockets(self):
+        listeners = parse_proc_net(TCP, "tcp")
+
+        self.assertEqual([(l.address, l.port, l.inode) for l in listeners], [("0.0.0.0", 80, 1001), ("127.0.0.1", 8080, 1002)])
+
+    def test_ipv6_addresses(self):
+        listener = parse_proc_net(TCP6, "tcp6")[0]
+
+        self.assertEqual((listener.address, listener.port), ("::1", 443))
+
+    def test_only_unconnected_udp_sockets(self):
+        listeners = parse_proc_net(UDP, "udp")
+
+        self.assertEqual([(l.protocol, l.port) for l in listeners], [("udp", 53)])
+
+
+class TestListenerSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.proc = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.proc, "net"))
+        for name, content in {"tcp": TCP, "tcp6": TCP6, "udp": UDP}.items():
+            with open(os.path.join(self.proc, "net", name), "w") as f:
+                f.write(content)
+        self.add_process(812, "nginx", [1001, 2001])
+        self.add_process(900, "dnsmasq", [3001])
+
+    def tearDown(self):
+        shutil.rmtree(self.proc)
+
+    def add_process(self, pid, name, inodes):
+        fd_dir = os.path.join(self.proc, str(pid), "fd")
+        os.makedirs(fd_dir)
+        with open(os.path.join(self.proc, str(pid), "comm"), "w") as f:
+            f.write(name + "\n")
+        os.symlink("/dev/null", os.path.join(fd_dir, "0"))
+        for fd, inode in enumerate(inodes, start=3):
+            os.symlink(f"socket:[{inode}]", os.path.join(fd_dir, str(fd)))
+
+    def test_missing_tables_are_skipped(self):
+        snapshot = ListenerSnapshot.take(self.proc)
+
+        self.assertTrue(ListenerSnapshot.is_supported(self.proc))
+        self.assertEqual([l.protocol for l in snapshot.listeners(443)], ["tcp6"])
+        self.assertEqual(snapshot.listeners(443)[0].process, "nginx")
+
+    def test_owners_are_resolved(self):
+        listener = ListenerSnapshot.take(self.proc).listeners(80)[0]
+
+        self.assertEqual((listener.pid, listener.process), (812, "nginx"))
+
+    def test_unowned_socket_has_no_pid(self):
+        listener = ListenerSnapshot.take(self.proc).listeners(8080)[0]
+
+        self.assertIsNone(listener.pid)
+
+    def test_free_port_does_not_scan_processes(self):
+        snapshot = ListenerSnapshot.take(self.proc)
+        with patch("os.listdir") as mock_listdir:
+            self.assertEqual(snapshot.listeners(9999), [])
+        mock_listdir.assert_not_called()
+
+    def test_port_service_reports_holder(self):
+        config = PortConfig(ports=[80, 53, 8080, 9999], host="localhost")
+        snapshot = ListenerSnapshot.take(self.proc)
+        results = PortService(config, logger=Mock(), snapshot=snapshot).check_ports()
+
+        self.assertEqual([r["is_available"] for r in results], [False, False, False, True])
+        self.assertEqual(results[0]["error"], "in use by nginx (pid 812, tcp 0.0.0.0)")
+        self.assertEqual(results[1]["error"], "in use by dnsmasq (pid 900, udp 0.0.0.0)")
+        self.assertEqual(results[2]["error"], "in use (tcp 127.0.0.1)")
+        self.assertIsNone(results[3]["error"])
+
+    def test_preflight_runner_names_holders(self):
+        snapshot = ListenerSnapshot.take(self.proc)
+        with patch("app.commands.preflight.port.ListenerSnapshot.take", return_value=snapshot):
+            with self.assertRaises(Exception) as context:
+                PreflightRunner(logger=Mock()).check_required_ports([80, 9999])
+
+        self.assertIn("80 (in use by nginx (pid 812, tcp 0.0.0.0))", str(context.exception))
+        self.assertNotIn("9999", str(context.exception))
+
+
+@unittest.skipUnless(ListenerSnapshot.is_supported(), "requires /proc/net")
+class TestLocalSnapshot(unittest.TestCase):
+    def test_sees_socket_bound_to_one_interface(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        port = server.getsockname()[1]
+        try:
+            result = PortService(PortConfig(ports=[port]), logger=Mock()).check_ports()[0]
+        finally:
+            server.close()
+
+        self.assertFalse(result["is_available"])
+        self.assertIn(f"pid {os.getpid()}", result["error"])
+
+    def test_remote_hosts_use_scanner(self):
+        service = PortService(PortConfig(ports=[80], host="10.0.0.4"), logger=Mock())
+
+        self.assertFalse(service._use_snapshot())
+
+
+if __name__ == "__main__":
+    unittest.main()
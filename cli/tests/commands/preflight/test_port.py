@@ -1,8 +1,13 @@
+import asyncio
+import socket
 from typing import List
+from unittest.mock import Mock
 
 import pytest
 
-from app.commands.preflight.port import PortCheckResult, PortConfig, PortService
+from app.commands.preflight.port import AsyncPortScanner, PortCheckResult, PortConfig, PortService, parse_port_specs
+from app.commands.preflight.run import PreflightRunner
+from app.utils.timeout import TimeoutWrapper
 
 
 class TestPort:
@@ -106,3 +111,104 @@ def test_check_ports_return_type():
         assert isinstance(result["host"], str) or result["host"] is None
         assert isinstance(result["error"], str) or result["error"] is None
         assert isinstance(result["is_available"], bool)
+
+
+
+def test_port_freed_after_a_failed_check_passes_the_next_one():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    port = server.getsockname()[1]
+    with pytest.raises(Exception):
+        PreflightRunner(logger=Mock()).check_required_ports([port], host="127.0.0.1")
+
+    server.close()
+
+    PreflightRunner(logger=Mock()).check_required_ports([port], host="127.0.0.1")
+
+@pytest.fixture
+def listening_port():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    yield server.getsockname()[1]
+    server.close()
+
+
+@pytest.fixture
+def closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class TestParsePortSpecs:
+    def test_ports_and_ranges(self):
+        assert parse_port_specs(["80", "8000-8003", "443,8001"]) == [80, 8000, 8001, 8002, 8003, 443]
+
+    @pytest.mark.parametrize("spec", ["0", "70000", "9000-8000", "http", "80-"])
+    def test_invalid_specs(self, spec):
+        with pytest.raises(ValueError, match="Invalid port"):
+            parse_port_specs([spec])
+
+
+class TestAsyncPortScanner:
+    def test_listening_port_is_not_available(self, listening_port, closed_port):
+        config = PortConfig(ports=[listening_port, closed_port], host="127.0.0.1")
+        results = PortService(config, logger=Mock(), scanner=AsyncPortScanner(Mock())).check_ports()
+
+        assert [result["is_available"] for result in results] == [False, True]
+
+    def test_multiple_hosts_in_input_order(self, listening_port):
+        config = PortConfig(ports=[listening_port], hosts=["localhost", "127.0.0.1"])
+        streamed = []
+        results = PortService(config, logger=Mock(), scanner=AsyncPortScanner(Mock())).check_ports(on_result=streamed.append)
+
+        assert [result["host"] for result in results] == [None, "127.0.0.1"]
+        assert all(not result["is_available"] for result in results)
+        assert len(streamed) == 2
+
+    def test_concurrency_window(self):
+        scanner = AsyncPortScanner(Mock(), concurrency=3)
+        in_flight, peak = [0], [0]
+
+        async def probe(address, port):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return True
+
+        scanner._probe = probe
+        results = []
+        scanner.scan(["127.0.0.1"], list(range(1, 21)), lambda *result: results.append(result))
+
+        assert peak[0] == 3
+        assert len(results) == 20
+
+    def test_unresolved_host_fails_its_ports(self):
+        scanner = AsyncPortScanner(Mock())
+
+        async def resolve(host):
+            return (None, "Could not resolve host nowhere.example: not found") if host == "nowhere.example" else ("127.0.0.1", None)
+
+        scanner._resolve = resolve
+        config = PortConfig(ports=[1, 2], hosts=["nowhere.example"])
+        results = PortService(config, logger=Mock(), scanner=scanner).check_ports()
+
+        assert [result["is_available"] for result in results] == [False, False]
+        assert "Could not resolve" in results[0]["error"]
+
+    def test_scan_stops_at_deadline(self):
+        scanner = AsyncPortScanner(Mock(), concurrency=1)
+
+        async def probe(address, port):
+            await asyncio.sleep(0.3)
+            return True
+
+        scanner._probe = probe
+        with pytest.raises(TimeoutError):
+            with TimeoutWrapper(0.5):
+                scanner.scan(["127.0.0.1"], list(range(1, 100)), lambda *result: None)
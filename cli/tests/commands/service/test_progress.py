@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from app.commands.service.progress import CONTAINER, IMAGE, ComposeProgressDisplay, ComposeProgressParser
+
+
+class TestComposeProgressParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = ComposeProgressParser()
+
+    def test_ignores_non_events(self):
+        self.assertIsNone(self.parser.feed("plain text"))
+        self.assertIsNone(self.parser.feed("[1, 2]"))
+        self.assertIsNone(self.parser.feed('{"text":"no id"}'))
+        self.assertEqual(self.parser.results(), [])
+
+    def test_ignores_networks_and_volumes(self):
+        self.assertIsNone(self.parser.feed('{"id":"Network nixopus-network","text":"Created"}'))
+        self.assertIsNone(self.parser.feed('{"id":"Volume db","text":"Created"}'))
+
+    def test_sums_layer_bytes_per_image(self):
+        self.parser.feed('{"id":"api","text":"Pulling"}')
+        self.parser.feed('{"id":"l1","parent_id":"api","text":"Downloading","current":10,"total":100}')
+        progress = self.parser.feed('{"id":"l2","parent_id":"api","text":"Downloading","current":5,"total":50}')
+        self.assertEqual((progress.kind, progress.downloaded, progress.size), (IMAGE, 15, 150))
+
+        progress = self.parser.feed('{"id":"l1","parent_id":"api","text":"Extracting","current":100,"total":100}')
+        self.assertEqual(progress.downloaded, 105)
+        self.assertEqual(progress.state, "Extracting")
+        self.assertFalse(progress.done)
+
+    @patch("app.commands.service.progress.time.monotonic")
+    def test_records_durations(self, mock_monotonic):
+        mock_monotonic.side_effect = [100.0, 101.0, 104.5, 105.0, 106.0]
+        parser = ComposeProgressParser()
+
+        parser.feed('{"id":"api","text":"Pulling"}')
+        pulled = parser.feed('{"id":"api","text":"Pulled"}')
+        parser.feed('{"id":"Container nixopus-api","text":"Starting"}')
+
+        self.assertEqual(pulled.started_after, 1.0)
+        self.assertEqual(pulled.duration, 3.5)
+        started = parser.results()[1]
+        self.assertEqual((started.kind, started.name, started.started_after), (CONTAINER, "nixopus-api", 5.0))
+        self.assertIsNone(started.duration)
+
+    def test_status_field_is_accepted(self):
+        progress = self.parser.feed('{"id":"Container nixopus-db","status":"Running"}')
+        self.assertEqual(progress.state, "Running")
+        self.assertTrue(progress.done)
+
+    def test_calls_on_progress(self):
+        callback = Mock()
+        parser = ComposeProgressParser(callback)
+        parser.feed('{"id":"Container nixopus-db","text":"Started"}')
+        callback.assert_called_once()
+
+
+class TestComposeProgressDisplay(unittest.TestCase):
+    def test_one_task_per_service(self):
+        progress = Mock()
+        progress.add_task.side_effect = [1, 2]
+        display = ComposeProgressDisplay(progress)
+        parser = ComposeProgressParser(display.update)
+
+        parser.feed('{"id":"l1","parent_id":"api","text":"Downloading","current":10,"total":100}')
+        parser.feed('{"id":"api","text":"Pulled"}')
+        parser.feed('{"id":"Container nixopus-api","text":"Started"}')
+
+        self.assertEqual(progress.add_task.call_count, 2)
+        progress.update.assert_any_call(1, description="Pulling api: Downloading", completed=10, total=100)
+        progress.update.assert_any_call(2, description="Container nixopus-api: Started", completed=1, total=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 import os
 import subprocess
+import threading
+import time
 from unittest.mock import Mock, patch
 
 import pytest
@@ -16,7 +18,22 @@ from app.commands.service.messages import (
     services_status_retrieved,
     unknown_error,
 )
-from app.commands.service.ps import DockerCommandBuilder, DockerService, Ps, PsConfig, PsFormatter, PsResult, PsService
+from app.commands.service.ps import (
+    ContainerStatus,
+    ContainerStatusReader,
+    DockerCommandBuilder,
+    DockerService,
+    Ps,
+    PsConfig,
+    PsFormatter,
+    PsResult,
+    PsService,
+    compose_project_name,
+    cpu_percent,
+    memory_usage,
+    parse_docker_time,
+)
+from app.utils.docker_api import DockerAPIError
 from app.utils.logger import Logger
 
 
@@ -259,7 +276,9 @@ class TestPsService:
         self.config = PsConfig(name="web", env_file=None, verbose=False, output="text", dry_run=False)
         self.logger = Mock(spec=Logger)
         self.docker_service = Mock()
-        self.service = PsService(self.config, self.logger, self.docker_service)
+        self.docker_client = Mock(socket_path="/var/run/docker.sock")
+        self.docker_client.is_available.return_value = False
+        self.service = PsService(self.config, self.logger, self.docker_service, self.docker_client)
 
     def test_create_result_success(self):
         result = self.service._create_result(True)
@@ -303,6 +322,160 @@ class TestPsService:
         assert formatted == "No services found in compose file"
 
 
+def inspect_details(container_id, service, status="running", **state):
+    return {
+        "Id": container_id,
+        "Name": f"/source-{service}-1",
+        "RestartCount": state.pop("restarts", 0),
+        "Config": {"Image": f"nixopus/{service}", "Labels": {"com.docker.compose.service": service}},
+        "State": {"Status": status, "StartedAt": "2024-05-01T10:00:00.123456789Z", **state},
+    }
+
+
+def stats_sample(total_usage, system_usage, usage=300 << 20, precpu=None):
+    return {
+        "cpu_stats": {"cpu_usage": {"total_usage": total_usage}, "system_cpu_usage": system_usage, "online_cpus": 2},
+        "precpu_stats": {"cpu_usage": {"total_usage": precpu[0]}, "system_cpu_usage": precpu[1]} if precpu else {"cpu_usage": {}},
+        "memory_stats": {"usage": usage, "limit": 2 << 30, "stats": {"inactive_file": 100 << 20}},
+    }
+
+
+class FakeDockerClient:
+    socket_path = "/var/run/docker.sock"
+
+    def __init__(self, containers, samples=None, events=()):
+        self.details = {details["Id"]: details for details in containers}
+        self.samples = {container_id: list(values) for container_id, values in (samples or {}).items()}
+        self.queued_events = list(events)
+        self.streamed = threading.Event()
+        self.closed = False
+
+    def is_available(self):
+        return True
+
+    def containers(self, project=None, service=None):
+        return [{"Id": container_id} for container_id, details in self.details.items()
+                if service is None or details["Config"]["Labels"]["com.docker.compose.service"] == service]
+
+    def inspect(self, container_id):
+        return self.details[container_id]
+
+    def stats(self, container_id):
+        if not self.samples.get(container_id):
+            raise DockerAPIError("is not running", 409)
+        return self.samples[container_id].pop(0)
+
+    def events(self, project=None):
+        yield from self.queued_events
+        self.streamed.set()
+
+    def close(self):
+        self.closed = True
+
+
+class TestRuntimeStatus:
+    def test_parse_docker_time_with_nanoseconds(self):
+        assert parse_docker_time("2024-05-01T10:00:00.123456789Z") == pytest.approx(1714557600.123456)
+        assert parse_docker_time("0001-01-01T00:00:00Z") is None
+
+    def test_cpu_percent_against_precpu_stats(self):
+        assert cpu_percent(stats_sample(1500, 12000, precpu=(1000, 10000))) == 50.0
+        assert cpu_percent(stats_sample(1500, 12000)) is None
+
+    def test_cpu_percent_against_an_earlier_sample(self):
+        assert cpu_percent(stats_sample(1500, 12000), stats_sample(1000, 10000)) == 50.0
+        assert cpu_percent(stats_sample(1000, 10000), stats_sample(1000, 10000)) is None
+
+    def test_memory_usage_excludes_reclaimable_cache(self):
+        assert memory_usage(stats_sample(0, 0)) == (200 << 20, 2 << 30)
+
+    def test_container_status_from_inspect(self):
+        details = inspect_details("b", "nixopus-db", status="exited", ExitCode=137, OOMKilled=True, restarts=3)
+
+        status = ContainerStatus.from_inspect(details, now=1714557700)
+
+        assert (status.name, status.service, status.restart_count) == ("source-nixopus-db-1", "nixopus-db", 3)
+        assert status.uptime is None
+        assert status.table_row()["State"] == "exited (137), OOM killed"
+
+    def test_project_name_from_compose_directory(self, tmp_path):
+        compose_file = tmp_path / "My Source" / "docker-compose.yml"
+        compose_file.parent.mkdir()
+        compose_file.write_text("services: {}\n")
+
+        with patch.dict(os.environ, {}, clear=True):
+            assert compose_project_name(str(compose_file)) == "mysource"
+            compose_file.write_text("name: nixopus\nservices: {}\n")
+            assert compose_project_name(str(compose_file)) == "nixopus"
+        with patch.dict(os.environ, {"COMPOSE_PROJECT_NAME": "staging"}):
+            assert compose_project_name(str(compose_file)) == "staging"
+
+    def test_reader_takes_one_stats_sample_per_read(self):
+        client = FakeDockerClient(
+            [inspect_details("a", "nixopus-api", Health={"Status": "healthy"}), inspect_details("b", "nixopus-db", status="exited")],
+            samples={"a": [stats_sample(1000, 10000), stats_sample(2000, 12000)]},
+        )
+        reader = ContainerStatusReader(client, "source")
+
+        api, db = reader.read()
+        assert client.samples["a"] == [stats_sample(2000, 12000)]
+        again, _ = reader.read()
+
+        assert (api.service, api.health, api.cpu_percent, api.memory_usage) == ("nixopus-api", "healthy", None, 200 << 20)
+        assert db.cpu_percent is None and db.memory_usage is None
+        assert again.cpu_percent == 100.0
+        assert client.samples["a"] == []
+
+    def test_ps_reads_runtime_status_from_the_engine(self):
+        client = FakeDockerClient([inspect_details("a", "nixopus-api")], samples={"a": [stats_sample(1, 1), stats_sample(2, 2)]})
+        docker_service = Mock()
+        service = PsService(PsConfig(name="nixopus-api"), Mock(spec=Logger), docker_service, client)
+
+        result = service.execute()
+
+        assert result.success is True
+        assert [container.service for container in result.containers] == ["nixopus-api"]
+        assert client.closed is True
+        docker_service.show_services_status.assert_not_called()
+        assert "Nixopus Services (cli)" in PsFormatter().format_output(result, "text")
+
+    def test_ps_falls_back_to_compose_config_when_the_engine_fails(self):
+        client = FakeDockerClient([])
+        client.containers = Mock(side_effect=ConnectionRefusedError("refused"))
+        docker_service = Mock()
+        docker_service.show_services_status.return_value = (True, "{}")
+        service = PsService(PsConfig(), Mock(spec=Logger), docker_service, client)
+
+        result = service.execute()
+
+        assert result.project is None
+        docker_service.show_services_status.assert_called_once()
+
+    def test_no_containers_for_project(self):
+        result = PsResult(name="all", env_file=None, verbose=False, output="text", success=True, project="source", containers=[])
+
+        assert PsFormatter().format_output(result, "text") == "No containers found for compose project source"
+
+    def test_watch_refreshes_once_per_burst_of_events(self):
+        events = [{"Action": "start", "Actor": {"Attributes": {"name": "source-nixopus-api-1"}}}, {"Action": "health_status: healthy"}]
+        client = FakeDockerClient([inspect_details("a", "nixopus-api")], events=events)
+        service = PsService(PsConfig(), Mock(spec=Logger), Mock(), client)
+        refreshes = []
+
+        def on_refresh(result):
+            if not refreshes:
+                # let the stream deliver the whole burst before the loop starts reading it
+                client.streamed.wait(5)
+                time.sleep(0.05)
+            refreshes.append(result)
+
+        with pytest.raises(ConnectionError):
+            service.watch(on_refresh, interval=60)
+
+        assert len(refreshes) == 2
+        assert client.closed is True
+
+
 class TestPs:
     def setup_method(self):
         self.logger = Mock(spec=Logger)
@@ -1,6 +1,6 @@
 import os
 import subprocess
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import ANY, MagicMock, Mock, patch
 
 import pytest
 from pydantic import ValidationError
@@ -13,6 +13,7 @@ from app.commands.service.messages import (
     dry_run_service,
     services_started_successfully,
 )
+from app.commands.service.progress import ComposeProgressParser
 from app.commands.service.up import DockerCommandBuilder, DockerService, Up, UpConfig, UpFormatter, UpResult, UpService
 from app.utils.logger import Logger
 
@@ -162,6 +163,53 @@ class TestDockerService:
         assert success is False
         assert error == "Unexpected error"
 
+    @patch("subprocess.Popen")
+    def test_start_services_streams_progress(self, mock_popen):
+        mock_popen.return_value.stdout = iter(
+            [
+                '{"id":"api","text":"Pulling"}\n',
+                '{"id":"l1","parent_id":"api","text":"Downloading","current":50,"total":100}\n',
+                '{"id":"api","text":"Pulled"}\n',
+                '{"id":"Container nixopus-api","text":"Started"}\n',
+                "warning: something\n",
+            ]
+        )
+        mock_popen.return_value.wait.return_value = 0
+        events = []
+        parser = ComposeProgressParser(lambda progress: events.append((progress.name, progress.state)))
+
+        success, output = self.docker_service.start_services("all", True, None, "/path/compose.yml", progress_parser=parser)
+
+        assert success is True
+        assert output == "warning: something"
+        assert mock_popen.call_args[0][0] == [
+            "docker", "compose", "--progress", "json", "-f", "/path/compose.yml", "up", "-d"
+        ]
+        assert events[-1] == ("nixopus-api", "Started")
+        assert [(p.kind, p.name) for p in parser.results()] == [("image", "api"), ("container", "nixopus-api")]
+
+    @patch("subprocess.run")
+    @patch("subprocess.Popen")
+    def test_start_services_without_json_progress_support(self, mock_popen, mock_run):
+        mock_popen.return_value.stdout = iter(["unknown flag: --progress\n"])
+        mock_popen.return_value.wait.return_value = 1
+        mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
+
+        success, _ = self.docker_service.start_services("all", True, progress_parser=ComposeProgressParser())
+
+        assert success is True
+        assert mock_run.call_args[0][0] == ["docker", "compose", "up", "-d"]
+
+    @patch("subprocess.Popen")
+    def test_start_services_progress_failure(self, mock_popen):
+        mock_popen.return_value.stdout = iter(['{"id":"api","text":"Error"}\n', "pull access denied\n"])
+        mock_popen.return_value.wait.return_value = 1
+
+        success, error = self.docker_service.start_services("all", True, progress_parser=ComposeProgressParser())
+
+        assert success is False
+        assert error == "pull access denied"
+
 
 class TestUpConfig:
     def test_valid_config_default(self):
@@ -285,7 +333,37 @@ class TestUpService:
 
         assert result.success is True
         self.docker_service.start_services.assert_called_once_with(
-            self.config.name, self.config.detach, self.config.env_file, self.config.compose_file
+            self.config.name,
+            self.config.detach,
+            self.config.env_file,
+            self.config.compose_file,
+            progress_parser=ANY,
+        )
+
+    def test_up_reports_service_progress(self):
+        def start_services(*args, progress_parser=None):
+            progress_parser.feed('{"id":"Container nixopus-api","text":"Started"}')
+            return True, ""
+
+        self.docker_service.start_services.side_effect = start_services
+        seen = []
+        service = UpService(self.config, self.logger, self.docker_service, on_progress=seen.append)
+
+        result = service.up()
+
+        assert [progress.name for progress in result.services] == ["nixopus-api"]
+        assert result.model_dump()["services"][0]["state"] == "Started"
+        assert seen[0].name == "nixopus-api"
+
+    def test_up_attached_does_not_parse_progress(self):
+        self.config.detach = False
+        self.docker_service.start_services.return_value = (True, "")
+
+        result = self.service.up()
+
+        assert result.services == []
+        self.docker_service.start_services.assert_called_once_with(
+            self.config.name, False, self.config.env_file, self.config.compose_file
         )
 
     def test_up_failure(self):
@@ -0,0 +1,136 @@
+import json
+import socket
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.commands.service.wait import (
+    ComposeHealthProbe,
+    PortProbe,
+    Probe,
+    ProbeFailed,
+    WaitConfig,
+    WaitService,
+    parse_compose_ps,
+    wait_for,
+)
+from app.utils.logger import Logger
+
+
+class TestWaitFor:
+    def test_returns_once_ready(self):
+        answers = iter([(False, "starting"), (False, "starting"), (True, "ok")])
+        results = wait_for([Probe("db", lambda: next(answers))], timeout=5, initial_delay=0.01)
+
+        assert results[0].ready is True
+        assert results[0].attempts == 3
+
+    def test_backoff_grows_until_max_delay(self):
+        sleeps = []
+        with patch("app.commands.service.wait.time.sleep", side_effect=sleeps.append):
+            wait_for([Probe("db", lambda: (False, "starting"))], timeout=0.05, initial_delay=0.01, max_delay=0.04)
+
+        assert sleeps[:3] == pytest.approx([0.01, 0.02, 0.04], abs=0.01)
+        assert max(sleeps) <= 0.04
+
+    def test_probes_share_one_deadline(self):
+        started = time.monotonic()
+        results = wait_for(
+            [Probe("a", lambda: (False, "down")), Probe("b", lambda: (False, "down"))], timeout=0.3, initial_delay=0.05
+        )
+
+        assert time.monotonic() - started < 0.6
+        assert [result.ready for result in results] == [False, False]
+
+    def test_failed_probe_stops_polling(self):
+        check = Mock(side_effect=ProbeFailed("db exited"))
+        results = wait_for([Probe("db", check)], timeout=5, initial_delay=0.01)
+
+        assert results[0].failed is True
+        assert results[0].detail == "db exited"
+        check.assert_called_once()
+
+    def test_check_errors_are_retried(self):
+        answers = iter([RuntimeError("boom"), (True, "ok")])
+
+        def check():
+            answer = next(answers)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        assert wait_for([Probe("api", check)], timeout=5, initial_delay=0.01)[0].ready is True
+
+
+class TestComposeHealthProbe:
+    def run(self, containers, ndjson=True):
+        stdout = "\n".join(json.dumps(c) for c in containers) if ndjson else json.dumps(containers)
+        with patch("subprocess.run", return_value=Mock(returncode=0, stdout=stdout, stderr="")):
+            return ComposeHealthProbe(compose_file="/tmp/docker-compose.yml")()
+
+    def test_build_command(self):
+        probe = ComposeHealthProbe("db", compose_file="/tmp/docker-compose.yml")
+        assert probe.build_command() == ["docker", "compose", "-f", "/tmp/docker-compose.yml", "ps", "--all", "--format", "json", "db"]
+
+    def test_parse_compose_ps_formats(self):
+        assert parse_compose_ps('[{"Service":"db"}]') == [{"Service": "db"}]
+        assert parse_compose_ps('{"Service":"db"}\n{"Service":"redis"}\n') == [{"Service": "db"}, {"Service": "redis"}]
+        assert parse_compose_ps("") == []
+
+    def test_ready_when_running_and_healthy(self):
+        ready, _ = self.run(
+            [{"Service": "db", "State": "running", "Health": "healthy"}, {"Service": "api", "State": "running", "Health": ""}],
+            ndjson=False,
+        )
+        assert ready is True
+
+    def test_waits_for_unhealthy_and_starting_containers(self):
+        ready, detail = self.run(
+            [{"Service": "db", "State": "running", "Health": "starting"}, {"Service": "redis", "State": "created"}]
+        )
+        assert ready is False
+        assert "db (starting)" in detail and "redis (created)" in detail
+
+    def test_exited_container_fails(self):
+        with pytest.raises(ProbeFailed):
+            self.run([{"Service": "api", "State": "exited", "ExitCode": 1}])
+
+    def test_no_containers_is_not_ready(self):
+        assert self.run([])[0] is False
+
+
+class TestPortProbe:
+    def test_listening_port(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        try:
+            assert PortProbe(server.getsockname()[1])()[0] is True
+        finally:
+            server.close()
+
+    def test_closed_port(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        port = server.getsockname()[1]
+        server.close()
+        assert PortProbe(port)()[0] is False
+
+
+class TestWaitService:
+    def test_result_lists_pending_checks(self):
+        config = WaitConfig(timeout=1)
+        probes = [Probe("db", lambda: (True, "healthy")), Probe("api :8443", lambda: (False, "refused"))]
+        result = WaitService(config, logger=Mock(spec=Logger), probes=probes).wait()
+
+        assert result.success is False
+        assert "api :8443: refused" in result.error
+        assert [probe.name for probe in result.probes] == ["db", "api :8443"]
+
+    def test_success(self):
+        config = WaitConfig(timeout=1)
+        result = WaitService(config, logger=Mock(spec=Logger), probes=[Probe("db", lambda: (True, "healthy"))]).wait()
+
+        assert result.success is True
+        assert result.error is None
@@ -0,0 +1,9 @@
+import pytest
+
+from app.utils.cache import CACHE_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk caches written during tests out of the user's cache directory"""
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.utils.cache import CACHE_DIR_ENV, cache_key, get_cache_dir, get_cache_path, read_json_cache, write_json_cache
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.env_patcher = patch.dict(os.environ, {CACHE_DIR_ENV: self.temp_dir})
+        self.env_patcher.start()
+
+    def tearDown(self):
+        import shutil
+        self.env_patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_cache_dir_override(self):
+        self.assertEqual(get_cache_dir(), self.temp_dir)
+
+    def test_cache_dir_xdg(self):
+        with patch.dict(os.environ, {CACHE_DIR_ENV: "", "XDG_CACHE_HOME": "/tmp/xdg"}):
+            self.assertEqual(get_cache_dir(), "/tmp/xdg/nixopus")
+
+    def test_cache_key_is_stable(self):
+        self.assertEqual(cache_key("a", 1), cache_key("a", 1))
+        self.assertNotEqual(cache_key("a", 1), cache_key("a", 2))
+        self.assertEqual(len(cache_key("a")), 16)
+
+    def test_write_and_read(self):
+        self.assertTrue(write_json_cache("entry", {"value": [1, 2]}))
+        self.assertEqual(read_json_cache("entry"), {"value": [1, 2]})
+        self.assertEqual(os.listdir(self.temp_dir), ["entry.json"])
+
+    def test_read_missing(self):
+        self.assertIsNone(read_json_cache("missing"))
+
+    def test_read_corrupt(self):
+        with open(get_cache_path("corrupt"), "w") as f:
+            f.write("{")
+        self.assertIsNone(read_json_cache("corrupt"))
+
+    def test_read_respects_max_age(self):
+        write_json_cache("entry", {"value": 1})
+        self.assertEqual(read_json_cache("entry", max_age=60), {"value": 1})
+        old = os.path.getmtime(get_cache_path("entry")) - 120
+        os.utime(get_cache_path("entry"), (old, old))
+        self.assertIsNone(read_json_cache("entry", max_age=60))
+        self.assertEqual(read_json_cache("entry"), {"value": 1})
+
+    def test_write_unserializable(self):
+        self.assertFalse(write_json_cache("bad", {"value": object()}))
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
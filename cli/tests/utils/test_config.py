@@ -1,16 +1,25 @@
+import datetime
 import os
 import sys
 import tempfile
 import unittest
 from unittest.mock import Mock, patch, mock_open
 
-from app.utils.config import Config, expand_env_placeholders
+import yaml
+
+from app.utils import config as config_module
+from app.utils.cache import CACHE_DIR_ENV
+from app.utils.config import Config, expand_env_placeholders, get_config, parse_yaml_file
 from app.utils.message import MISSING_CONFIG_KEY_MESSAGE
 
 class TestConfig(unittest.TestCase):
     def setUp(self):
         self.temp_dir = tempfile.mkdtemp()
         self.test_config_path = os.path.join(self.temp_dir, "test_config.yaml")
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.env_patcher = patch.dict(os.environ, {CACHE_DIR_ENV: self.cache_dir})
+        self.env_patcher.start()
+        config_module._parsed_configs.clear()
         self.sample_config = {
             "services": {
                 "api": {
@@ -39,6 +48,8 @@ class TestConfig(unittest.TestCase):
 
     def tearDown(self):
         import shutil
+        self.env_patcher.stop()
+        config_module._parsed_configs.clear()
         shutil.rmtree(self.temp_dir, ignore_errors=True)
 
     def test_get_env_default(self):
@@ -71,56 +82,113 @@ class TestConfig(unittest.TestCase):
         config = Config()
         self.assertTrue(config.is_development())
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('yaml.safe_load')
-    def test_load_yaml_config_success(self, mock_yaml_load, mock_file):
-        mock_yaml_load.return_value = self.sample_config
+    def _make_config(self):
+        with open(self.test_config_path, "w") as f:
+            yaml.safe_dump(self.sample_config, f)
         config = Config()
+        config._yaml_path = self.test_config_path
+        return config
+
+    def test_load_yaml_config_success(self):
+        config = self._make_config()
         result = config.load_yaml_config()
         self.assertEqual(result, self.sample_config)
-        mock_file.assert_called_once()
 
-    @patch('builtins.open')
-    def test_load_yaml_config_file_not_found(self, mock_open):
-        mock_open.side_effect = FileNotFoundError("File not found")
+    def test_load_yaml_config_file_not_found(self):
         config = Config()
+        config._yaml_path = os.path.join(self.temp_dir, "missing.yaml")
         with self.assertRaises(FileNotFoundError):
             config.load_yaml_config()
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('yaml.safe_load')
-    def test_load_yaml_config_cached(self, mock_yaml_load, mock_file):
-        mock_yaml_load.return_value = self.sample_config
-        config = Config()
-        result1 = config.load_yaml_config()
-        result2 = config.load_yaml_config()
+    def test_load_yaml_config_cached(self):
+        config = self._make_config()
+        with patch('app.utils.config.parse_yaml_file', wraps=parse_yaml_file) as mock_parse:
+            result1 = config.load_yaml_config()
+            result2 = config.load_yaml_config()
         self.assertEqual(result1, result2)
-        self.assertEqual(mock_yaml_load.call_count, 1)
+        self.assertEqual(mock_parse.call_count, 1)
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('yaml.safe_load')
-    @patch('app.utils.config.expand_env_placeholders')
-    def test_get_yaml_value_success(self, mock_expand, mock_yaml_load, mock_file):
-        mock_yaml_load.return_value = self.sample_config
-        mock_expand.return_value = "8443"
+    def test_load_yaml_config_shared_between_instances(self):
+        self._make_config().load_yaml_config()
+        config = Config()
+        config._yaml_path = self.test_config_path
+        with patch('app.utils.config.parse_yaml_file') as mock_parse:
+            result = config.load_yaml_config()
+        self.assertEqual(result, self.sample_config)
+        mock_parse.assert_not_called()
+
+    def test_load_yaml_config_uses_compiled_cache(self):
+        self._make_config().load_yaml_config()
+        config_module._parsed_configs.clear()
+        config = Config()
+        config._yaml_path = self.test_config_path
+        with patch('app.utils.config.parse_yaml_file') as mock_parse:
+            result = config.load_yaml_config()
+        self.assertEqual(result, self.sample_config)
+        mock_parse.assert_not_called()
+
+    def test_load_yaml_config_skips_compiled_cache_for_non_json_data(self):
+        with open(self.test_config_path, "w") as f:
+            f.write("ports:\n  80: http\n  true: enabled\nreleased: 2024-05-01\n")
         config = Config()
+        config._yaml_path = self.test_config_path
+        cold = config.load_yaml_config()
+        config_module._parsed_configs.clear()
+
+        warm = config.load_yaml_config()
+
+        self.assertEqual(warm, cold)
+        self.assertEqual(warm["ports"], {80: "http", True: "enabled"})
+        self.assertEqual(warm["released"], datetime.date(2024, 5, 1))
+        self.assertFalse(os.path.isdir(self.cache_dir) and os.listdir(self.cache_dir))
+
+    def test_load_yaml_config_reparses_modified_file(self):
+        self._make_config().load_yaml_config()
+        self.sample_config["ports"] = [80, 443, 8080]
+        config = self._make_config()
+        stat = os.stat(self.test_config_path)
+        os.utime(self.test_config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(config.get_yaml_value("ports"), [80, 443, 8080])
+
+    def test_load_yaml_config_ignores_corrupt_compiled_cache(self):
+        config = self._make_config()
+        config.load_yaml_config()
+        config_module._parsed_configs.clear()
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), "w") as f:
+                f.write("{not json")
+        config = self._make_config()
+        self.assertEqual(config.load_yaml_config(), self.sample_config)
+
+    @patch.dict(os.environ, {}, clear=False)
+    def test_get_yaml_value_success(self):
+        os.environ.pop("API_PORT", None)
+        config = self._make_config()
         result = config.get_yaml_value("services.api.env.PORT")
         self.assertEqual(result, "8443")
-        mock_expand.assert_called_once_with("${API_PORT:-8443}")
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('yaml.safe_load')
-    def test_get_yaml_value_non_string(self, mock_yaml_load, mock_file):
-        mock_yaml_load.return_value = self.sample_config
-        config = Config()
+    @patch.dict(os.environ, {"API_PORT": "9000"})
+    def test_get_yaml_value_follows_env_changes(self):
+        config = self._make_config()
+        self.assertEqual(config.get_yaml_value("services.api.env.PORT"), "9000")
+        os.environ["API_PORT"] = "9001"
+        self.assertEqual(config.get_yaml_value("services.api.env.PORT"), "9001")
+
+    def test_get_yaml_value_does_not_rebuild_index(self):
+        config = self._make_config()
+        config.get_yaml_value("ports")
+        with patch('app.utils.config.build_config_index') as mock_build:
+            config.get_yaml_value("services.api.env.PORT")
+            config.get_yaml_value("clone.repo")
+        mock_build.assert_not_called()
+
+    def test_get_yaml_value_non_string(self):
+        config = self._make_config()
         result = config.get_yaml_value("ports")
         self.assertEqual(result, [2019, 80, 443, 7443, 8443])
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('yaml.safe_load')
-    def test_get_yaml_value_missing_key(self, mock_yaml_load, mock_file):
-        mock_yaml_load.return_value = self.sample_config
-        config = Config()
+    def test_get_yaml_value_missing_key(self):
+        config = self._make_config()
         with self.assertRaises(KeyError) as context:
             config.get_yaml_value("services.api.env.NONEXISTENT")
         expected_message = MISSING_CONFIG_KEY_MESSAGE.format(
@@ -129,11 +197,8 @@ class TestConfig(unittest.TestCase):
         )
         self.assertEqual(context.exception.args[0], expected_message)
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('yaml.safe_load')
-    def test_get_yaml_value_missing_path(self, mock_yaml_load, mock_file):
-        mock_yaml_load.return_value = self.sample_config
-        config = Config()
+    def test_get_yaml_value_missing_path(self):
+        config = self._make_config()
         with self.assertRaises(KeyError) as context:
             config.get_yaml_value("nonexistent.path")
         expected_message = MISSING_CONFIG_KEY_MESSAGE.format(
@@ -142,20 +207,22 @@ class TestConfig(unittest.TestCase):
         )
         self.assertEqual(context.exception.args[0], expected_message)
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('yaml.safe_load')
-    @patch('app.utils.config.expand_env_placeholders')
-    def test_get_service_env_values(self, mock_expand, mock_yaml_load, mock_file):
-        mock_yaml_load.return_value = self.sample_config
-        mock_expand.side_effect = lambda x: x.replace("${API_PORT:-8443}", "8443")
-        config = Config()
+    @patch.dict(os.environ, {"DB_NAME": "nixopus"})
+    def test_get_service_env_values(self):
+        os.environ.pop("API_PORT", None)
+        config = self._make_config()
         result = config.get_service_env_values("services.api.env")
         expected = {
             "PORT": "8443",
-            "DB_NAME": "${DB_NAME:-postgres}"
+            "DB_NAME": "nixopus"
         }
         self.assertEqual(result, expected)
 
+    def test_get_service_env_values_returns_copy(self):
+        config = self._make_config()
+        config.get_service_env_values("services.api.env")["PORT"] = "1"
+        self.assertNotEqual(config.get_service_env_values("services.api.env")["PORT"], "1")
+
     @patch('yaml.safe_load')
     def test_load_user_config_success(self, mock_yaml_load):
         user_config = {
@@ -277,6 +344,13 @@ class TestConfig(unittest.TestCase):
         result = config.get_config_value("ssh_passphrase", user_config, defaults)
         self.assertIsNone(result)
 
+    def test_get_config_value_not_stale_across_configs(self):
+        config = Config()
+        first = config.get_config_value("proxy_port", {}, {"proxy_port": "2019"})
+        second = config.get_config_value("proxy_port", {"services.caddy.env.PROXY_PORT": "2020"}, {"proxy_port": "2019"})
+        self.assertEqual(first, "2019")
+        self.assertEqual(second, "2020")
+
     def test_get_config_value_key_mappings(self):
         config = Config()
         user_config = {
@@ -312,6 +386,9 @@ class TestConfig(unittest.TestCase):
             config = Config()
             self.assertNotIn("_MEIPASS", config._yaml_path)
 
+    def test_get_config_returns_shared_instance(self):
+        self.assertIs(get_config(), get_config())
+
 class TestExpandEnvPlaceholders(unittest.TestCase):
     def setUp(self):
         self.original_environ = os.environ.copy()
@@ -0,0 +1,146 @@
+import json
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from app.utils.docker_api import DockerAPIError, DockerClient, get_docker_socket_path
+
+
+class FakeEngineHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.server.requests.append((url.path, query))
+        # Like a daemon closing an idle keep-alive connection without announcing it
+        self.close_connection = self.server.drop_connections
+        if url.path == "/containers/json":
+            self.send_json(200, [{"Id": "abc", "Filters": json.loads(query["filters"][0])}])
+        elif url.path == "/containers/abc/json":
+            self.send_json(200, {"Id": "abc", "State": {"Status": "running"}})
+        elif url.path == "/events":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for action in ("start", "health_status: healthy"):
+                line = json.dumps({"Type": "container", "Action": action}).encode() + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_json(404, {"message": "No such container: missing"})
+
+
+class FakeEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, FakeEngineHandler)
+        self.connections = 0
+        self.requests = []
+        self.drop_connections = False
+
+
+class TestDockerClient(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.temp_dir, "docker.sock")
+        self.server = FakeEngine(self.socket_path)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = DockerClient(self.socket_path)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_queries_share_one_connection(self):
+        containers = self.client.containers(project="source", service="nixopus-api")
+        details = self.client.inspect("abc")
+
+        self.assertEqual(
+            containers[0]["Filters"],
+            {"label": ["com.docker.compose.project=source", "com.docker.compose.service=nixopus-api"]},
+        )
+        self.assertEqual(details["State"]["Status"], "running")
+        self.assertEqual(self.server.connections, 1)
+
+    def test_reconnects_after_the_daemon_drops_the_connection(self):
+        self.server.drop_connections = True
+        self.client.inspect("abc")
+        self.server.drop_connections = False
+
+        self.assertEqual(self.client.inspect("abc")["Id"], "abc")
+
+        self.assertEqual(self.server.connections, 2)
+
+    def test_error_answers_raise_with_the_daemon_message(self):
+        with self.assertRaises(DockerAPIError) as context:
+            self.client.inspect("missing")
+
+        self.assertEqual(context.exception.status, 404)
+        self.assertEqual(str(context.exception), "No such container: missing")
+
+    def test_events_are_streamed_on_their_own_connection(self):
+        self.client.inspect("abc")
+
+        events = list(self.client.events("source"))
+
+        self.assertEqual([event["Action"] for event in events], ["start", "health_status: healthy"])
+        path, query = self.server.requests[-1]
+        self.assertEqual(json.loads(query["filters"][0]), {"type": ["container"], "label": ["com.docker.compose.project=source"]})
+        self.assertEqual(self.server.connections, 2)
+
+    def test_stats_ask_for_a_single_sample(self):
+        with self.assertRaises(DockerAPIError):
+            self.client.stats("abc")
+
+        path, query = self.server.requests[-1]
+        self.assertEqual((path, query["stream"], query["one-shot"]), ("/containers/abc/stats", ["false"], ["true"]))
+
+    def test_missing_socket_is_unavailable(self):
+        client = DockerClient(os.path.join(self.temp_dir, "missing.sock"))
+
+        self.assertFalse(client.is_available())
+        with self.assertRaises(OSError):
+            client.containers()
+
+
+class TestDockerSocketPath(unittest.TestCase):
+    def test_default_socket(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(get_docker_socket_path(), "/var/run/docker.sock")
+
+    def test_unix_docker_host(self):
+        with patch.dict(os.environ, {"DOCKER_HOST": "unix:///run/user/1000/docker.sock"}):
+            self.assertEqual(get_docker_socket_path(), "/run/user/1000/docker.sock")
+
+    def test_tcp_docker_host_has_no_socket(self):
+        with patch.dict(os.environ, {"DOCKER_HOST": "tcp://10.0.0.2:2376"}):
+            self.assertIsNone(get_docker_socket_path())
+
+
+if __name__ == "__main__":
+    unittest.main()
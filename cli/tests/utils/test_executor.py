@@ -0,0 +1,132 @@
+import asyncio
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from app.utils.executor import (
+    CPU,
+    NETWORK,
+    SUBPROCESS,
+    amap_items,
+    get_executor,
+    in_worker,
+    map_items,
+    process_items,
+    worker_limit,
+)
+from app.utils.timeout import TimeoutWrapper
+
+
+class TestMapItems(unittest.TestCase):
+    def test_ordered_results_follow_input_order(self):
+        def slow_first(x):
+            time.sleep(0.05 if x == 0 else 0)
+            return x * 2
+
+        self.assertEqual(process_items(slow_first, range(5), ordered=True), [0, 2, 4, 6, 8])
+
+    def test_results_stream_in_completion_order(self):
+        def slow_first(x):
+            time.sleep(0.1 if x == 0 else 0)
+            return x
+
+        results = map_items(slow_first, [0, 1], kind=NETWORK)
+
+        self.assertEqual(next(results), 1)
+        self.assertEqual(next(results), 0)
+
+    def test_error_without_handler_is_raised_and_cancels_the_rest(self):
+        started = []
+
+        def work(x):
+            started.append(x)
+            if x == 0:
+                raise ValueError("boom")
+            time.sleep(0.05)
+            return x
+
+        with self.assertRaisesRegex(ValueError, "boom"):
+            process_items(work, range(20), max_workers=2)
+        time.sleep(0.1)
+        self.assertLess(len(started), 20)
+
+    def test_error_handler_result_replaces_failed_item(self):
+        def work(x):
+            if x == 1:
+                raise ValueError("boom")
+            return x
+
+        results = process_items(work, [0, 1, 2], ordered=True, error_handler=lambda item, e: f"{item}: {e}")
+
+        self.assertEqual(results, [0, "1: boom", 2])
+
+    def test_max_workers_bounds_items_in_flight(self):
+        running, peak = [], []
+        lock = threading.Lock()
+
+        def work(x):
+            with lock:
+                running.append(x)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(x)
+
+        process_items(work, range(8), kind=SUBPROCESS, max_workers=2)
+
+        self.assertLessEqual(max(peak), 2)
+
+    def test_nested_fan_out_runs_inline(self):
+        def outer(x):
+            inner_threads = process_items(lambda y: threading.current_thread().name, range(3))
+            return threading.current_thread().name, set(inner_threads)
+
+        for thread_name, inner_threads in process_items(outer, range(4)):
+            self.assertEqual(inner_threads, {thread_name})
+        self.assertFalse(in_worker())
+
+    def test_pools_are_shared_per_kind(self):
+        self.assertIs(get_executor(NETWORK), get_executor(NETWORK))
+        self.assertIsNot(get_executor(NETWORK), get_executor(CPU))
+
+    def test_items_after_deadline_are_not_started(self):
+        started = []
+
+        def work(x):
+            started.append(x)
+            time.sleep(0.6)
+
+        with self.assertRaises(TimeoutError):
+            with TimeoutWrapper(0.5):
+                process_items(work, range(4), max_workers=1)
+        self.assertEqual(started, [0])
+
+    @patch.dict(os.environ, {"NETWORK_WORKERS": "5", "CPU_WORKERS": "0"})
+    def test_worker_limit_from_config(self):
+        self.assertEqual(worker_limit(NETWORK), 5)
+        self.assertEqual(worker_limit(CPU), os.cpu_count())
+
+
+class TestAmapItems(unittest.TestCase):
+    def test_async_ordered_results(self):
+        async def collect():
+            return [result async for result in amap_items(lambda x: x * 2, range(5), ordered=True, max_workers=2)]
+
+        self.assertEqual(asyncio.run(collect()), [0, 2, 4, 6, 8])
+
+    def test_async_error_handler(self):
+        def work(x):
+            if x == 1:
+                raise ValueError("boom")
+            return x
+
+        async def collect():
+            return [r async for r in amap_items(work, range(3), ordered=True, error_handler=lambda item, e: None)]
+
+        self.assertEqual(asyncio.run(collect()), [0, None, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from app.utils.host_facts import (
+    DockerFacts,
+    HostFacts,
+    collect_host_facts,
+    get_host_facts,
+    invalidate_host_facts,
+    probe_cgroup,
+    probe_disk,
+    probe_docker,
+    probe_memory,
+    probe_os_release,
+)
+
+
+class TestHostProbes(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_os_release(self):
+        path = self.write("os-release", 'NAME="Ubuntu"\nID=ubuntu\nVERSION_ID="22.04"\n')
+
+        self.assertEqual(probe_os_release(path), {"distribution": "ubuntu", "distribution_version": "22.04"})
+
+    def test_meminfo(self):
+        path = self.write("meminfo", "MemTotal:        2048000 kB\nMemFree:  100 kB\nMemAvailable:    1024000 kB\n")
+
+        self.assertEqual(probe_memory(path), {"memory_total": 2048000 * 1024, "memory_available": 1024000 * 1024})
+
+    def test_cgroup_v2_limits(self):
+        self.write("cpu.max", "150000 100000\n")
+        self.write("memory.max", "1073741824\n")
+
+        self.assertEqual(probe_cgroup(self.temp_dir), {"cgroup_cpu_limit": 1.5, "cgroup_memory_limit": 1073741824})
+
+    def test_cgroup_v2_unlimited(self):
+        self.write("cpu.max", "max 100000\n")
+        self.write("memory.max", "max\n")
+
+        self.assertEqual(probe_cgroup(self.temp_dir), {"cgroup_cpu_limit": None, "cgroup_memory_limit": None})
+
+    def test_cgroup_v1_limits(self):
+        self.write("cpu/cpu.cfs_quota_us", "-1\n")
+        self.write("cpu/cpu.cfs_period_us", "100000\n")
+        self.write("memory/memory.limit_in_bytes", "9223372036854771712\n")
+
+        self.assertEqual(probe_cgroup(self.temp_dir), {"cgroup_cpu_limit": None, "cgroup_memory_limit": None})
+
+    def test_disk_of_missing_path_measures_existing_parent(self):
+        disk = probe_disk(os.path.join(self.temp_dir, "not", "created"))
+
+        self.assertEqual(disk.measured_path, self.temp_dir)
+        self.assertGreater(disk.free_bytes, 0)
+
+    @patch("app.utils.host_facts.get_path_index")
+    @patch("subprocess.run")
+    def test_docker_reachable(self, mock_run, mock_index):
+        mock_index.return_value.has.return_value = True
+        mock_run.return_value = Mock(returncode=0, stdout="24.0.7|/srv/docker\n", stderr="")
+
+        self.assertEqual(probe_docker()["docker"], DockerFacts(reachable=True, version="24.0.7", data_root="/srv/docker"))
+
+    @patch("app.utils.host_facts.get_path_index")
+    @patch("subprocess.run")
+    def test_docker_daemon_down(self, mock_run, mock_index):
+        mock_index.return_value.has.return_value = True
+        mock_run.return_value = Mock(returncode=1, stdout="", stderr="Cannot connect to the Docker daemon\n")
+
+        docker = probe_docker()["docker"]
+
+        self.assertFalse(docker.reachable)
+        self.assertIn("Cannot connect", docker.error)
+
+
+class TestHostFacts(unittest.TestCase):
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        invalidate_host_facts()
+
+    def tearDown(self):
+        invalidate_host_facts()
+        shutil.rmtree(self.config_dir)
+
+    @patch("app.utils.host_facts.probe_docker", return_value={"docker": DockerFacts(reachable=True, version="24.0.7", data_root="/")})
+    def test_collect_measures_config_dir_and_docker_root(self, mock_docker):
+        with patch("app.utils.host_facts.HOST_PROBES", [("docker", mock_docker)]):
+            facts = collect_host_facts(self.config_dir)
+
+        self.assertEqual([disk.path for disk in facts.disks], [self.config_dir, "/"])
+        self.assertEqual(facts.docker.version, "24.0.7")
+
+    def test_failing_probe_leaves_facts_unset(self):
+        def broken():
+            raise OSError("boom")
+
+        with patch("app.utils.host_facts.HOST_PROBES", [("memory", broken)]):
+            facts = collect_host_facts(self.config_dir)
+
+        self.assertIsNone(facts.memory_total)
+        self.assertFalse(facts.docker.reachable)
+
+    def test_effective_limits_take_cgroup_into_account(self):
+        facts = HostFacts(
+            os_name="linux", cpu_count=8, memory_total=16 << 30, cgroup_cpu_limit=2.0, cgroup_memory_limit=4 << 30,
+            config_dir=self.config_dir, collected_at=0,
+        )
+
+        self.assertEqual(facts.effective_cpus, 2.0)
+        self.assertEqual(facts.effective_memory, 4 << 30)
+
+    def test_facts_are_collected_once_and_shared_through_the_cache(self):
+        with patch("app.utils.host_facts.collect_host_facts", wraps=collect_host_facts) as mock_collect:
+            first = get_host_facts(self.config_dir, max_age=60)
+            self.assertIs(get_host_facts(self.config_dir, max_age=60), first)
+            with patch.dict("app.utils.host_facts._facts", clear=True):
+                from_disk = get_host_facts(self.config_dir, max_age=60)
+
+        self.assertEqual(mock_collect.call_count, 1)
+        self.assertEqual(from_disk, first)
+
+    def test_invalidate_and_refresh_collect_again(self):
+        with patch("app.utils.host_facts.collect_host_facts", wraps=collect_host_facts) as mock_collect:
+            get_host_facts(self.config_dir, max_age=60)
+            invalidate_host_facts()
+            get_host_facts(self.config_dir, max_age=60)
+            get_host_facts(self.config_dir, max_age=60, refresh=True)
+
+        self.assertEqual(mock_collect.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
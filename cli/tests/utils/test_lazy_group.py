@@ -0,0 +1,70 @@
+import sys
+import unittest
+
+import typer
+from typer.testing import CliRunner
+
+from app.utils.lazy_group import LazyTyperGroup, lazy_group
+
+
+class TestLazyTyperGroup(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.app = typer.Typer(cls=lazy_group({"version": "app.commands.version.command:version_app"}))
+
+        @self.app.callback()
+        def main():
+            pass
+
+    def test_lazy_group_binds_subcommands(self):
+        group_cls = lazy_group({"a": "pkg.mod:app"})
+        self.assertTrue(issubclass(group_cls, LazyTyperGroup))
+        self.assertEqual(group_cls.lazy_subcommands, {"a": "pkg.mod:app"})
+        self.assertEqual(LazyTyperGroup.lazy_subcommands, {})
+
+    def test_lists_lazy_commands_without_importing(self):
+        sys.modules.pop("app.commands.clone.command", None)
+        app = typer.Typer(cls=lazy_group({"clone": "app.commands.clone.command:clone_app"}))
+
+        @app.callback()
+        def main():
+            pass
+
+        group = typer.main.get_command(app)
+        self.assertEqual(group.list_commands(None), ["clone"])
+        self.assertNotIn("app.commands.clone.command", sys.modules)
+
+    def test_invokes_lazy_command(self):
+        result = self.runner.invoke(self.app, ["version", "--help"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("version", result.output.lower())
+
+    def test_help_listing_uses_registered_help(self):
+        sys.modules.pop("app.commands.clone.command", None)
+        app = typer.Typer(cls=lazy_group({"clone": "app.commands.clone.command:clone_app"}, {"clone": "Clone it"}))
+
+        @app.callback()
+        def main():
+            pass
+
+        result = self.runner.invoke(app, ["--help"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Clone it", result.output)
+        self.assertNotIn("app.commands.clone.command", sys.modules)
+
+    def test_registered_help_matches_commands(self):
+        from app.main import SUBCOMMAND_HELP, SUBCOMMANDS
+
+        group_cls = lazy_group(SUBCOMMANDS)
+        group = group_cls(name="nixopus")
+        for name, help_text in SUBCOMMAND_HELP.items():
+            command = group.get_command(None, name)
+            self.assertEqual(command.short_help or command.help, help_text, name)
+
+    def test_unknown_command(self):
+        result = self.runner.invoke(self.app, ["missing"])
+        self.assertNotEqual(result.exit_code, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
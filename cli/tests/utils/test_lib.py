@@ -7,13 +7,16 @@ import unittest
 from unittest.mock import Mock, patch, mock_open
 import requests
 
+from app.utils import lib
+from app.utils.cache import write_json_cache
 from app.utils.lib import (
+    PUBLIC_IP_CACHE,
+    PUBLIC_IP_ENV,
     SupportedOS,
     SupportedDistribution,
     SupportedPackageManager,
     Supported,
     HostInformation,
-    ParallelProcessor,
     DirectoryManager,
     FileManager,
 )
@@ -102,6 +105,16 @@ class TestSupported(unittest.TestCase):
 
 
 class TestHostInformation(unittest.TestCase):
+    def setUp(self):
+        lib._host_facts.clear()
+        self.env_patcher = patch.dict(os.environ)
+        self.env_patcher.start()
+        os.environ.pop(PUBLIC_IP_ENV, None)
+
+    def tearDown(self):
+        self.env_patcher.stop()
+        lib._host_facts.clear()
+
     @patch("platform.system")
     def test_get_os_name(self, mock_system):
         mock_system.return_value = "Linux"
@@ -159,12 +172,12 @@ class TestHostInformation(unittest.TestCase):
         
         self.assertIn("No supported package manager found", str(context.exception))
 
-    @patch("shutil.which")
+    @patch("app.utils.path_index.PathIndex.which")
     def test_command_exists_true(self, mock_which):
         mock_which.return_value = "/usr/bin/apt"
         self.assertTrue(HostInformation.command_exists("apt"))
 
-    @patch("shutil.which")
+    @patch("app.utils.path_index.PathIndex.which")
     def test_command_exists_false(self, mock_which):
         mock_which.return_value = None
         self.assertFalse(HostInformation.command_exists("nonexistent"))
@@ -180,8 +193,9 @@ class TestHostInformation(unittest.TestCase):
         self.assertEqual(result, "192.168.1.1")
         mock_get.assert_called_once_with("https://api.ipify.org", timeout=10)
 
+    @patch("app.utils.lib.HostInformation.get_local_ips", return_value=[])
     @patch("requests.get")
-    def test_get_public_ip_http_error(self, mock_get):
+    def test_get_public_ip_http_error(self, mock_get, mock_local_ips):
         mock_get.side_effect = requests.HTTPError("404 Not Found")
 
         with self.assertRaises(Exception) as context:
@@ -189,8 +203,9 @@ class TestHostInformation(unittest.TestCase):
         
         self.assertEqual(str(context.exception), FAILED_TO_GET_PUBLIC_IP_MESSAGE)
 
+    @patch("app.utils.lib.HostInformation.get_local_ips", return_value=[])
     @patch("requests.get")
-    def test_get_public_ip_connection_error(self, mock_get):
+    def test_get_public_ip_connection_error(self, mock_get, mock_local_ips):
         mock_get.side_effect = requests.ConnectionError("Connection failed")
 
         with self.assertRaises(Exception) as context:
@@ -198,8 +213,9 @@ class TestHostInformation(unittest.TestCase):
         
         self.assertEqual(str(context.exception), FAILED_TO_GET_PUBLIC_IP_MESSAGE)
 
+    @patch("app.utils.lib.HostInformation.get_local_ips", return_value=[])
     @patch("requests.get")
-    def test_get_public_ip_timeout(self, mock_get):
+    def test_get_public_ip_timeout(self, mock_get, mock_local_ips):
         mock_get.side_effect = requests.Timeout("Request timeout")
 
         with self.assertRaises(Exception) as context:
@@ -207,73 +223,56 @@ class TestHostInformation(unittest.TestCase):
         
         self.assertEqual(str(context.exception), FAILED_TO_GET_PUBLIC_IP_MESSAGE)
 
+    @patch("requests.get")
+    def test_get_public_ip_looked_up_once(self, mock_get):
+        mock_get.return_value = Mock(text="203.0.113.5\n")
 
-class TestParallelProcessor(unittest.TestCase):
-    def test_process_items_empty_list(self):
-        def processor(x):
-            return x * 2
-
-        results = ParallelProcessor.process_items([], processor)
-        self.assertEqual(results, [])
-
-    def test_process_items_single_item(self):
-        def processor(x):
-            return x * 2
-
-        results = ParallelProcessor.process_items([5], processor)
-        self.assertEqual(results, [10])
-
-    def test_process_items_multiple_items(self):
-        def processor(x):
-            return x * 2
-
-        results = ParallelProcessor.process_items([1, 2, 3, 4, 5], processor)
-        self.assertEqual(len(results), 5)
-        self.assertEqual(set(results), {2, 4, 6, 8, 10})
+        self.assertEqual(HostInformation.get_public_ip(), "203.0.113.5")
+        self.assertEqual(HostInformation.get_public_ip(), "203.0.113.5")
+        mock_get.assert_called_once()
 
-    def test_process_items_with_error_handler(self):
-        def processor(x):
-            if x == 3:
-                raise ValueError("Test error")
-            return x * 2
+        # A later run reuses the address persisted on disk
+        lib._host_facts.clear()
+        self.assertEqual(HostInformation.get_public_ip(), "203.0.113.5")
+        mock_get.assert_called_once()
 
-        def error_handler(item, error):
-            return f"Error processing {item}: {str(error)}"
+    @patch("requests.get")
+    def test_get_public_ip_expired_cache(self, mock_get):
+        mock_get.return_value = Mock(text="203.0.113.6")
+        write_json_cache(PUBLIC_IP_CACHE, {"ip": "203.0.113.5"})
 
-        results = ParallelProcessor.process_items([1, 2, 3, 4, 5], processor, error_handler=error_handler)
-        self.assertEqual(len(results), 5)
-        
-        error_results = [r for r in results if "Error processing 3" in str(r)]
-        normal_results = [r for r in results if isinstance(r, int)]
-        
-        self.assertEqual(len(error_results), 1)
-        self.assertEqual(set(normal_results), {2, 4, 8, 10})
+        self.assertEqual(HostInformation.get_public_ip(max_age=-1), "203.0.113.6")
+        mock_get.assert_called_once()
 
-    def test_process_items_without_error_handler(self):
-        def processor(x):
-            if x == 3:
-                raise ValueError("Test error")
-            return x * 2
+    @patch("requests.get")
+    def test_get_public_ip_override(self, mock_get):
+        self.assertEqual(HostInformation.get_public_ip(override="198.51.100.7"), "198.51.100.7")
+        os.environ[PUBLIC_IP_ENV] = "198.51.100.8"
+        self.assertEqual(HostInformation.get_public_ip(), "198.51.100.8")
+        mock_get.assert_not_called()
 
-        results = ParallelProcessor.process_items([1, 2, 3, 4, 5], processor)
-        self.assertEqual(len(results), 4)
-        self.assertEqual(set(results), {2, 4, 8, 10})
+    @patch("app.utils.lib.HostInformation.get_local_ips", return_value=["10.0.0.4"])
+    @patch("requests.get")
+    def test_get_public_ip_offline_falls_back_to_local_address(self, mock_get, mock_local_ips):
+        mock_get.side_effect = requests.ConnectionError("Connection failed")
 
-    def test_process_items_max_workers_limit(self):
-        def processor(x):
-            return x * 2
+        self.assertEqual(HostInformation.get_public_ip(), "10.0.0.4")
+        self.assertEqual(HostInformation.get_public_ip(), "10.0.0.4")
+        mock_get.assert_called_once()
 
-        results = ParallelProcessor.process_items([1, 2, 3, 4, 5], processor, max_workers=2)
-        self.assertEqual(len(results), 5)
-        self.assertEqual(set(results), {2, 4, 6, 8, 10})
+        # The fallback is not persisted, so the next run tries the lookup again
+        lib._host_facts.clear()
+        HostInformation.get_public_ip()
+        self.assertEqual(mock_get.call_count, 2)
 
-    def test_process_items_max_workers_exceeds_items(self):
-        def processor(x):
-            return x * 2
+    @patch("app.utils.lib.HostInformation._interface_addresses", return_value=["127.0.0.1", "10.0.0.4", "fe80::1", "bogus"])
+    @patch("socket.gethostbyname_ex", side_effect=OSError)
+    @patch("socket.socket")
+    def test_get_local_ips_skips_loopback(self, mock_socket, mock_gethostbyname, mock_interfaces):
+        probe = mock_socket.return_value.__enter__.return_value
+        probe.getsockname.return_value = ("10.0.0.4", 5000)
 
-        results = ParallelProcessor.process_items([1, 2], processor, max_workers=10)
-        self.assertEqual(len(results), 2)
-        self.assertEqual(set(results), {2, 4})
+        self.assertEqual(HostInformation.get_local_ips(), ["10.0.0.4"])
 
 
 class TestDirectoryManager(unittest.TestCase):
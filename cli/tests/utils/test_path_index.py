@@ -0,0 +1,75 @@
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.utils.path_index import PathIndex
+
+
+class TestPathIndex(unittest.TestCase):
+    def setUp(self):
+        self.first = tempfile.mkdtemp()
+        self.second = tempfile.mkdtemp()
+        self.index = PathIndex(os.pathsep.join([self.first, "/nonexistent-dir", self.second]))
+
+    def tearDown(self):
+        shutil.rmtree(self.first)
+        shutil.rmtree(self.second)
+
+    def make(self, directory, name, executable=True):
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write("#!/bin/sh\n")
+        if executable:
+            os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        return path
+
+    def test_first_executable_in_path_order_wins(self):
+        self.make(self.first, "tool", executable=False)
+        expected = self.make(self.second, "tool")
+        self.make(self.second, "other")
+
+        self.assertEqual(self.index.which("tool"), expected)
+        self.assertEqual(self.index.which("tool"), shutil.which("tool", path=self.index.path))
+
+    def test_missing_command(self):
+        self.assertIsNone(self.index.which("missing"))
+        self.assertFalse(self.index.has("missing"))
+
+    def test_directories_are_listed_once(self):
+        self.make(self.first, "a")
+        self.make(self.second, "b")
+        with patch("os.listdir", wraps=os.listdir) as mock_listdir:
+            for name in ["a", "b", "c", "a"]:
+                self.index.which(name)
+
+        self.assertEqual(mock_listdir.call_count, 3)
+
+    def test_invalidate_picks_up_new_binaries(self):
+        self.assertFalse(self.index.has("late"))
+        self.make(self.second, "late")
+        self.assertFalse(self.index.has("late"))
+
+        self.index.invalidate()
+
+        self.assertTrue(self.index.has("late"))
+
+    def test_path_change_rebuilds(self):
+        index = PathIndex()
+        self.make(self.first, "tool")
+        with patch.dict(os.environ, {"PATH": self.second}):
+            self.assertFalse(index.has("tool"))
+        with patch.dict(os.environ, {"PATH": self.first}):
+            self.assertTrue(index.has("tool"))
+
+    def test_explicit_path(self):
+        tool = self.make(self.first, "tool")
+
+        self.assertEqual(self.index.which(tool), tool)
+        self.assertIsNone(self.index.which(os.path.join(self.first, "missing")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import threading
+import time
+import unittest
+
+from app.utils.scheduler import STEP_DONE, STEP_FAILED, STEP_RUNNING, STEP_SKIPPED, Step, StepScheduler
+from app.utils.timeout import TimeoutWrapper, kill_at_deadline, popen_with_deadline, remaining_time
+
+
+class TestStepScheduler(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def record(self, step, status):
+        self.events.append((step.name, status))
+
+    def tracked(self, name, order, delay=0.0, error=None):
+        def func():
+            time.sleep(delay)
+            with self.lock:
+                order.append(name)
+            if error:
+                raise error
+
+        return func
+
+    def test_dependencies_run_before_dependents(self):
+        order = []
+        steps = [
+            Step("c", "C", self.tracked("c", order), ["a", "b"]),
+            Step("a", "A", self.tracked("a", order, delay=0.05)),
+            Step("b", "B", self.tracked("b", order)),
+        ]
+        StepScheduler(steps, on_event=self.record).run()
+        self.assertEqual(order[-1], "c")
+        self.assertEqual(set(order), {"a", "b", "c"})
+        self.assertEqual([name for name, status in self.events if status == STEP_DONE][-1], "c")
+
+    def test_independent_steps_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=2)
+        steps = [Step("a", "A", barrier.wait), Step("b", "B", barrier.wait)]
+        StepScheduler(steps, max_workers=2).run()
+
+    def test_max_workers_bounds_concurrency(self):
+        running = []
+        peak = []
+
+        def work():
+            with self.lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with self.lock:
+                running.pop()
+
+        steps = [Step(str(i), str(i), work) for i in range(6)]
+        StepScheduler(steps, max_workers=2).run()
+        self.assertLessEqual(max(peak), 2)
+
+    def test_failure_skips_pending_steps_and_raises(self):
+        order = []
+        steps = [
+            Step("a", "A", self.tracked("a", order, error=RuntimeError("boom"))),
+            Step("b", "B", self.tracked("b", order), ["a"]),
+        ]
+        with self.assertRaisesRegex(RuntimeError, "boom"):
+            StepScheduler(steps, on_event=self.record).run()
+        self.assertEqual(order, ["a"])
+        self.assertIn(("a", STEP_FAILED), self.events)
+        self.assertIn(("b", STEP_SKIPPED), self.events)
+        self.assertNotIn(("b", STEP_RUNNING), self.events)
+
+    def test_failure_waits_for_running_steps(self):
+        order = []
+        steps = [
+            Step("a", "A", self.tracked("a", order, error=RuntimeError("boom"))),
+            Step("b", "B", self.tracked("b", order, delay=0.05)),
+        ]
+        with self.assertRaises(RuntimeError):
+            StepScheduler(steps, max_workers=2, on_event=self.record).run()
+        self.assertIn(("b", STEP_DONE), self.events)
+
+    def test_step_timeout(self):
+        release = threading.Event()
+        steps = [Step("slow", "Slow step", lambda: release.wait(5), timeout=0.05)]
+        try:
+            with self.assertRaisesRegex(TimeoutError, "Slow step timed out"):
+                StepScheduler(steps, on_event=self.record).run()
+        finally:
+            release.set()
+        self.assertIn(("slow", STEP_FAILED), self.events)
+
+    def test_step_timeout_kills_step_processes(self):
+        started = threading.Event()
+        processes = []
+
+        def step():
+            process = popen_with_deadline(["sleep", "30"])
+            processes.append(process)
+            started.set()
+            with kill_at_deadline(process):
+                process.wait()
+
+        with self.assertRaises(TimeoutError):
+            StepScheduler([Step("hung", "Hung step", step, timeout=0.2)]).run()
+        started.wait(2)
+        self.assertIsNotNone(processes[0].wait(timeout=2))
+
+    def test_steps_inherit_caller_deadline(self):
+        seen = []
+        with TimeoutWrapper(30):
+            StepScheduler([Step("a", "A", lambda: seen.append(remaining_time()), timeout=60)]).run()
+        self.assertLessEqual(seen[0], 30)
+
+    def test_unknown_dependency(self):
+        with self.assertRaisesRegex(ValueError, "unknown step 'missing'"):
+            StepScheduler([Step("a", "A", lambda: None, ["missing"])])
+
+    def test_dependency_cycle(self):
+        steps = [Step("a", "A", lambda: None, ["b"]), Step("b", "B", lambda: None, ["a"])]
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            StepScheduler(steps)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,192 +1,209 @@
-import signal
+import os
+import subprocess
+import sys
+import tempfile
+import threading
 import time
 import unittest
-from unittest.mock import Mock, patch
-
-from app.utils.timeout import TimeoutWrapper
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from app.utils.executor import process_items
+from app.utils.timeout import (
+    TimeoutWrapper,
+    check_call_with_deadline,
+    current_deadline,
+    kill_at_deadline,
+    popen_with_deadline,
+    remaining_time,
+    run_with_deadline,
+    submit_with_deadline,
+)
 from app.commands.install.messages import timeout_error
 
 
-class TestTimeoutWrapper(unittest.TestCase):
-    def setUp(self):
-        self.original_signal = signal.signal
-        self.original_alarm = signal.alarm
+def process_alive(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
 
-    def tearDown(self):
-        signal.signal = self.original_signal
-        signal.alarm = self.original_alarm
 
+class TestTimeoutWrapper(unittest.TestCase):
     def test_timeout_wrapper_zero_timeout(self):
         with TimeoutWrapper(0) as wrapper:
             self.assertEqual(wrapper.timeout, 0)
+            self.assertIsNone(current_deadline())
             time.sleep(0.1)
 
     def test_timeout_wrapper_negative_timeout(self):
         with TimeoutWrapper(-1) as wrapper:
             self.assertEqual(wrapper.timeout, -1)
+            self.assertIsNone(current_deadline())
             time.sleep(0.1)
 
     def test_timeout_wrapper_positive_timeout_success(self):
         with TimeoutWrapper(5) as wrapper:
             self.assertEqual(wrapper.timeout, 5)
             time.sleep(0.1)
-
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_signal_setup(self, mock_alarm, mock_signal):
-        mock_signal.return_value = None
-        
-        with TimeoutWrapper(10) as wrapper:
-            mock_signal.assert_called_once_with(signal.SIGALRM, unittest.mock.ANY)
-            mock_alarm.assert_called_once_with(10)
-
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_signal_cleanup(self, mock_alarm, mock_signal):
-        mock_signal.return_value = None
-        
-        with TimeoutWrapper(10):
-            pass
-        
-        mock_alarm.assert_has_calls([
-            unittest.mock.call(10),
-            unittest.mock.call(0)
-        ])
-        self.assertEqual(mock_signal.call_count, 2)
-
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_zero_timeout_no_signal_setup(self, mock_alarm, mock_signal):
-        with TimeoutWrapper(0):
-            pass
-        
-        mock_signal.assert_not_called()
-        mock_alarm.assert_not_called()
-
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_negative_timeout_no_signal_setup(self, mock_alarm, mock_signal):
-        with TimeoutWrapper(-5):
-            pass
-        
-        mock_signal.assert_not_called()
-        mock_alarm.assert_not_called()
+        self.assertIsNone(current_deadline())
 
     def test_timeout_wrapper_timeout_triggered(self):
         with self.assertRaises(TimeoutError) as context:
             with TimeoutWrapper(1):
-                time.sleep(2)
-        
+                time.sleep(1.2)
+
         expected_message = timeout_error.format(timeout=1)
         self.assertEqual(str(context.exception), expected_message)
 
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_exception_handling(self, mock_alarm, mock_signal):
-        mock_signal.return_value = None
-        
+    def test_timeout_wrapper_exception_handling(self):
         with self.assertRaises(ValueError):
             with TimeoutWrapper(10):
                 raise ValueError("Test exception")
-        
-        mock_alarm.assert_has_calls([
-            unittest.mock.call(10),
-            unittest.mock.call(0)
-        ])
-        mock_signal.assert_has_calls([
-            unittest.mock.call(signal.SIGALRM, unittest.mock.ANY),
-            unittest.mock.call(signal.SIGALRM, None)
-        ])
-
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_signal_handler_registration(self, mock_alarm, mock_signal):
-        mock_signal.return_value = None
-        
-        with TimeoutWrapper(5) as wrapper:
-            mock_signal.assert_called_once()
-            call_args = mock_signal.call_args
-            self.assertEqual(call_args[0][0], signal.SIGALRM)
-            self.assertTrue(callable(call_args[0][1]))
-
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_signal_handler_raises_timeout(self, mock_alarm, mock_signal):
-        mock_signal.return_value = None
-        
-        with TimeoutWrapper(5) as wrapper:
-            signal_handler = mock_signal.call_args[0][1]
-            
-            with self.assertRaises(TimeoutError) as context:
-                signal_handler(signal.SIGALRM, None)
-            
-            expected_message = timeout_error.format(timeout=5)
-            self.assertEqual(str(context.exception), expected_message)
+        self.assertIsNone(current_deadline())
 
     def test_timeout_wrapper_nested_usage(self):
         with TimeoutWrapper(10) as outer:
             with TimeoutWrapper(5) as inner:
                 self.assertEqual(outer.timeout, 10)
                 self.assertEqual(inner.timeout, 5)
-                time.sleep(0.1)
-
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_multiple_instances(self, mock_alarm, mock_signal):
-        mock_signal.return_value = None
-        
-        wrapper1 = TimeoutWrapper(10)
-        wrapper2 = TimeoutWrapper(5)
-        
-        with wrapper1:
-            with wrapper2:
-                pass
-        
-        self.assertEqual(mock_alarm.call_count, 4)
+                self.assertLessEqual(remaining_time(), 5)
+            self.assertGreater(remaining_time(), 5)
+
+    def test_timeout_wrapper_nested_keeps_sooner_outer_deadline(self):
+        with TimeoutWrapper(2) as outer:
+            with TimeoutWrapper(60) as inner:
+                self.assertIs(inner.deadline, outer.deadline)
+                self.assertLessEqual(remaining_time(), 2)
+                self.assertLessEqual(remaining_time(30), 2)
 
     def test_timeout_wrapper_return_value(self):
         with TimeoutWrapper(10) as wrapper:
             self.assertIsInstance(wrapper, TimeoutWrapper)
             self.assertEqual(wrapper.timeout, 10)
 
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_signal_restoration(self, mock_alarm, mock_signal):
-        original_handler = Mock()
-        mock_signal.return_value = original_handler
-        
-        with TimeoutWrapper(10):
-            pass
-        
-        mock_signal.assert_has_calls([
-            unittest.mock.call(signal.SIGALRM, unittest.mock.ANY),
-            unittest.mock.call(signal.SIGALRM, original_handler)
-        ])
-
     def test_timeout_wrapper_large_timeout_value(self):
         with TimeoutWrapper(999999) as wrapper:
             self.assertEqual(wrapper.timeout, 999999)
             time.sleep(0.1)
 
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_signal_error_handling(self, mock_alarm, mock_signal):
-        mock_signal.side_effect = OSError("Signal not supported")
-        
-        with self.assertRaises(OSError):
-            with TimeoutWrapper(10):
-                pass
-
-    @patch('signal.signal')
-    @patch('signal.alarm')
-    def test_timeout_wrapper_alarm_error_handling(self, mock_alarm, mock_signal):
-        mock_signal.return_value = None
-        mock_alarm.side_effect = OSError("Alarm not supported")
-        
-        with self.assertRaises(OSError):
-            with TimeoutWrapper(10):
-                pass
+    def test_timeout_wrapper_works_off_the_main_thread(self):
+        errors = []
+
+        def work():
+            try:
+                with TimeoutWrapper(1):
+                    run_with_deadline([sys.executable, "-c", "import time; time.sleep(30)"])
+            except BaseException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=work)
+        started = time.monotonic()
+        thread.start()
+        thread.join(10)
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertIsInstance(errors[0], TimeoutError)
+        self.assertEqual(str(errors[0]), timeout_error.format(timeout=1))
+
+
+class TestDeadlineSubprocess(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pid_file = os.path.join(self.temp_dir, "pid")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+    def grandchild_command(self):
+        """A shell that starts a long sleep in the background, records its pid and waits for it"""
+        return ["sh", "-c", f"sleep 30 & echo $! > {self.pid_file}; wait"]
+
+    def grandchild_pid(self) -> int:
+        with open(self.pid_file) as f:
+            return int(f.read())
+
+    @patch("subprocess.run")
+    def test_run_without_deadline_is_plain_subprocess_run(self, mock_run):
+        run_with_deadline(["true"], capture_output=True, check=False)
+
+        mock_run.assert_called_once_with(["true"], capture_output=True, check=False)
+
+    @patch("subprocess.check_call")
+    def test_check_call_without_deadline_is_plain_check_call(self, mock_check_call):
+        check_call_with_deadline(["true"], stdout=subprocess.DEVNULL)
+
+        mock_check_call.assert_called_once_with(["true"], stdout=subprocess.DEVNULL)
+
+    def test_run_with_deadline_returns_output(self):
+        with TimeoutWrapper(10):
+            result = run_with_deadline(["sh", "-c", "cat; echo err >&2"], input="hello", capture_output=True, text=True)
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, "hello")
+        self.assertEqual(result.stderr, "err\n")
+
+    def test_run_with_deadline_check(self):
+        with TimeoutWrapper(10):
+            with self.assertRaises(subprocess.CalledProcessError):
+                run_with_deadline(["sh", "-c", "exit 3"], check=True)
+
+    def test_timed_out_run_kills_process_group(self):
+        with self.assertRaises(TimeoutError):
+            with TimeoutWrapper(1):
+                run_with_deadline(self.grandchild_command(), capture_output=True)
+
+        pid = self.grandchild_pid()
+        time.sleep(0.1)
+        self.assertFalse(process_alive(pid))
+
+    def test_explicit_timeout_is_capped_by_deadline(self):
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            with TimeoutWrapper(1):
+                run_with_deadline(["sleep", "30"], timeout=20)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_run_after_deadline_does_not_spawn(self):
+        with patch("subprocess.Popen") as mock_popen:
+            with self.assertRaises(TimeoutError):
+                with TimeoutWrapper(1):
+                    time.sleep(1.1)
+                    run_with_deadline(["true"])
+        mock_popen.assert_not_called()
+
+    def test_kill_at_deadline_stops_streaming_process(self):
+        with self.assertRaises(TimeoutError):
+            with TimeoutWrapper(1):
+                process = popen_with_deadline(self.grandchild_command(), stdout=subprocess.PIPE, text=True)
+                with kill_at_deadline(process):
+                    for _ in process.stdout:
+                        pass
+                    self.assertLess(process.wait(), 0)
+
+        time.sleep(0.1)
+        self.assertFalse(process_alive(self.grandchild_pid()))
+
+
+class TestDeadlinePropagation(unittest.TestCase):
+    def test_submit_with_deadline_passes_deadline_to_task(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with TimeoutWrapper(5) as wrapper:
+                inherited = submit_with_deadline(executor, current_deadline).result()
+            plain = executor.submit(current_deadline).result()
+
+        self.assertIs(inherited, wrapper.deadline)
+        self.assertIsNone(plain)
+
+    def test_executor_tasks_inherit_deadline(self):
+        with TimeoutWrapper(5) as wrapper:
+            results = process_items(lambda item: current_deadline(), [1, 2, 3], max_workers=3)
+
+        self.assertEqual(results, [wrapper.deadline] * 3)
 
 
 if __name__ == "__main__":
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.utils.tool_versions import ToolVersionCache, binary_signature
+
+
+class TestToolVersionCache(unittest.TestCase):
+    def setUp(self):
+        self.bin_dir = tempfile.mkdtemp()
+        self.tool = os.path.join(self.bin_dir, "fake-tool")
+        self.write_tool("#!/bin/sh\necho 1.0.0\n")
+        self.path_patcher = patch.dict(os.environ, {"PATH": self.bin_dir})
+        self.path_patcher.start()
+
+    def tearDown(self):
+        self.path_patcher.stop()
+        shutil.rmtree(self.bin_dir)
+
+    def write_tool(self, content):
+        with open(self.tool, "w") as f:
+            f.write(content)
+        os.chmod(self.tool, os.stat(self.tool).st_mode | stat.S_IEXEC)
+
+    def test_signature_of_missing_binary(self):
+        self.assertIsNone(binary_signature("not-a-real-tool"))
+
+    def test_output_survives_a_new_cache_instance(self):
+        ToolVersionCache().put(["fake-tool", "--version"], "1.0.0\n")
+
+        self.assertEqual(ToolVersionCache().get(["fake-tool", "--version"]), "1.0.0\n")
+        self.assertIsNone(ToolVersionCache().get(["fake-tool", "version"]))
+
+    def test_replaced_binary_invalidates_entry(self):
+        cache = ToolVersionCache()
+        cache.put(["fake-tool", "--version"], "1.0.0\n")
+
+        os.unlink(self.tool)
+        self.write_tool("#!/bin/sh\necho 2.0.0 upgraded\n")
+
+        self.assertIsNone(cache.get(["fake-tool", "--version"]))
+
+    def test_unresolvable_command_is_not_cached(self):
+        cache = ToolVersionCache()
+        cache.put(["not-a-real-tool", "--version"], "1.0.0")
+
+        self.assertIsNone(cache.get(["not-a-real-tool", "--version"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -95,6 +95,7 @@ export default withMermaid(
                 { text: 'proxy', link: '/cli/commands/proxy.md' },
                 { text: 'clone', link: '/cli/commands/clone.md' },
                 { text: 'version', link: '/cli/commands/version.md' },
+                { text: 'daemon', link: '/cli/commands/daemon.md' },
                 { text: 'test', link: '/cli/commands/test.md' }
               ]
             },